@@ -1,5 +1,14 @@
 # Base classes
 from goombay.align.base import GlobalBase, LocalBase
+from goombay.align.alignment import Alignment, AlignmentResult
+from goombay.align.cache import PairwiseCache
+from goombay.align.store import PairwiseStore
+from goombay.align.index import HammingIndex, PostfixIndex, PrefixIndex
+from goombay.align.kmer import KmerDistance, kmer_distance
+from goombay.align.msa import MSA
+from goombay.align.packed import PackedBits
+from goombay.align.profile import ProfileAligner
+from goombay.align.search import ApproxMatch, find_approx
 
 # Alignment module
 from goombay.align import edit
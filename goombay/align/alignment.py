@@ -0,0 +1,232 @@
+# standard library
+from functools import cached_property
+
+try:
+    # external dependencies
+    import numpy
+    from numpy import intp, uint8
+    from numpy.typing import ArrayLike, NDArray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+__all__ = ["Alignment", "AlignmentResult", "OP_MATCH", "OP_INSERT", "OP_DELETE"]
+
+# Alignment operations recorded by the traceback, named after their CIGAR letters
+OP_MATCH = 0  # M: query residue aligned to subject residue
+OP_INSERT = 1  # I: query residue aligned to a gap
+OP_DELETE = 2  # D: gap aligned to subject residue
+
+# CIGAR letters indexed by operation; "=" and "X" split M in extended CIGARs
+_CIGAR_LETTERS = "MID=X"
+
+
+class Alignment:
+    """
+    Compact pairwise alignment produced directly by the traceback.
+
+    Stores one operation per alignment column (``OP_MATCH``, ``OP_INSERT`` or
+    ``OP_DELETE``) together with the sequences and the 0-based positions where
+    the alignment starts. Index arrays, CIGAR strings and the usual
+    ``"query\nsubject"`` string are only built when asked for.
+    """
+
+    def __init__(
+        self,
+        query_seq: str,
+        subject_seq: str,
+        ops: ArrayLike | bytes | bytearray,
+        query_start: int = 0,
+        subject_start: int = 0,
+    ) -> None:
+        self.query_seq = query_seq
+        self.subject_seq = subject_seq
+        if isinstance(ops, (bytes, bytearray)):
+            self.ops = numpy.frombuffer(ops, dtype=uint8)
+        else:
+            self.ops = numpy.array(ops, dtype=uint8)
+        self.ops.flags.writeable = False
+        self.query_start = int(query_start)
+        self.subject_start = int(subject_start)
+
+    @classmethod
+    def from_string(
+        cls,
+        alignment: str,
+        query_seq: str | None = None,
+        subject_seq: str | None = None,
+        query_start: int = 0,
+        subject_start: int = 0,
+    ) -> "Alignment":
+        """
+        Build an Alignment from the ``"query\nsubject"`` format returned by align.
+
+        Without ``query_seq``/``subject_seq`` the sequences are taken from the
+        aligned rows themselves, so the alignment starts at position 0.
+        """
+        query_aligned, subject_aligned = alignment.split("\n")
+        query_gaps = numpy.array([c == "-" for c in query_aligned], dtype=bool)
+        subject_gaps = numpy.array([c == "-" for c in subject_aligned], dtype=bool)
+        ops = numpy.full(len(query_aligned), OP_MATCH, dtype=uint8)
+        ops[subject_gaps] = OP_INSERT
+        ops[query_gaps] = OP_DELETE
+        if query_seq is None:
+            query_seq = "".join(c for c in query_aligned if c != "-")
+        if subject_seq is None:
+            subject_seq = "".join(c for c in subject_aligned if c != "-")
+        return cls(query_seq, subject_seq, ops, query_start, subject_start)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __str__(self) -> str:
+        return f"{self.query_aligned}\n{self.subject_aligned}"
+
+    def __repr__(self) -> str:
+        return (
+            f"Alignment(cigar={self.cigar()!r}, query_start={self.query_start}, "
+            f"subject_start={self.subject_start})"
+        )
+
+    @property
+    def query_end(self) -> int:
+        return self.query_start + int(numpy.count_nonzero(self.ops != OP_DELETE))
+
+    @property
+    def subject_end(self) -> int:
+        return self.subject_start + int(numpy.count_nonzero(self.ops != OP_INSERT))
+
+    @cached_property
+    def indices(self) -> NDArray[intp]:
+        """
+        2 x L array of aligned positions: row 0 indexes the query, row 1 the
+        subject, and -1 marks a gap.
+        """
+        indices = numpy.full((2, len(self.ops)), -1, dtype=intp)
+        for row, skipped, start in (
+            (0, OP_DELETE, self.query_start),
+            (1, OP_INSERT, self.subject_start),
+        ):
+            consumed = self.ops != skipped
+            indices[row, consumed] = numpy.arange(
+                start, start + numpy.count_nonzero(consumed)
+            )
+        indices.flags.writeable = False
+        return indices
+
+    def gapped(self, seq: str, row: int) -> str:
+        """Apply the gaps of one row (0 query, 1 subject) to any sequence of the same length"""
+        # index -1 picks the trailing gap character
+        residues = numpy.array(list(seq) + ["-"])
+        return "".join(residues[self.indices[row]])
+
+    @cached_property
+    def query_aligned(self) -> str:
+        return self.gapped(self.query_seq, 0)
+
+    @cached_property
+    def subject_aligned(self) -> str:
+        return self.gapped(self.subject_seq, 1)
+
+    def cigar_runs(self, extended: bool = False) -> list[tuple[int, str]]:
+        """Run-length encoded operations as ``(length, letter)`` pairs"""
+        if not len(self.ops):
+            return []
+        codes = self.ops.copy()
+        if extended:
+            query_idx, subject_idx = self.indices[:, self.ops == OP_MATCH]
+            query = numpy.array(list(self.query_seq))
+            subject = numpy.array(list(self.subject_seq))
+            identical = query[query_idx] == subject[subject_idx]
+            codes[self.ops == OP_MATCH] = numpy.where(identical, 3, 4)
+        starts = numpy.flatnonzero(numpy.diff(codes)) + 1
+        starts = numpy.concatenate(([0], starts))
+        lengths = numpy.diff(numpy.append(starts, len(codes)))
+        return [
+            (int(length), _CIGAR_LETTERS[codes[start]])
+            for start, length in zip(starts, lengths)
+        ]
+
+    def cigar(self, extended: bool = False) -> str:
+        """CIGAR string; ``extended`` writes matches as "=" and mismatches as "X" """
+        return "".join(f"{length}{op}" for length, op in self.cigar_runs(extended))
+
+
+class AlignmentResult:
+    """
+    Scores and alignment of one pair of sequences from a single DP pass.
+
+    Returned by ``aligner.run(query_seq, subject_seq)``. The matrices are
+    computed once when the result is created; every other attribute is derived
+    from them on first access by the aligner's own methods, so values are
+    identical to calling ``aligner.similarity``, ``aligner.align`` etc. directly.
+    """
+
+    def __init__(self, aligner, query_seq: str, subject_seq: str, matrices) -> None:
+        self.aligner = aligner
+        self.query_seq = query_seq
+        self.subject_seq = subject_seq
+        self.matrices = matrices
+
+    def __repr__(self) -> str:
+        return (
+            f"AlignmentResult({type(self.aligner).__name__}, "
+            f"{self.query_seq!r}, {self.subject_seq!r})"
+        )
+
+    def _derive(self, method: str):
+        with self.aligner._pinned(self.query_seq, self.subject_seq, self.matrices):
+            return getattr(self.aligner, method)(self.query_seq, self.subject_seq)
+
+    @cached_property
+    def similarity(self) -> float:
+        return self._derive("similarity")
+
+    @property
+    def score(self) -> float:
+        """Raw alignment score (same as ``similarity``)"""
+        return self.similarity
+
+    @cached_property
+    def distance(self) -> float:
+        return self._derive("distance")
+
+    @cached_property
+    def normalized_similarity(self) -> float:
+        return self._derive("normalized_similarity")
+
+    @cached_property
+    def normalized_distance(self) -> float:
+        return self._derive("normalized_distance")
+
+    @cached_property
+    def alignment(self) -> str:
+        """Aligned query and subject separated by a newline"""
+        return self._derive("align")
+
+    @cached_property
+    def traceback(self) -> Alignment | None:
+        """Compact form of ``alignment``; None when there is no local alignment"""
+        return self._derive("traceback")
+
+    @cached_property
+    def coordinates(self) -> tuple[int, int, int, int] | None:
+        """0-based, end-exclusive ``(query_start, query_end, subject_start, subject_end)``"""
+        if self.traceback is None:
+            return None
+        tb = self.traceback
+        return tb.query_start, tb.query_end, tb.subject_start, tb.subject_end
+
+    @cached_property
+    def identity(self) -> float:
+        """Fraction of alignment columns holding identical residues"""
+        if self.traceback is None or not len(self.traceback):
+            return 0.0
+        runs = self.traceback.cigar_runs(extended=True)
+        return sum(length for length, op in runs if op == "=") / len(self.traceback)
+
+    @cached_property
+    def cigar(self) -> str:
+        """CIGAR string of the alignment (M match/mismatch, I insertion, D deletion)"""
+        if self.traceback is None:
+            return ""
+        return self.traceback.cigar()
@@ -1,23 +1,244 @@
 # standard library
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from contextlib import contextmanager
+from functools import wraps
 
 # external dependencies
+import numpy
 from numpy import float64
 from numpy.typing import NDArray
 
+# internal dependencies
+from goombay.align.alignment import (
+    Alignment,
+    AlignmentResult,
+    OP_DELETE,
+    OP_INSERT,
+    OP_MATCH,
+)
+from goombay.align.cache import (
+    CacheInfo,
+    PairwiseCache,
+    scorer_config,
+    sequence_digest,
+)
+
 # Pointer direction constants
 MATCH = 2
 UP = 3
 LEFT = 4
 
+_MISSING = object()
+
+# per-thread results of a single DP pass, keyed by id(aligner)
+_pinned = threading.local()
+
+
+def _cached_call(call):
+    @wraps(call)
+    def wrapper(self, query_seq, subject_seq, *args, **kwargs):
+        pinned = getattr(_pinned, "calls", None)
+        if pinned and id(self) in pinned and not (args or kwargs):
+            pinned_query, pinned_subject, result = pinned[id(self)]
+            if pinned_query == query_seq and pinned_subject == subject_seq:
+                return result
+        cache = self._cache
+        if cache is None or args or kwargs:
+            return call(self, query_seq, subject_seq, *args, **kwargs)
+        key = (
+            scorer_config(self),
+            sequence_digest(query_seq),
+            sequence_digest(subject_seq),
+        )
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = cache.put(key, call(self, query_seq, subject_seq))
+        return result
+
+    return wrapper
+
+
+def _step_table(*directions: tuple[int, bytes, int, int]) -> tuple:
+    """
+    Decode table for single tracebacks: maps every pointer sum to the
+    ``(ops, i_step, j_step)`` of the first direction it contains, following the
+    order of ``directions``; None marks a cell without a pointer.
+    """
+    table = [None] * (sum(d[0] for d in directions) + 1)
+    for mask in range(1, 2 ** len(directions)):
+        chosen = [d for bit, d in enumerate(directions) if mask >> bit & 1]
+        table[sum(d[0] for d in chosen)] = chosen[0][1:]
+    return tuple(table)
+
+
+# match, then up, then left, as align does when all_alignments is False
+_STEPS = _step_table(
+    (MATCH, bytes([OP_MATCH]), 1, 1),
+    (UP, bytes([OP_INSERT]), 1, 0),
+    (LEFT, bytes([OP_DELETE]), 0, 1),
+)
+
+
+def _walk(pointer_matrix, i: int, j: int, at_end, steps: tuple = _STEPS):
+    """
+    Follow the single path align takes from cell (i, j) until ``at_end``.
+
+    Operations are written back to front into a buffer preallocated for the
+    longest possible path, so the walk is linear in the alignment length.
+    Returns ``(ops, i, j)`` with the cell where the path stops, or None if it
+    runs into a cell without a pointer.
+    """
+    buffer = bytearray(i + j)
+    k = len(buffer)
+    while not at_end(i, j):
+        step = steps[int(pointer_matrix[i, j])]
+        if step is None:
+            return None
+        ops, i_step, j_step = step
+        k -= len(ops)
+        buffer[k : k + len(ops)] = ops
+        i -= i_step
+        j -= j_step
+    return buffer[k:], i, j
+
+
+def _at_origin(i: int, j: int) -> bool:
+    return i <= 0 and j <= 0
+
+
+# Ends of a global alignment whose gaps can be left unpenalized: the part of
+# one sequence overhanging the start or end of the other
+END_GAPS = ("query_start", "query_end", "subject_start", "subject_end")
+
+
+def _parse_end_gaps(end_gaps: str | Iterable[str]) -> tuple[str, frozenset[str]]:
+    """
+    Canonical ``end_gaps`` setting and the set of free ends it names.
+
+    Accepts "penalized" (the default), "free" (every end) or any of the names
+    in ``END_GAPS``, alone or as an iterable.
+    """
+    if end_gaps == "penalized":
+        return "penalized", frozenset()
+    if end_gaps == "free":
+        return "free", frozenset(END_GAPS)
+    free = frozenset([end_gaps] if isinstance(end_gaps, str) else end_gaps)
+    unknown = free.difference(END_GAPS)
+    if unknown:
+        raise ValueError(
+            f"Unknown end_gaps {sorted(unknown)}; expected 'penalized', 'free' or "
+            f"any of {list(END_GAPS)}"
+        )
+    if not free:
+        return "penalized", free
+    if len(free) == len(END_GAPS):
+        return "free", free
+    return ",".join(end for end in END_GAPS if end in free), free
+
+
+def _end_ops(matrix: NDArray[float64], i: int, j: int) -> bytes:
+    """Operations for the residues left after an alignment that ends at cell (i, j)"""
+    rows, cols = matrix.shape[0] - 1, matrix.shape[1] - 1
+    return bytes([OP_INSERT]) * (rows - i) + bytes([OP_DELETE]) * (cols - j)
+
+
+def _overhang(query_seq: str, subject_seq: str, i: int, j: int) -> tuple[str, str]:
+    """Aligned rows of the residues left after an alignment that ends at cell (i, j)"""
+    query_tail, subject_tail = query_seq[i:], subject_seq[j:]
+    return (
+        query_tail + "-" * len(subject_tail),
+        "-" * len(query_tail) + subject_tail,
+    )
+
+
+class _CacheMixin:
+    """Routes the dynamic programming step (``__call__``) through pinned results or a cache"""
+
+    _cache: PairwiseCache | None = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        call = cls.__dict__.get("__call__")
+        if call is not None and not getattr(call, "__isabstractmethod__", False):
+            cls.__call__ = _cached_call(call)
+
+    def enable_cache(
+        self,
+        maxsize: int | None = 1024,
+        max_bytes: int | None = 256 * 1024**2,
+        cache: PairwiseCache | None = None,
+    ) -> PairwiseCache:
+        """
+        Memoize the matrices computed for each pair of sequences.
+
+        Pass ``cache`` to share one cache between several aligners, otherwise
+        a new cache bounded by ``maxsize`` entries and ``max_bytes`` bytes is
+        created. Cached matrices are read-only.
+        """
+        self._cache = cache if cache is not None else PairwiseCache(maxsize, max_bytes)
+        return self._cache
+
+    def disable_cache(self) -> None:
+        self._cache = None
+
+    def cache_info(self) -> CacheInfo | None:
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def __getstate__(self) -> dict:
+        # a cache holds a lock and only serves the process it lives in
+        state = self.__dict__.copy()
+        state.pop("_cache", None)
+        return state
+
+    @contextmanager
+    def _pinned(self, query_seq: str, subject_seq: str, result):
+        """Serve ``result`` for ``self(query_seq, subject_seq)`` within this thread"""
+        if getattr(_pinned, "calls", None) is None:
+            _pinned.calls = {}
+        previous = _pinned.calls.get(id(self))
+        _pinned.calls[id(self)] = (query_seq, subject_seq, result)
+        try:
+            yield
+        finally:
+            if previous is None:
+                del _pinned.calls[id(self)]
+            else:
+                _pinned.calls[id(self)] = previous
+
+
+class _ScoreMixin:
+    """
+    Residue scores for ``match_func``. Bound methods rather than lambdas, so
+    aligners can be pickled and sent to worker processes.
+    """
+
+    def _match_score(self, a: str, b: str) -> float:
+        return self.match if a == b else -self.mismatch
+
+    def _substitution_score(self, a: str, b: str) -> float:
+        return self.sub_mat[a][b]
+
+
+class GlobalBase(_CacheMixin, _ScoreMixin, ABC):
+    # ends whose gaps are free, set from the end_gaps option of aligners that have it
+    _free_ends: frozenset[str] = frozenset()
 
-class GlobalBase(ABC):
     @abstractmethod
     def __call__(
         self, query_seq: str, subject_seq: str
     ) -> tuple[NDArray[float64], NDArray[float64]]:
         pass
 
+    def run(self, query_seq: str, subject_seq: str) -> AlignmentResult:
+        """Fill the matrices once; every score and the alignment derive from it"""
+        return AlignmentResult(
+            self, query_seq, subject_seq, self(query_seq, subject_seq)
+        )
+
     def matrix(self, query_seq: str, subject_seq: str) -> NDArray[float64]:
         return self(query_seq, subject_seq)
 
@@ -31,11 +252,24 @@ class GlobalBase(ABC):
         max_possible = max(len(query_seq), len(subject_seq)) * self.match
         return max_possible - abs(raw_sim)
 
+    def _end_cell(self, matrix: NDArray[float64]) -> tuple[int, int]:
+        """
+        Cell the alignment ends in: the last cell, or the best scoring cell of
+        the last row/column when that end is free (ties favour fewer end gaps).
+        """
+        i, j = matrix.shape[0] - 1, matrix.shape[1] - 1
+        cells = [(i, j)]
+        if "subject_end" in self._free_ends:
+            cells.extend((i, col) for col in range(j - 1, -1, -1))
+        if "query_end" in self._free_ends:
+            cells.extend((row, j) for row in range(i - 1, -1, -1))
+        return max(cells, key=lambda cell: matrix[cell])
+
     def similarity(self, query_seq: str, subject_seq: str) -> float:
         if not query_seq and not subject_seq:
             return 1.0
         matrix, _ = self(query_seq, subject_seq)
-        return matrix[matrix.shape[0] - 1, matrix.shape[1] - 1]
+        return matrix[self._end_cell(matrix)]
 
     def normalized_distance(self, query_seq: str, subject_seq: str) -> float:
         return 1 - self.normalized_similarity(query_seq, subject_seq)
@@ -69,13 +303,18 @@ class GlobalBase(ABC):
     def align(
         self, query_seq: str, subject_seq: str, all_alignments: bool = False
     ) -> str | list[str]:
-        _, pointer_matrix = self(query_seq, subject_seq)
+        if not all_alignments:
+            return str(self.traceback(query_seq, subject_seq))
+
+        matrix, pointer_matrix = self(query_seq, subject_seq)
 
         qs = [x.upper() for x in query_seq]
         ss = [x.upper() for x in subject_seq]
-        i, j = len(qs), len(ss)
+        i, j = self._end_cell(matrix)
+        # residues past the end cell are aligned to free end gaps
+        query_tail, subject_tail = _overhang("".join(qs), "".join(ss), i, j)
         aligned = []
-        stack = [([""], [""], i, j)]
+        stack = [([""] + list(query_tail[::-1]), [""] + list(subject_tail[::-1]), i, j)]
 
         # Looks for match/mismatch/gap starting from bottom right of matrix
         while stack:
@@ -117,14 +356,44 @@ class GlobalBase(ABC):
             return aligned[0]
         return aligned
 
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment:
+        """Compact form of ``align(query_seq, subject_seq)``"""
+        matrix, pointer_matrix = self(query_seq, subject_seq)
+        i, j = self._end_cell(matrix)
+        path = _walk(pointer_matrix, i, j, _at_origin)
+        if path is None:
+            raise ValueError("No traceback path from the last cell")
+        return Alignment(
+            query_seq.upper(), subject_seq.upper(), path[0] + _end_ops(matrix, i, j)
+        )
+
 
-class LocalBase(ABC):
+class LocalBase(_CacheMixin, _ScoreMixin, ABC):
     @abstractmethod
     def __call__(
         self, query_seq: str, subject_seq: str
     ) -> tuple[NDArray[float64], NDArray[float64]]:
         pass
 
+    def run(self, query_seq: str, subject_seq: str) -> AlignmentResult:
+        """Fill the matrices once; every score and the alignment derive from it"""
+        return AlignmentResult(
+            self, query_seq, subject_seq, self(query_seq, subject_seq)
+        )
+
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment | None:
+        """Compact form of ``align(query_seq, subject_seq)``, None if nothing aligns"""
+        matrix, pointer_matrix = self(query_seq, subject_seq)
+        if matrix.max() == 0:
+            return None
+
+        # align starts from the last cell holding the maximum score
+        for i, j in numpy.argwhere(matrix == matrix.max())[::-1]:
+            path = _walk(pointer_matrix, i, j, lambda i, j: matrix[i, j] == 0)
+            if path is not None:
+                return Alignment(query_seq.upper(), subject_seq.upper(), *path)
+        raise ValueError("No traceback path from the highest scoring cells")
+
     def matrix(self, query_seq: str, subject_seq: str) -> NDArray[float64]:
         """Return alignment matrix"""
         return self(query_seq, subject_seq)
@@ -174,7 +443,7 @@ class LocalBase(ABC):
         return 1.0 - self.normalized_similarity(query_seq, subject_seq)
 
 
-class OverlapBase(ABC):
+class OverlapBase(_CacheMixin, ABC):
     @abstractmethod
     def __call__(self, query_seq: str, subject_seq: str) -> NDArray[float64]:
         pass
@@ -0,0 +1,172 @@
+# standard library
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from hashlib import blake2b
+
+try:
+    # external dependencies
+    from numpy import ndarray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+__all__ = ["PairwiseCache", "CacheInfo", "sequence_digest", "scorer_config"]
+
+CacheInfo = namedtuple(
+    "CacheInfo",
+    ["hits", "misses", "evictions", "currsize", "maxsize", "nbytes", "max_bytes"],
+)
+
+
+def sequence_digest(seq: str, case_sensitive: bool = False) -> bytes:
+    """Return a 16 byte digest of a sequence, ignoring case unless ``case_sensitive``"""
+    if case_sensitive:
+        # personalized so that no sequence shares a digest with its case-folded form
+        return blake2b(
+            seq.encode("utf-8"), digest_size=16, person=b"case-sensitive"
+        ).digest()
+    return blake2b(seq.upper().encode("utf-8"), digest_size=16).digest()
+
+
+def matrix_digest(sub_mat) -> str:
+    """Return a digest of the contents of a substitution matrix"""
+    data = getattr(sub_mat, "matrix_data", sub_mat)
+    rows = sorted(
+        (str(a), sorted((str(b), float(score)) for b, score in row.items()))
+        for a, row in data.items()
+    )
+    return blake2b(repr(rows).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _matrix_fingerprint(sub_mat) -> int:
+    # in-process hash of the matrix contents, far cheaper than the stable
+    # digest, used to notice matrices that were modified in place
+    data = getattr(sub_mat, "matrix_data", sub_mat)
+    return hash(tuple((a, tuple(row.items())) for a, row in data.items()))
+
+
+def scorer_config(aligner) -> str:
+    """
+    Return a stable description of an aligner's configuration.
+
+    The description is made of the class name, every public scalar parameter
+    and the digest of the substitution matrix (if any), so two aligners that
+    would score a pair identically produce the same string in every process.
+    """
+    params = []
+    for name, value in sorted(vars(aligner).items()):
+        if name.startswith("_") or name == "sub_mat":
+            continue
+        if value is None or isinstance(value, (bool, int, float, str)):
+            params.append(f"{name}={value!r}")
+    sub_mat = getattr(aligner, "sub_mat", None)
+    if sub_mat is not None:
+        # the digest lives on the aligner, next to the matrix it describes, and
+        # is recomputed whenever the matrix is replaced or its contents change
+        fingerprint = _matrix_fingerprint(sub_mat)
+        cached = vars(aligner).get("_sub_mat_digest")
+        if cached is None or cached[0] is not sub_mat or cached[1] != fingerprint:
+            cached = (sub_mat, fingerprint, matrix_digest(sub_mat))
+            aligner._sub_mat_digest = cached
+        params.append(f"sub_mat={cached[2]}")
+    return f"{type(aligner).__qualname__}({','.join(params)})"
+
+
+def _sizeof(value) -> int:
+    if isinstance(value, ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    # cached matrices are shared between callers, so the cache keeps read-only
+    # copies rather than the working arrays of the aligner that produced them
+    if isinstance(value, ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        value = tuple(_freeze(v) for v in value)
+    return value
+
+
+class PairwiseCache:
+    """
+    Bounded least-recently-used store for pairwise results.
+
+    Entries are evicted once either ``maxsize`` entries or ``max_bytes`` bytes
+    (counting the memory held by NumPy matrices) are exceeded. A single cache
+    can be shared by several aligners since keys include the scorer
+    configuration.
+    """
+
+    def __init__(
+        self, maxsize: int | None = 1024, max_bytes: int | None = 256 * 1024**2
+    ) -> None:
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer or None")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer or None")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a read-only copy of ``value`` under ``key`` and return the copy"""
+        value = _freeze(value)
+        size = _sizeof(value)
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return value  # would evict everything and still not fit
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._entries[key] = (value, size)
+            self._nbytes += size
+            while (self.maxsize is not None and len(self._entries) > self.maxsize) or (
+                self.max_bytes is not None and self._nbytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self._entries),
+            self.maxsize,
+            self._nbytes,
+            self.max_bytes,
+        )
@@ -1,13 +1,27 @@
+# standard library
+from collections.abc import Iterable
+
 try:
     # external dependencies
     import numpy
-    from numpy import float64
+    from numpy import float64, intp, uint8, uint32, uint64
     from numpy._typing import NDArray
 except ImportError:
     raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
 
 # internal dependencies
-from goombay.align.base import GlobalBase as _GlobalBase, LocalBase as _LocalBase
+from goombay.align.alignment import Alignment, OP_DELETE, OP_INSERT, OP_MATCH
+from goombay.align.base import (
+    GlobalBase as _GlobalBase,
+    LocalBase as _LocalBase,
+    _STEPS,
+    _at_origin,
+    _end_ops,
+    _overhang,
+    _parse_end_gaps,
+    _step_table,
+    _walk,
+)
 
 # Pointer direction constants
 MATCH = 2
@@ -15,6 +29,14 @@ UP = 3
 LEFT = 4
 TRANSPOSE = 8
 
+# Lowrance-Wagner tracebacks prefer a transposition over gaps; it spans two columns
+_TRANSPOSE_STEPS = _step_table(
+    (MATCH, bytes([OP_MATCH]), 1, 1),
+    (TRANSPOSE, bytes([OP_MATCH, OP_MATCH]), 2, 2),
+    (UP, bytes([OP_INSERT]), 1, 0),
+    (LEFT, bytes([OP_DELETE]), 0, 1),
+)
+
 __all__ = [
     "WagnerFischer",
     "wagner_fischer",
@@ -41,6 +63,58 @@ __all__ = [
 ]
 
 
+def _gap_only(query_seq: str, subject_seq: str) -> Alignment:
+    # alignment of a sequence against an empty one, kept in its original case
+    ops = [OP_INSERT] * len(query_seq) + [OP_DELETE] * len(subject_seq)
+    return Alignment(query_seq, subject_seq, ops)
+
+
+def _walk_steps(pointer_matrix, i: int, j: int, at_end):
+    """Like base._walk for pointers stored as (pointer, i_step, j_step) tuples"""
+    buffer = bytearray(i + j)
+    k = len(buffer)
+    while not at_end(i, j):
+        pointer, i_step, j_step = pointer_matrix[i][j]
+        direction = _STEPS[int(pointer)]
+        if direction is None:
+            return None
+        op = direction[0][0]
+        # gaps may span several cells at once
+        count = 1 if op == OP_MATCH else i_step if op == OP_INSERT else j_step
+        k -= count
+        buffer[k : k + count] = bytes([op]) * count
+        if op != OP_DELETE:
+            i -= count
+        if op != OP_INSERT:
+            j -= count
+    return buffer[k:], i, j
+
+
+# pointer matrix (0 = D, 1 = P, 2 = Q) a Gotoh traceback moves to after each operation
+_AFFINE_NEXT = {OP_MATCH: 0, OP_INSERT: 1, OP_DELETE: 2}
+
+
+def _walk_affine(pointers, active: int, i: int, j: int, at_end):
+    """
+    Like base._walk for Gotoh pointers, switching between the D, P and Q
+    pointer matrices the same way align does. Returns the path (None on a
+    dead end) and the index of the pointer matrix active when the walk stopped.
+    """
+    buffer = bytearray(i + j)
+    k = len(buffer)
+    while not at_end(i, j):
+        step = _STEPS[int(pointers[active][i, j])]
+        if step is None:
+            return None, active
+        ops, i_step, j_step = step
+        k -= 1
+        buffer[k] = ops[0]
+        i -= i_step
+        j -= j_step
+        active = _AFFINE_NEXT[ops[0]]
+    return (buffer[k:], i, j), active
+
+
 class WagnerFischer(_GlobalBase):  # Levenshtein Distance
     supports_substitution_matrix = False
 
@@ -209,6 +283,8 @@ class LowranceWagner(_GlobalBase):  # Damerau-Levenshtein distance
             return f"{'-' * len(subject_seq)}\n{subject_seq}"
         if not subject_seq:
             return f"{query_seq}\n{'-' * len(query_seq)}"
+        if not all_alignments:
+            return str(self.traceback(query_seq, subject_seq))
 
         _, pointer_matrix = self(query_seq, subject_seq)
 
@@ -293,8 +369,22 @@ class LowranceWagner(_GlobalBase):  # Damerau-Levenshtein distance
             return aligned[0]
         return aligned
 
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment:
+        if not query_seq or not subject_seq:
+            return _gap_only(query_seq, subject_seq)
+
+        _, pointer_matrix = self(query_seq, subject_seq)
+        i, j = len(query_seq), len(subject_seq)
+        path = _walk(pointer_matrix, i, j, _at_origin, _TRANSPOSE_STEPS)
+        if path is None:
+            raise ValueError("No traceback path from the last cell")
+        return Alignment(query_seq.upper(), subject_seq.upper(), path[0])
+
 
 class Hamming:
+    # upper bound on the XOR block built per chunk of queries in batch mode
+    batch_bytes = 1 << 24
+
     def _check_inputs(self, query_seq: str | int, subject_seq: str | int) -> None:
         if not isinstance(query_seq, (str, int)) or not isinstance(
             subject_seq, (str, int)
@@ -309,67 +399,48 @@ class Hamming:
         ):
             raise IndexError("Sequences must be of equal length")
 
+    @staticmethod
+    def _upper(seq: str) -> str:
+        upper = seq.upper()
+        if len(upper) == len(seq):
+            return upper
+        # a few characters (e.g. "ß") expand when uppercased; keep those as is
+        return "".join(c.upper() if len(c.upper()) == 1 else c for c in seq)
+
+    def _codes(self, seq: str) -> NDArray[uint32]:
+        # one code point per character, uppercased
+        return numpy.frombuffer(self._upper(seq).encode("utf-32-le"), dtype=uint32)
+
+    def _mismatches(self, query_seq: str, subject_seq: str) -> NDArray[numpy.bool_]:
+        return self._codes(query_seq) != self._codes(subject_seq)
+
     def __call__(
         self, query_seq: str | int, subject_seq: str | int
     ) -> tuple[int, list[int]]:
         self._check_inputs(query_seq, subject_seq)
         if isinstance(query_seq, int) and isinstance(subject_seq, int):
-            qs, ss = bin(query_seq)[2:], bin(subject_seq)[2:]
-            # Pad with leading zeros to make equal length
-            max_len = max(len(qs), len(ss))
-            qs = qs.zfill(max_len)
-            ss = ss.zfill(max_len)
-        else:
-            qs = [x.upper() for x in query_seq]
-            ss = [x.upper() for x in subject_seq]
-
-        if len(qs) == 1 and len(ss) == 1:
-            dist = 1 if qs != ss else 0
-            dist_array = [dist]
-            return dist, dist_array
-
-        dist = 0
-        dist_array = []
-        for i, char in enumerate(qs):
-            if char != ss[i]:
-                dist += 1
-                dist_array.append(1)
-                continue
-            dist_array.append(0)
+            # bits of the XOR, padded with leading zeros to the longer input
+            width = max(query_seq.bit_length(), subject_seq.bit_length(), 1)
+            diff = query_seq ^ subject_seq
+            dist_array = [(diff >> shift) & 1 for shift in range(width - 1, -1, -1)]
+            return diff.bit_count(), dist_array
 
-        dist += len(ss) - len(qs)
-        dist_array.extend([1] * (len(ss) - len(qs)))
-        return dist, dist_array
+        mismatches = self._mismatches(query_seq, subject_seq)
+        return int(numpy.count_nonzero(mismatches)), mismatches.astype(int).tolist()
 
     def distance(self, query_seq: str | int, subject_seq: str | int) -> int:
         self._check_inputs(query_seq, subject_seq)
         if isinstance(query_seq, int) and isinstance(subject_seq, int):
-            qs, ss = int(query_seq), int(subject_seq)
-            return bin(qs ^ ss).count("1")
-        if len(query_seq) == len(subject_seq) == 0:
-            return 0
-        qs = [x.upper() for x in query_seq]
-        ss = [x.upper() for x in subject_seq]
-        query = set([(x, y) for (x, y) in enumerate(qs)])
-        subject = set([(x, y) for (x, y) in enumerate(ss)])
-        qs, sq = query - subject, subject - query
-        dist = max(map(len, [qs, sq]))
-        return dist
+            return (query_seq ^ subject_seq).bit_count()
+        return int(numpy.count_nonzero(self._mismatches(query_seq, subject_seq)))
 
     def similarity(self, query_seq: str | int, subject_seq: str | int) -> int:
         self._check_inputs(query_seq, subject_seq)
         if isinstance(query_seq, int) and isinstance(subject_seq, int):
-            qs, ss = int(query_seq), int(subject_seq)
-            return bin(qs & ss).count("1")
+            return (query_seq & subject_seq).bit_count()
         if len(query_seq) == len(subject_seq) == 0:
             return 1
-        qs = [x.upper() for x in query_seq]
-        ss = [x.upper() for x in subject_seq]
-        query = set([(x, y) for (x, y) in enumerate(qs)])
-        subject = set([(x, y) for (x, y) in enumerate(ss)])
-        qs, sq = query - subject, subject - query
-        sim = max(map(len, [query_seq, subject_seq])) - max(map(len, [qs, sq]))
-        return sim
+        return len(query_seq) - self.distance(query_seq, subject_seq)
 
     def normalized_distance(self, query_seq, subject_seq) -> float:
         return self.distance(query_seq, subject_seq) / len(query_seq)
@@ -388,6 +459,85 @@ class Hamming:
         simarray = [1 if num == 0 else 0 for num in distarray]
         return simarray
 
+    def _encode_batch(self, seqs) -> NDArray:
+        """
+        Integer array for a batch: 1-D (uint64) for integers, compared bitwise,
+        and 2-D (one row per sequence) for strings, bytes and code arrays.
+        """
+        if isinstance(seqs, numpy.ndarray):
+            if seqs.dtype.kind not in "iu" or seqs.ndim not in (1, 2):
+                raise TypeError("Batches must be 1-D or 2-D integer arrays")
+            return seqs.astype(uint64) if seqs.ndim == 1 else seqs
+        seqs = list(seqs)
+        if all(isinstance(seq, int) for seq in seqs):
+            # batches hold one uint64 word per integer
+            if any(seq < 0 or seq.bit_length() > 64 for seq in seqs):
+                raise ValueError(
+                    "Batched integers must be non-negative and fit in 64 bits;"
+                    " use distance for wider integers"
+                )
+            return numpy.array(seqs, dtype=uint64)
+        if all(isinstance(seq, str) for seq in seqs):
+            joined = "".join(self._upper(seq) for seq in seqs)
+            codes = numpy.frombuffer(joined.encode("utf-32-le"), dtype=uint32)
+        elif all(isinstance(seq, (bytes, bytearray)) for seq in seqs):
+            codes = numpy.frombuffer(b"".join(seqs).upper(), dtype=uint8)
+        else:
+            raise TypeError("Batches must hold only strings, bytes or integers")
+        length = len(seqs[0])
+        if any(len(seq) != length for seq in seqs):
+            raise IndexError("Sequences must be of equal length")
+        return codes.reshape(len(seqs), length)
+
+    @staticmethod
+    def _pack(codes: NDArray, alphabet: NDArray) -> NDArray[uint8]:
+        # one packed bit plane per bit of the dense symbol code, so a position
+        # differs when any of its planes differs
+        dense = numpy.searchsorted(alphabet, codes)
+        planes = max(1, (len(alphabet) - 1).bit_length())
+        bits = (dense[:, None, :] >> numpy.arange(planes)[:, None]) & 1
+        return numpy.packbits(bits.astype(uint8), axis=-1)
+
+    def batch_distance(self, queries, subjects) -> NDArray[intp]:
+        """
+        Hamming distances between every query and every subject.
+
+        Takes lists of equal-length strings, bytes or integers, or 2-D integer
+        arrays of encoded sequences (e.g. uint8 barcodes), and returns a
+        ``len(queries)`` x ``len(subjects)`` array. Rows are bit-packed and
+        compared with XOR and popcount; integers are compared bitwise.
+        """
+        qs, ss = self._encode_batch(queries), self._encode_batch(subjects)
+        if not len(qs) or not len(ss):
+            return numpy.zeros((len(qs), len(ss)), dtype=intp)
+        if qs.ndim != ss.ndim:
+            raise TypeError(
+                "Sequences must be of the same type (both strings or both integers)"
+            )
+        if qs.ndim == 1:
+            diff = qs[:, None] ^ ss[None, :]
+            return numpy.bitwise_count(diff).astype(intp)
+        if qs.shape[1] != ss.shape[1]:
+            raise IndexError("Sequences must be of equal length")
+
+        alphabet = numpy.union1d(qs, ss)
+        packed_qs, packed_ss = self._pack(qs, alphabet), self._pack(ss, alphabet)
+        dist = numpy.empty((len(qs), len(ss)), dtype=intp)
+        chunk = max(1, self.batch_bytes // max(1, packed_ss.size))
+        for start in range(0, len(qs), chunk):
+            block = packed_qs[start : start + chunk, None] ^ packed_ss[None]
+            mismatched = numpy.bitwise_or.reduce(block, axis=2)
+            dist[start : start + chunk] = numpy.bitwise_count(mismatched).sum(axis=-1)
+        return dist
+
+    def batch_similarity(self, queries, subjects) -> NDArray[intp]:
+        """Matching positions (shared set bits for integers) of every pair"""
+        qs, ss = self._encode_batch(queries), self._encode_batch(subjects)
+        if len(qs) and len(ss) and qs.ndim == ss.ndim == 1:
+            return numpy.bitwise_count(qs[:, None] & ss[None, :]).astype(intp)
+        dist = self.batch_distance(qs, ss)
+        return (qs.shape[1] if qs.ndim == 2 else 0) - dist
+
     def matrix(self, qs: str, ss: str) -> None:
         return None
 
@@ -403,18 +553,24 @@ class NeedlemanWunsch(_GlobalBase):
     supports_substitution_matrix = True
 
     def __init__(
-        self, match: int = 2, mismatch: int = 1, gap: int = 2, substitution_matrix=None
+        self,
+        match: int = 2,
+        mismatch: int = 1,
+        gap: int = 2,
+        substitution_matrix=None,
+        end_gaps: str | Iterable[str] = "penalized",
     ) -> None:
         self.match = match
         self.mismatch = mismatch
         self.gap = gap
+        self.end_gaps, self._free_ends = _parse_end_gaps(end_gaps)
         self.has_sub_mat = False
         self.sub_mat = substitution_matrix
         if substitution_matrix is not None:
-            self.match_func = lambda a, b: substitution_matrix[a][b]
+            self.match_func = self._substitution_score
             self.has_sub_mat = True
         else:
-            self.match_func = lambda a, b: self.match if a == b else -self.mismatch
+            self.match_func = self._match_score
 
     def __call__(
         self, query_seq: str, subject_seq: str
@@ -434,6 +590,11 @@ class NeedlemanWunsch(_GlobalBase):
         # initialisation of starter values for first column and first row
         self.score[:, 0] = [-n * self.gap for n in range(qs_len)]
         self.score[0, :] = [-n * self.gap for n in range(ss_len)]
+        # free leading gaps: either sequence may overhang the start of the other
+        if "query_start" in self._free_ends:
+            self.score[:, 0] = 0
+        if "subject_start" in self._free_ends:
+            self.score[0, :] = 0
 
         for i in range(1, qs_len):
             for j in range(1, ss_len):
@@ -493,10 +654,10 @@ class WatermanSmithBeyer(_GlobalBase):
         self.has_sub_mat = False
         self.sub_mat = substitution_matrix
         if substitution_matrix is not None:
-            self.match_func = lambda a, b: substitution_matrix[a][b]
+            self.match_func = self._substitution_score
             self.has_sub_mat = True
         else:
-            self.match_func = lambda a, b: self.match if a == b else -self.mismatch
+            self.match_func = self._match_score
 
     def _gap_func(self, k: int) -> int:
         match self.gap_function:
@@ -578,6 +739,9 @@ class WatermanSmithBeyer(_GlobalBase):
     def align(
         self, query_seq: str, subject_seq: str, all_alignments: bool = False
     ) -> str | list[str]:
+        if not all_alignments:
+            return str(self.traceback(query_seq, subject_seq))
+
         _, pointer_matrix = self(query_seq, subject_seq)
 
         qs = [x.upper() for x in query_seq]
@@ -631,6 +795,14 @@ class WatermanSmithBeyer(_GlobalBase):
             return aligned[0]
         return aligned
 
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment:
+        _, pointer_matrix = self(query_seq, subject_seq)
+        i, j = len(query_seq), len(subject_seq)
+        path = _walk_steps(pointer_matrix, i, j, _at_origin)
+        if path is None:
+            raise ValueError("No traceback path from the last cell")
+        return Alignment(query_seq.upper(), subject_seq.upper(), path[0])
+
 
 class WatermanSmithBeyerLocal(_LocalBase):
     supports_substitution_matrix = True
@@ -652,10 +824,10 @@ class WatermanSmithBeyerLocal(_LocalBase):
         self.has_sub_mat = False
         self.sub_mat = substitution_matrix
         if substitution_matrix is not None:
-            self.match_func = lambda a, b: substitution_matrix[a][b]
+            self.match_func = self._substitution_score
             self.has_sub_mat = True
         else:
-            self.match_func = lambda a, b: self.match if a == b else -self.mismatch
+            self.match_func = self._match_score
 
     def _gap_func(self, k: int) -> int:
         match self.gap_function:
@@ -733,6 +905,14 @@ class WatermanSmithBeyerLocal(_LocalBase):
     def align(
         self, query_seq: str, subject_seq: str, all_alignments: bool = False
     ) -> str | list[str]:
+        if not all_alignments:
+            traceback = self.traceback(query_seq, subject_seq)
+            return (
+                str(traceback)
+                if traceback is not None
+                else "There is no local alignment!"
+            )
+
         matrix, pointer_matrix = self(query_seq, subject_seq)
 
         qs = [x.upper() for x in query_seq]
@@ -790,6 +970,17 @@ class WatermanSmithBeyerLocal(_LocalBase):
             return aligned[0]
         return aligned
 
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment | None:
+        matrix, pointer_matrix = self(query_seq, subject_seq)
+        if matrix.max() == 0:
+            return None
+
+        for i, j in numpy.argwhere(matrix == matrix.max())[::-1]:
+            path = _walk_steps(pointer_matrix, i, j, lambda i, j: matrix[i][j] == 0)
+            if path is not None:
+                return Alignment(query_seq.upper(), subject_seq.upper(), *path)
+        raise ValueError("No traceback path from the highest scoring cells")
+
 
 class Gotoh(_GlobalBase):
     supports_substitution_matrix = True
@@ -801,18 +992,20 @@ class Gotoh(_GlobalBase):
         new_gap: int = 3,
         continued_gap: int = 1,
         substitution_matrix=None,
+        end_gaps: str | Iterable[str] = "penalized",
     ) -> None:
         self.match = match
         self.mismatch = mismatch
         self.gap = new_gap
         self.continued_gap = continued_gap
+        self.end_gaps, self._free_ends = _parse_end_gaps(end_gaps)
         self.has_sub_mat = False
         self.sub_mat = substitution_matrix
         if substitution_matrix is not None:
-            self.match_func = lambda a, b: substitution_matrix[a][b]
+            self.match_func = self._substitution_score
             self.has_sub_mat = True
         else:
-            self.match_func = lambda a, b: self.match if a == b else -self.mismatch
+            self.match_func = self._match_score
 
     def __call__(self, query_seq: str, subject_seq: str) -> tuple[
         NDArray[float64],
@@ -843,6 +1036,11 @@ class Gotoh(_GlobalBase):
         # Initialize first row (horizontal gaps)
         for j in range(1, len(ss)):
             self.D[0, j] = -(self.gap + (j) * self.continued_gap)
+        # free leading gaps: either sequence may overhang the start of the other
+        if "query_start" in self._free_ends:
+            self.D[:, 0] = 0
+        if "subject_start" in self._free_ends:
+            self.D[0, :] = 0
 
         for i in range(1, len(qs)):
             for j in range(1, len(ss)):
@@ -886,7 +1084,7 @@ class Gotoh(_GlobalBase):
         if query_seq == subject_seq == "":
             return self.match
         D, _, _, _ = self(query_seq, subject_seq)
-        return float(D[D.shape[0] - 1, D.shape[1] - 1])
+        return float(D[self._end_cell(D)])
 
     def normalized_distance(self, query_seq: str, subject_seq: str) -> float:
         return super().normalized_distance(query_seq, subject_seq)
@@ -909,19 +1107,26 @@ class Gotoh(_GlobalBase):
             length = max(len(query_seq), len(subject_seq))
             gaps = "".join(["-"] * length)
             return f"{gaps if not query_seq else query_seq}\n{gaps if not subject_seq else subject_seq}"
+        if not all_alignments:
+            return str(self.traceback(query_seq, subject_seq))
 
-        _, _, _, (D_pointer, P_pointer, Q_pointer) = self(query_seq, subject_seq)
+        D, _, _, (D_pointer, P_pointer, Q_pointer) = self(query_seq, subject_seq)
 
         qs, ss = [x.upper() for x in query_seq], [x.upper() for x in subject_seq]
-        i, j = len(qs), len(ss)
+        i, j = self._end_cell(D)
+        # residues past the end cell are aligned to free end gaps
+        query_tail, subject_tail = _overhang("".join(qs), "".join(ss), i, j)
         aligned = []
-        stack = [([""], [""], i, j)]
+        stack = [([""] + list(query_tail[::-1]), [""] + list(subject_tail[::-1]), i, j)]
 
         # Looks for match/mismatch/gap starting from bottom right of matrix
         active_matrix = D_pointer
         while stack:
             qs_align, ss_align, i, j = stack.pop()
-            if i <= 0 and j <= 0:
+            if i <= 0 or j <= 0:
+                # the first row and column only hold gaps
+                qs_align = qs_align + ["-"] * j + qs[:i][::-1]
+                ss_align = ss_align + ss[:j][::-1] + ["-"] * i
                 qs_aligned = "".join(qs_align[::-1])
                 ss_aligned = "".join(ss_align[::-1])
                 aligned.append(f"{qs_aligned}\n{ss_aligned}")
@@ -961,6 +1166,24 @@ class Gotoh(_GlobalBase):
             return aligned[0]
         return aligned
 
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment:
+        if not query_seq or not subject_seq:
+            return _gap_only(query_seq, subject_seq)
+
+        D, _, _, pointers = self(query_seq, subject_seq)
+        end_i, end_j = self._end_cell(D)
+        path, _ = _walk_affine(pointers, 0, end_i, end_j, lambda i, j: i == 0 or j == 0)
+        if path is None:
+            raise ValueError("No traceback path from the last cell")
+        # the first row and column only hold gaps
+        ops, i, j = path
+        leading = bytes([OP_INSERT]) * i + bytes([OP_DELETE]) * j
+        return Alignment(
+            query_seq.upper(),
+            subject_seq.upper(),
+            leading + ops + _end_ops(D, end_i, end_j),
+        )
+
 
 class GotohLocal(_LocalBase):
     def __init__(
@@ -975,11 +1198,12 @@ class GotohLocal(_LocalBase):
         self.mismatch = mismatch
         self.gap = new_gap
         self.continued_gap = continued_gap
+        self.sub_mat = substitution_matrix
         if substitution_matrix is not None:
-            self.match_func = lambda a, b: substitution_matrix[a][b]
+            self.match_func = self._substitution_score
             self.has_sub_mat = True
         else:
-            self.match_func = lambda a, b: self.match if a == b else -self.mismatch
+            self.match_func = self._match_score
 
     def __call__(
         self, query_seq: str, subject_seq: str
@@ -1078,6 +1302,10 @@ class GotohLocal(_LocalBase):
     def align(
         self, query_seq: str, subject_seq: str, all_alignments: bool = False
     ) -> str | list[str]:
+        if not all_alignments:
+            traceback = self.traceback(query_seq, subject_seq)
+            return str(traceback) if traceback is not None else ""
+
         matrix, _, _, (D_pointer, P_pointer, Q_pointer) = self(query_seq, subject_seq)
 
         qs = [x.upper() for x in query_seq]
@@ -1133,68 +1361,127 @@ class GotohLocal(_LocalBase):
             return aligned[0]
         return aligned
 
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment | None:
+        matrix, _, _, pointers = self(query_seq, subject_seq)
+        if matrix.max() == 0:
+            return None
+
+        # the active pointer matrix carries over between start cells like in align
+        active = 0
+        for i, j in numpy.argwhere(matrix == matrix.max())[::-1]:
+            path, active = _walk_affine(
+                pointers, active, i, j, lambda i, j: matrix[i][j] == 0
+            )
+            if path is not None:
+                return Alignment(query_seq.upper(), subject_seq.upper(), *path)
+        raise ValueError("No traceback path from the highest scoring cells")
+
 
-class Hirschberg:
+class Hirschberg(_GlobalBase):
     supports_substitution_matrix = True
 
     def __init__(
-        self, match: int = 1, mismatch: int = 2, gap: int = 4, substitution_matrix=None
+        self,
+        match: int = 1,
+        mismatch: int = 2,
+        gap: int = 4,
+        substitution_matrix=None,
+        end_gaps: str | Iterable[str] = "penalized",
     ) -> None:
         self.match = match
         self.mismatch = mismatch
         self.gap = gap
+        self.end_gaps, self._free_ends = _parse_end_gaps(end_gaps)
         self.has_sub_mat = False
         self.sub_mat = substitution_matrix
         if substitution_matrix is not None:
-            self.match_func = lambda a, b: -1 * substitution_matrix[a][b]
+            self.match_func = self._substitution_score
             self.has_sub_mat = True
         else:
-            self.match_func = lambda a, b: -self.match if a == b else self.mismatch
+            self.match_func = self._match_score
+
+    # Hirschberg minimizes a cost, so scores are negated
+    def _match_score(self, a: str, b: str) -> float:
+        return -self.match if a == b else self.mismatch
+
+    def _substitution_score(self, a: str, b: str) -> float:
+        return -1 * self.sub_mat[a][b]
 
     def __call__(self, query_seq: str, subject_seq: str) -> str:
         qs = "".join([x.upper() for x in query_seq])
         ss = "".join([x.upper() for x in subject_seq])
+        return self._hirschberg(qs, ss, free=self._free_ends)
 
+    def _hirschberg(self, qs: str, ss: str, free: frozenset[str] = frozenset()) -> str:
         if len(qs) == 0:
             return f"{'-' * len(ss)}\n{ss}"
         elif len(ss) == 0:
             return f"{qs}\n{'-' * len(qs)}"
         elif len(qs) == 1 or len(ss) == 1:
-            return self._align_simple(qs, ss)
+            return self._align_simple(qs, ss, free)
 
         # Divide and conquer
         xmid = len(qs) // 2
 
         # Forward score from start to mid
-        score_left = self._score(qs[:xmid], ss)
+        score_left = self._score(
+            qs[:xmid],
+            ss,
+            "subject_start" in free,
+            "query_start" in free,
+            "query_end" in free,
+        )
         # Backward score from end to mid
-        score_right = self._score(qs[xmid:][::-1], ss[::-1])[::-1]
+        score_right = self._score(
+            qs[xmid:][::-1],
+            ss[::-1],
+            "subject_end" in free,
+            "query_end" in free,
+            "query_start" in free,
+        )[::-1]
 
         # Find optimal split point in subject sequence
         total_scores = score_left + score_right
         ymid = numpy.argmin(total_scores)
 
-        # Recursively align both halves
-        left_align = self(qs[:xmid], ss[:ymid])
-        right_align = self(qs[xmid:], ss[ymid:])
+        # Recursively align both halves; a free end only carries over to the
+        # half that still touches it
+        left_free = free & {"query_start", "subject_start"}
+        right_free = free & {"query_end", "subject_end"}
+        if ymid == len(ss):
+            left_free |= free & {"query_end"}
+        if ymid == 0:
+            right_free |= free & {"query_start"}
+        left_align = self._hirschberg(qs[:xmid], ss[:ymid], free=left_free)
+        right_align = self._hirschberg(qs[xmid:], ss[ymid:], free=right_free)
 
         # Combine the alignments
         left_q, left_s = left_align.split("\n")
         right_q, right_s = right_align.split("\n")
         return f"{left_q + right_q}\n{left_s + right_s}"
 
-    def _score(self, qs: str, ss: str) -> NDArray[float64]:
+    def _score(
+        self,
+        qs: str,
+        ss: str,
+        free_first_row: bool = False,
+        free_first_col: bool = False,
+        free_last_col: bool = False,
+    ) -> NDArray[float64]:
         # Calculate forward/backward score profile
         prev_row = numpy.zeros(len(ss) + 1, dtype=float64)
         curr_row = numpy.zeros(len(ss) + 1, dtype=float64)
 
         # Initialize first row
-        for j in range(1, len(ss) + 1):
-            prev_row[j] = prev_row[j - 1] + self.gap
+        if not free_first_row:
+            for j in range(1, len(ss) + 1):
+                prev_row[j] = prev_row[j - 1] + self.gap
+        # a free last column lets the path run down it at no cost
+        best_last = prev_row[-1]
 
         # Fill matrix
         for i in range(1, len(qs) + 1):
-            curr_row[0] = prev_row[0] + self.gap
+            curr_row[0] = 0 if free_first_col else prev_row[0] + self.gap
             for j in range(1, len(ss) + 1):
                 match = self.match_func(qs[i - 1], ss[j - 1])
                 curr_row[j] = min(
@@ -1202,20 +1489,27 @@ class Hirschberg:
                     prev_row[j] + self.gap,  # deletion
                     curr_row[j - 1] + self.gap,  # insertion
                 )
+            best_last = min(best_last, curr_row[-1])
             prev_row, curr_row = curr_row, prev_row
 
+        if free_last_col:
+            prev_row[-1] = best_last
         return prev_row
 
-    def _align_simple(self, qs: str, ss: str) -> str:
+    def _align_simple(
+        self, qs: str, ss: str, free: frozenset[str] = frozenset()
+    ) -> str:
         score = numpy.zeros((len(qs) + 1, len(ss) + 1), dtype=float64)
         pointer = numpy.zeros((len(qs) + 1, len(ss) + 1), dtype=float64)
 
         # Initialize first row and column
         for i in range(1, len(qs) + 1):
-            score[i, 0] = score[i - 1, 0] + self.gap
+            if "query_start" not in free:
+                score[i, 0] = score[i - 1, 0] + self.gap
             pointer[i, 0] = 1
         for j in range(1, len(ss) + 1):
-            score[0, j] = score[0, j - 1] + self.gap
+            if "subject_start" not in free:
+                score[0, j] = score[0, j - 1] + self.gap
             pointer[0, j] = 2
 
         # Fill matrices
@@ -1234,9 +1528,16 @@ class Hirschberg:
                 else:
                     pointer[i, j] = 2
 
-        # Traceback
+        # Traceback from the last cell, or the best one of a free last row/column
         i, j = len(qs), len(ss)
-        qs_align, ss_align = [], []
+        cells = [(i, j)]
+        if "subject_end" in free:
+            cells.extend((i, col) for col in range(j - 1, -1, -1))
+        if "query_end" in free:
+            cells.extend((row, j) for row in range(i - 1, -1, -1))
+        i, j = min(cells, key=lambda cell: score[cell])
+        query_tail, subject_tail = _overhang(qs, ss, i, j)
+        qs_align, ss_align = list(query_tail[::-1]), list(subject_tail[::-1])
 
         while i > 0 or j > 0:
             if i > 0 and j > 0 and pointer[i, j] == 3:
@@ -1264,8 +1565,7 @@ class Hirschberg:
         if not subject_seq:
             return self.gap * len(query_seq)
 
-        alignment = self(query_seq, subject_seq)
-        qs_align, ss_align = alignment.split("\n")
+        qs_align, ss_align = self._scored_columns(self(query_seq, subject_seq))
 
         dist = 0.0
         for q, s in zip(qs_align, ss_align):
@@ -1282,8 +1582,7 @@ class Hirschberg:
             return 1.0
         if not query_seq or not subject_seq:
             return 0.0
-        alignment = self(query_seq, subject_seq)
-        qs_align, ss_align = alignment.split("\n")
+        qs_align, ss_align = self._scored_columns(self(query_seq, subject_seq))
 
         score = 0.0
         for q, s in zip(qs_align, ss_align):
@@ -1293,6 +1592,20 @@ class Hirschberg:
                 score -= self.match_func(q, s)
         return max(0.0, float(score))
 
+    def _scored_columns(self, alignment: str) -> tuple[str, str]:
+        """Aligned rows without the end gaps of free ends, which are not scored"""
+        qs_align, ss_align = alignment.split("\n")
+        start, end = 0, len(qs_align)
+        if "subject_start" in self._free_ends and qs_align.startswith("-"):
+            start = len(qs_align) - len(qs_align.lstrip("-"))
+        elif "query_start" in self._free_ends and ss_align.startswith("-"):
+            start = len(ss_align) - len(ss_align.lstrip("-"))
+        if "subject_end" in self._free_ends and qs_align.endswith("-"):
+            end = len(qs_align.rstrip("-"))
+        elif "query_end" in self._free_ends and ss_align.endswith("-"):
+            end = len(ss_align.rstrip("-"))
+        return qs_align[start:end], ss_align[start:end]
+
     def normalized_distance(self, query_seq: str, subject_seq: str) -> float:
         """Calculate normalized distance between sequences"""
         if query_seq == subject_seq:
@@ -1339,6 +1652,11 @@ class Hirschberg:
     def align(self, query_seq: str, subject_seq: str) -> str:
         return self(query_seq, subject_seq)
 
+    def traceback(self, query_seq: str, subject_seq: str) -> Alignment:
+        return Alignment.from_string(
+            self(query_seq, subject_seq), query_seq.upper(), subject_seq.upper()
+        )
+
 
 class Jaro:
     supports_substitution_matrix = False
@@ -1571,6 +1889,14 @@ class SmithWaterman(_LocalBase):
     def align(
         self, query_seq: str, subject_seq: str, all_alignments: bool = False
     ) -> str | list[str]:
+        if not all_alignments:
+            traceback = self.traceback(query_seq, subject_seq)
+            return (
+                str(traceback)
+                if traceback is not None
+                else "There is no local alignment!"
+            )
+
         matrix, pointer_matrix = self(query_seq, subject_seq)
 
         qs = [x.upper() for x in query_seq]
@@ -1,7 +1,13 @@
+# standard library
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
 try:
     # external dependencies
     import numpy
-    from numpy import float64
+    from numpy import float64, intp, uint32
     from numpy._typing import NDArray
 
     # global packages serving as a placeholder for parsing newick strings - adahik
@@ -26,6 +32,12 @@ from goombay.align.edit import (
 )
 
 
+from goombay.align.alignment import Alignment, OP_MATCH
+from goombay.align.cache import scorer_config
+from goombay.align.kmer import KmerDistance
+from goombay.align.profile import ProfileAligner
+from goombay.align.store import PairwiseStore
+
 from goombay.phylo.cluster import (
     NeighborJoining,
     NewickFormatter,
@@ -34,6 +46,161 @@ from goombay.phylo.cluster import (
 __all__ = ["FengDoolittle", "feng_doolittle", "NotredameHigginsHeringa", "nhh"]
 
 
+# sequences and aligner of a worker process, set once by _init_pair_worker
+_worker_seqs: list[str] = []
+_worker_aligner = None
+
+# Biopython aligner of the NHH pairwise stage, built on first use in each process
+_biopython_aligner = None
+
+
+def _init_pair_worker(shm_name: str, bounds: list[tuple[int, int]], aligner):
+    global _worker_seqs, _worker_aligner
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # sequences are stored back to back as UTF-32, four bytes per character
+        text = bytes(shm.buf[: 4 * bounds[-1][1]]).decode("utf-32-le")
+    finally:
+        shm.close()
+    _worker_seqs = [text[start:end] for start, end in bounds]
+    _worker_aligner = aligner
+
+
+def _chunk_distances(pairs: list[tuple[int, int]]) -> list[float]:
+    return [
+        float(_worker_aligner.distance(_worker_seqs[i], _worker_seqs[j]))
+        for i, j in pairs
+    ]
+
+
+def _chunk_alignments(pairs: list[tuple[int, int]]) -> list[bytes]:
+    return [
+        _alignment_ops(_worker_aligner, _worker_seqs[i], _worker_seqs[j])
+        for i, j in pairs
+    ]
+
+
+def _alignment_ops(aligner, query_seq: str, subject_seq: str) -> bytes:
+    """
+    Operations (see ``Alignment``) of the alignment of two sequences by a
+    goombay aligner, or by Biopython's ``PairwiseAligner`` when ``aligner`` is
+    None. One byte per column is all that crosses process boundaries.
+    """
+    global _biopython_aligner
+    if aligner is None:
+        if _biopython_aligner is None:
+            _biopython_aligner = Align.PairwiseAligner(match_score=1.0)
+        alignment = _biopython_aligner.align(query_seq, subject_seq)[0]
+        aligned = f"{alignment[0]}\n{alignment[1]}"
+        return Alignment.from_string(aligned, query_seq, subject_seq).ops.tobytes()
+    if hasattr(aligner, "traceback"):
+        return aligner.traceback(query_seq, subject_seq).ops.tobytes()
+    aligned = aligner.align(query_seq, subject_seq)
+    return Alignment.from_string(aligned, query_seq, subject_seq).ops.tobytes()
+
+
+def _balanced_chunks(
+    pairs: list[tuple[int, int]], seqs: list[str], count: int
+) -> list[list[tuple[int, int]]]:
+    """
+    Split ``pairs`` into at most ``count`` chunks of similar total work, taking
+    the work of a pair as the size of its DP matrix. Pairs are handed out
+    largest first, each to the chunk with the least work so far.
+    """
+    count = max(1, min(count, len(pairs)))
+    chunks = [[] for _ in range(count)]
+    loads = [(0, k) for k in range(count)]
+    by_cost = sorted(
+        pairs, key=lambda pair: -(len(seqs[pair[0]]) + 1) * (len(seqs[pair[1]]) + 1)
+    )
+    for i, j in by_cost:
+        load, k = heapq.heappop(loads)
+        chunks[k].append((i, j))
+        heapq.heappush(loads, (load + (len(seqs[i]) + 1) * (len(seqs[j]) + 1), k))
+    return [chunk for chunk in chunks if chunk]
+
+
+# primary library and neighbourhoods of an NHH extension worker, set once by
+# _init_extension_worker
+_worker_library: dict = {}
+_worker_neighbourhoods: list = []
+
+
+def _init_extension_worker(library: dict, neighbourhoods: list):
+    global _worker_library, _worker_neighbourhoods
+    _worker_library = library
+    _worker_neighbourhoods = neighbourhoods
+
+
+def _chunk_extensions(pairs: list[tuple[int, int]]) -> list[tuple]:
+    return [
+        _extend_pair(_worker_library, _worker_neighbourhoods, a, b) for a, b in pairs
+    ]
+
+
+def _neighbourhood(
+    library: dict, x: int, n: int, width: int
+) -> tuple[NDArray[intp], NDArray[intp], NDArray[float64]]:
+    """
+    Every constraint of sequence x against any other sequence c, as residue
+    indices in x, keys ``c * width + k`` of the residue k of c, and weights.
+    """
+    parts = []
+    for c in range(n):
+        if c == x:
+            continue
+        # constraints of x against c, whichever way round the pair is stored
+        if x < c:
+            own, other, weights = library[x, c]
+        else:
+            other, own, weights = library[c, x]
+        parts.append((own, other + c * width, weights))
+    if not parts:
+        return tuple(numpy.zeros(0, dtype=dtype) for dtype in (intp, intp, float64))
+    return tuple(numpy.concatenate(part) for part in zip(*parts))
+
+
+def _join(
+    ac: tuple[NDArray[intp], NDArray[intp], NDArray[float64]],
+    cb: tuple[NDArray[intp], NDArray[intp], NDArray[float64]],
+) -> tuple[NDArray[intp], NDArray[intp], NDArray[float64]]:
+    """
+    Compose a-c and c-b constraints on their shared residue k of c, each
+    triangle a[i] -> c[k] -> b[j] weighted by the weaker of its two sides.
+    """
+    i_ac, k_ac, w_ac = ac
+    k_cb, j_cb, w_cb = cb
+    order = numpy.argsort(k_cb, kind="stable")
+    sorted_k = k_cb[order]
+    lo = numpy.searchsorted(sorted_k, k_ac, side="left")
+    counts = numpy.searchsorted(sorted_k, k_ac, side="right") - lo
+    # every a-c constraint repeated once per c-b constraint sharing its k
+    left = numpy.repeat(numpy.arange(len(k_ac)), counts)
+    starts = numpy.repeat(lo - (numpy.cumsum(counts) - counts), counts)
+    right = order[starts + numpy.arange(len(left))]
+    return i_ac[left], j_cb[right], numpy.minimum(w_ac[left], w_cb[right])
+
+
+def _extend_pair(
+    library: dict, neighbourhoods: list, a: int, b: int
+) -> tuple[NDArray[intp], NDArray[intp], NDArray[float64]]:
+    """
+    Extended constraints of the pair (a, b): its own plus every triangulation.
+    Joining the neighbourhoods of a and b on their keys covers all third
+    sequences c at once; neither holds its own sequence, so c is never a or b.
+    """
+    own_b, keys_b, weights_b = neighbourhoods[b]
+    triangles = _join(neighbourhoods[a], (keys_b, own_b, weights_b))
+    i_idx, j_idx, weights = (
+        numpy.concatenate(part) for part in zip(library[a, b], triangles)
+    )
+    # sum the weights of every residue pair reached more than once
+    width = int(j_idx.max()) + 1 if len(j_idx) else 1
+    keys, inverse = numpy.unique(i_idx * width + j_idx, return_inverse=True)
+    weights = numpy.bincount(inverse, weights, minlength=len(keys))
+    return keys // width, keys % width, weights
+
+
 def main():
     seqs = ["ATCG", "TCG", "ACG"]
     feng_doolittle(seqs)
@@ -78,6 +245,16 @@ class MSABase:
 
     cl_abbreviations = {"nj": "neighbor_joining"}
 
+    # processes used by the alignment stages that can run in parallel
+    workers = 1
+
+    # passes and seconds of iterative refinement after progressive alignment
+    refine_iterations = 0
+    refine_time = None
+
+    # guide tree distances: pairwise alignment distances or alignment-free k-mer distances
+    supported_distances = ("pairwise", "kmer")
+
     @classmethod
     def supported_pairwise_algs(cls):
         return list(cls.global_supported_pairwise)
@@ -86,6 +263,95 @@ class MSABase:
     def supported_clustering_algs(cls):
         return list(cls.supported_clustering)
 
+    def _worker_count(self, workers: int | None) -> int:
+        """Number of worker processes, all CPUs for None"""
+        if workers is None:
+            return os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        return workers
+
+    def _parallel_pairs(
+        self, seqs: list[str], pairs: list[tuple[int, int]], aligner, task
+    ) -> list:
+        """
+        ``task`` applied to chunks of ``pairs`` by a pool of ``self.workers``
+        processes, each holding ``aligner``. The sequences are copied once
+        into shared memory that every worker reads when it starts, and the
+        pairs are sent in chunks balanced by the size of their DP matrices.
+        Results are returned in the order of ``pairs``.
+        """
+        if not pairs:
+            return []
+        # a few chunks per worker even out the load left by the cost estimate
+        chunks = _balanced_chunks(pairs, seqs, 4 * self.workers)
+        bounds, start = [], 0
+        for seq in seqs:
+            bounds.append((start, start + len(seq)))
+            start += len(seq)
+        data = "".join(seqs).encode("utf-32-le")
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        try:
+            shm.buf[: len(data)] = data
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(chunks)),
+                initializer=_init_pair_worker,
+                initargs=(shm.name, bounds, aligner),
+            ) as pool:
+                results = pool.map(task, chunks)
+                values = {}
+                for chunk, chunk_values in zip(chunks, results):
+                    values.update(zip(chunk, chunk_values))
+        finally:
+            shm.close()
+            shm.unlink()
+        return [values[pair] for pair in pairs]
+
+    def _refinement(self, iterations: int, time_limit: float | None) -> None:
+        """Set the refinement budget; 0 iterations skips refinement"""
+        if iterations < 0:
+            raise ValueError("refine_iterations must be non-negative")
+        if time_limit is not None and time_limit < 0:
+            raise ValueError("refine_time must be non-negative")
+        self.refine_iterations = iterations
+        self.refine_time = time_limit
+
+    def refine(
+        self, aligned_seqs: list[str], newick_tree: Phylo.Newick.Tree
+    ) -> list[str]:
+        """
+        Iteratively refine the progressive alignment of ``newick_tree``: the
+        alignment is split at every edge of the guide tree in turn and the
+        two sides realigned, keeping only improvements of the sum-of-pairs
+        score. Runs at most ``self.refine_iterations`` passes over the edges
+        and stops trying edges after ``self.refine_time`` seconds.
+
+        :param aligned_seqs: members of the root profile, ordered like the leaves
+        :param newick_tree: the guide tree the alignment was built from
+        """
+        # merged profiles list the left subtree first, like get_terminals
+        rows = {id(leaf): row for row, leaf in enumerate(newick_tree.get_terminals())}
+        splits, seen = [], set()
+        for clade in newick_tree.find_clades(order="preorder"):
+            if clade is newick_tree.root:
+                continue
+            split = frozenset(rows[id(leaf)] for leaf in clade.get_terminals())
+            # both children of the root split off the same two sides
+            complement = frozenset(rows.values()) - split
+            if split not in seen and complement not in seen:
+                seen.add(split)
+                splits.append(sorted(split))
+        return ProfileAligner.from_aligner(self.pairwise).refine(
+            aligned_seqs, splits, self.refine_iterations, self.refine_time
+        )
+
+    def _guide_distance(self, distance: str, kmer_size: int) -> KmerDistance | None:
+        """K-mer distance for guide trees, or None when pairwise alignments are used"""
+        if distance.lower() not in self.supported_distances:
+            raise ValueError(f"Unsupported guide tree distance: {distance}")
+        self.distance = distance.lower()
+        return KmerDistance(kmer_size) if self.distance == "kmer" else None
+
     # helper functions for interpreting the newick formatted tree and merging them
     def parse_newick(self, newick: str):
         """
@@ -99,45 +365,14 @@ class MSABase:
 
     def merge_profiles(self, profile1: list[str], profile2: list[str]) -> list[str]:
         """
-        Docstring for merge_profiles
+        Align two profiles column by column and apply the resulting gaps to
+        every member of both.
 
-        :param self: Description
-        :param profile1: Description
-        :type profile1: list[str]
-        :param profile2: Description
-        :type profile2: list[str]
-        :return: Description
-        :rtype: list[str]
+        :param profile1: aligned sequences of equal length
+        :param profile2: aligned sequences of equal length
+        :return: members of profile1 followed by those of profile2, all of one length
         """
-        # Pick first seq from each profile as representative (simplified for now)\
-        rep1 = profile1[0]
-        rep2 = profile2[0]
-        # Align the two representative sequences
-        aligned_rep1, aligned_rep2 = self.pairwise.align(rep1, rep2).split("\n")
-
-        # Helper: apply gaps to all sequences in a profile
-        def apply_gaps(profile, aligned_rep):
-            gapped_profile = []
-            for seq in profile:
-                gapped_seq = []
-                seq_i = 0
-                for char in aligned_rep:
-                    if char == "-":
-                        gapped_seq.append("-")
-                    else:
-                        # Now take the actual character
-                        if seq_i < len(seq):
-                            gapped_seq.append(seq[seq_i])
-                            seq_i += 1
-
-                gapped_profile.append("".join(gapped_seq))
-            return gapped_profile
-
-        # Apply alignment gap pattern to all sequences
-        aligned_profile1 = apply_gaps(profile1, aligned_rep1)
-        aligned_profile2 = apply_gaps(profile2, aligned_rep2)
-
-        return aligned_profile1 + aligned_profile2
+        return ProfileAligner.from_aligner(self.pairwise).merge(profile1, profile2)
 
     def _align(
         self,
@@ -146,7 +381,9 @@ class MSABase:
         verbose: bool,
     ):
         """
-        Docstring for _align
+        Merge profiles up the guide tree, each internal node once both of its
+        children are merged. Child profiles are dropped from ``profile_dict``
+        once merged, so only the profiles of unmerged subtrees are kept.
 
         :param self: Description
         :param newick_tree: Description
@@ -154,6 +391,8 @@ class MSABase:
         :param verbose: boolean value for controlling print statements
         :type verbose: bool
         """
+        if self.workers > 1:
+            return self._align_parallel(newick_tree, profile_dict, verbose)
         for clade in newick_tree.get_nonterminals(order="postorder"):
             left, right = clade.clades
             if verbose:
@@ -162,8 +401,8 @@ class MSABase:
                 if verbose:
                     print(f"Merging {left.name} and {right.name}")
                 # Merge the aligned profiles
-                left_profile = profile_dict[left.name]
-                right_profile = profile_dict[right.name]
+                left_profile = profile_dict.pop(left.name)
+                right_profile = profile_dict.pop(right.name)
                 merged_profile = self.merge_profiles(
                     left_profile, right_profile
                 )  # these are consensus merges
@@ -174,6 +413,53 @@ class MSABase:
                 # store the merged profile
                 profile_dict[clade.name] = merged_profile
 
+    def _align_parallel(
+        self,
+        newick_tree: Phylo.Newick.Tree,
+        profile_dict: dict[str, list[str]],
+        verbose: bool,
+    ):
+        """
+        Like ``_align``, with every internal node whose children are merged
+        submitted to a pool of ``self.workers`` processes as soon as it is
+        ready. Sibling subtrees are merged concurrently, so a balanced tree
+        takes about as long as its deepest path of merges.
+        """
+        aligner = ProfileAligner.from_aligner(self.pairwise)
+        parents = {}
+        for clade in newick_tree.get_nonterminals(order="postorder"):
+            # Assign unique name to internal node if needed
+            if not clade.name:
+                clade.name = f"merged_{id(clade)}"
+            for child in clade.clades:
+                parents[id(child)] = clade
+
+        def submit(clade):
+            left, right = clade.clades
+            if verbose:
+                print(f"Merging {left.name} and {right.name}")
+            return pool.submit(
+                aligner.merge, profile_dict.pop(left.name), profile_dict.pop(right.name)
+            )
+
+        def is_ready(clade):
+            return all(child.name in profile_dict for child in clade.clades)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            running = {
+                submit(clade): clade
+                for clade in newick_tree.get_nonterminals(order="postorder")
+                if is_ready(clade)
+            }
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    clade = running.pop(future)
+                    profile_dict[clade.name] = future.result()
+                    parent = parents.get(id(clade))
+                    if parent is not None and is_ready(parent):
+                        running[submit(parent)] = parent
+
     def align(self, seqs: list[str], verbose: bool = False) -> str:
         if not isinstance(seqs, list):
             raise TypeError("Input must be a list of sequences.")
@@ -196,6 +482,8 @@ class MSABase:
             print(newick_tree)
 
         aligned_seqs = max(profile_dict.values(), key=len)
+        if self.refine_iterations:
+            aligned_seqs = self.refine(aligned_seqs, newick_tree)
         rtn_str = []
         for i in range(len(aligned_seqs)):
             rtn_str.append(aligned_seqs[i])
@@ -210,20 +498,6 @@ class MSABase:
             profile_dict[str(i)] = [seqs[i]]  # storing lists instead of strings
         return profile_dict
 
-    def _track_sequences(self, seqs: list[str]):
-        """
-        This is a utility function for tracking the order of the sequences as they were inputed from their dataset (list)
-
-        :param self: Description
-        :param seqs: list(str) -> a list of strings that represent sequences that are retrieved from their respective index
-
-        returns: a library with key-value pairs -> [key: chr(seqs.index(i_seq) + 65).lower())] value: i_seq
-        """
-        lib_seq = {}
-        for i in range(len(seqs)):
-            lib_seq[str(i)] = seqs[i]
-        return lib_seq
-
     def _create_positions(self, seq_x):
         seq_x_positions = []
         count = 0
@@ -242,8 +516,28 @@ class MSABase:
 class FengDoolittle(MSABase):
     """functions below are unique to FengDoolittle"""
 
-    def __init__(self, cluster: str = "nj", pairwise: str = "nw"):
-        """Initialize Feng-Doolittle algorithm with chosen pairwise method"""
+    def __init__(
+        self,
+        cluster: str = "nj",
+        pairwise: str = "nw",
+        store: PairwiseStore | None = None,
+        workers: int | None = 1,
+        distance: str = "pairwise",
+        kmer_size: int = 6,
+        refine_iterations: int = 0,
+        refine_time: float | None = None,
+    ):
+        """
+        Initialize Feng-Doolittle algorithm with chosen pairwise method.
+
+        ``workers`` processes compute the pairwise distance matrix and merge
+        independent subtrees of the guide tree (all CPUs for None); the
+        default of 1 runs both stages serially in this process.
+        With ``distance="kmer"`` the guide tree is built from k-mer distances
+        of length ``kmer_size`` instead, and no pairwise alignments are scored.
+        ``refine_iterations`` passes of iterative refinement (see ``refine``),
+        cut short after ``refine_time`` seconds, follow progressive alignment.
+        """
         # Get pairwise alignment algorithm
         if pairwise.lower() in self.global_supported_pairwise:
             self.pairwise = self.global_supported_pairwise[pairwise]()
@@ -261,6 +555,13 @@ class FengDoolittle(MSABase):
         else:
             raise ValueError(f"Unsupported clustering algorithm: {cluster}")
 
+        # optional on-disk store of pairwise distances shared between runs
+        self.store = store
+
+        self.workers = self._worker_count(workers)
+        self.kmer = self._guide_distance(distance, kmer_size)
+        self._refinement(refine_iterations, refine_time)
+
     def __call__(self, seqs: list[str]):
         """"""
         # This sets the unnormalized sequence distance
@@ -272,6 +573,25 @@ class FengDoolittle(MSABase):
 
         # storing lists instead of strings
         profile_dict = {str(i): [seq] for i, seq in enumerate(seqs)}
+        if self.kmer is not None:
+            return profile_dict, self.kmer.distance_matrix(seqs)
+        compute = None
+        if self.workers > 1:
+
+            def compute(pairs):
+                return self._parallel_distances(seqs, pairs)
+
+        if self.store is not None:
+            # only pairs missing from the store are aligned
+            return profile_dict, self.store.distance_matrix(
+                self.pairwise, seqs, compute
+            )
+        if compute is not None:
+            pairs = [(i, j) for i in range(len(seqs)) for j in range(i + 1, len(seqs))]
+            for (i, j), alignment_score in zip(pairs, compute(pairs)):
+                seq_dist_matrix[i][j] = alignment_score
+                seq_dist_matrix[j][i] = alignment_score
+            return profile_dict, seq_dist_matrix
         for i, i_seq in enumerate(seqs):
             for j, j_seq in enumerate(seqs):
                 if i < j and i != j:
@@ -280,6 +600,12 @@ class FengDoolittle(MSABase):
                     seq_dist_matrix[j][i] = alignment_score
         return profile_dict, seq_dist_matrix
 
+    def _parallel_distances(
+        self, seqs: list[str], pairs: list[tuple[int, int]]
+    ) -> list[float]:
+        """``self.pairwise.distance`` of every pair, computed by worker processes"""
+        return self._parallel_pairs(seqs, pairs, self.pairwise, _chunk_distances)
+
     def align(self, seqs: list[str], verbose: bool = False) -> str:
         return super().align(seqs, verbose)
 
@@ -287,11 +613,40 @@ class FengDoolittle(MSABase):
 class NotredameHigginsHeringa(MSABase):  # T-Coffee implementation
     """functions below are unique to NotredameHigginsHeringa"""
 
+    # aligners of the pairwise stage: the configured global_pw or Biopython
+    supported_engines = ("goombay", "biopython")
+
     # instead of waterman smith bayer and needleman wunsch, follow RNAinformatik's use of Gotoh
     def __init__(
-        self, local_pw: str = "sw", global_pw: str = "nw", cluster: str = "nj"
+        self,
+        local_pw: str = "sw",
+        global_pw: str = "nw",
+        cluster: str = "nj",
+        store: PairwiseStore | None = None,
+        workers: int | None = 1,
+        engine: str = "goombay",
+        distance: str = "pairwise",
+        kmer_size: int = 6,
+        refine_iterations: int = 0,
+        refine_time: float | None = None,
     ):
-        """Initialize NotredameHigginsHeringa algorithm with chosen methods"""
+        """
+        Initialize NotredameHigginsHeringa algorithm with chosen methods.
+
+        The pairwise stage aligns every pair with ``global_pw``, or with
+        Biopython's ``PairwiseAligner`` for ``engine="biopython"``.
+        ``workers`` processes align the pairs, extend the library and merge
+        independent subtrees of the guide tree (all CPUs for None); the
+        default of 1 runs every stage serially in this process.
+        With ``distance="kmer"`` the guide tree is built from k-mer distances
+        of length ``kmer_size`` instead of the consistency library, so no
+        pairwise alignments or library extension are computed at all.
+        ``refine_iterations`` passes of iterative refinement (see ``refine``),
+        cut short after ``refine_time`` seconds, follow progressive alignment.
+        """
+        if engine.lower() not in self.supported_engines:
+            raise ValueError(f"Unsupported pairwise engine: {engine}")
+        self.engine = engine.lower()
         # Get Global pairwise alignment algorithm
         if global_pw.lower() in self.global_supported_pairwise:
             self.global_pw = self.global_supported_pairwise[global_pw]()
@@ -322,6 +677,12 @@ class NotredameHigginsHeringa(MSABase):  # T-Coffee implementation
         else:
             raise ValueError(f"Unsupported clustering algorithm: {cluster}")
 
+        # optional on-disk store of the pairwise alignment stage shared between runs
+        self.store = store
+        self.workers = self._worker_count(workers)
+        self.kmer = self._guide_distance(distance, kmer_size)
+        self._refinement(refine_iterations, refine_time)
+
     # Andrew Dahik: we may want to move the primary library into its own file like edit distance!
     # heuristic consistency score
     def __call__(self, seqs: list[str]):
@@ -335,11 +696,12 @@ class NotredameHigginsHeringa(MSABase):  # T-Coffee implementation
         """
         # Similar to FengDoolittle, Store a profile dict to leverage align
         profile_dict = self.gen_profile_dict(seqs)
+        if self.kmer is not None:
+            return profile_dict, self.kmer.distance_matrix(seqs)
         # first perform optimum pairwise alignments for each sequence against each other
-        seq_tracker = self._track_sequences(seqs)
         alignments = self.compute_alignments(seqs)
 
-        primary_library = self.compute_primary_library(alignments, seqs, seq_tracker)
+        primary_library = self.compute_primary_library(alignments, len(seqs))
 
         """Extension library logic"""
         # taking the primary library
@@ -349,266 +711,197 @@ class NotredameHigginsHeringa(MSABase):  # T-Coffee implementation
         extended_library = self.form_extension_library(primary_library, len(seqs))
 
         # distance matrix from the extended library, almost ready to be clustered
-        seq_dist_matrix = self.create_distance_matrix_NNH(extended_library, seq_tracker)
+        seq_dist_matrix = self.create_distance_matrix_NNH(extended_library, len(seqs))
         return profile_dict, seq_dist_matrix
 
-    def compute_alignments(self, seqs: list[str]):
-        r"""
-        Docstring for merge_alignments: this is a pairwise optimal alignment step following the instruction from https://backofenlab.github.io/BioinformaticsII-pages/exercise-sheet-3.html
+    def compute_alignments(
+        self, seqs: list[str]
+    ) -> dict[tuple[int, int], tuple[NDArray[intp], NDArray[intp], float]]:
+        """
+        Docstring for compute_alignments: this is a pairwise optimal alignment step following the instruction from https://backofenlab.github.io/BioinformaticsII-pages/exercise-sheet-3.html
+
+        Every pair is aligned by the configured engine, in ``self.workers``
+        processes when there is more than one. Only the alignment operations
+        are passed back and stored, one byte per column.
 
         Args:
         :param self: for object instantiation calling
         :param seqs: list(str) -> this is the input of strings to be aligned such that A(x,y) for all sequences a,...,n
 
         Returns:
-        a library of merged alignments with the following key-value format:
-         {'a-b': (sequence_a_aligned\sequence_b_aligned, distance score}
-        the key is a string that shows the ith sequence given with its corresponding unicode character (the first sequence is a, second b, ...) aligned (denoted with -) with the comparing sequence
+        the identical residues aligned by every pair and its percent identity
+        in the format {(i, j): (residue indices in i, residue indices in j, identity)}
+        keyed by the input indices of the two sequences, i < j
         """
-        # maybe add a counter for easier to track keys?
-        # This sets the unnormalized sequence distance, odd numbered keys are aligned to global alignments, even are assigned to local alignments
-        merged_alignments = {}
-        aligner = Align.PairwiseAligner(match_score=1.0)
-        for i, i_seq in enumerate(seqs):
-            for j, j_seq in enumerate(seqs):
-                # this condition helps avoid repeats
-                if i < j and i != j:
-                    """"""
-                    # use Biopythons pairwise align for now to compare alignments
-                    alignment = aligner.align(i_seq, j_seq)
-                    aligned_seq_ij = alignment[0][0] + "\n" + alignment[0][1]
-
-                    # DEBUG: Check alignment lengths
-                    lines = aligned_seq_ij.split("\n")
-                    seq1_aligned = lines[0]
-                    seq2_aligned = lines[1]
-
-                    key = f"{i}-{j}"
-                    merged_alignments[key] = (
-                        aligned_seq_ij,
-                        self._merge_weight_calc(aligned_seq_ij),
-                    )
-                    # local_align = self.local_pw.align(i_seq, j_seq)
-                    # if global_align != local_align:
-                    # merged_alignments[
-                    # chr(seqs.index(i_seq) + 65).lower()
-                    # + "-"
-                    # + chr(seqs.index(j_seq) + 65).lower()
-                    # ] = (local_align, self._merge_weight_calc(local_align))
-        return merged_alignments
-
-    def _merge_weight_calc(self, seq_ab):
+        aligner = self.global_pw if self.engine == "goombay" else None
+
+        def align_pairs(pairs: list[tuple[int, int]]) -> list[bytes]:
+            if self.workers > 1 and len(pairs) > 1:
+                return self._parallel_pairs(seqs, pairs, aligner, _chunk_alignments)
+            return [_alignment_ops(aligner, seqs[i], seqs[j]) for i, j in pairs]
+
+        # this condition helps avoid repeats
+        pairs = [(i, j) for i in range(len(seqs)) for j in range(i + 1, len(seqs))]
+        if self.store is not None:
+            # the library depends on every sequence so only the pairwise stage is stored
+            config = (
+                scorer_config(aligner)
+                if aligner is not None
+                else "Bio.Align.PairwiseAligner(match_score=1.0)"
+            )
+            # Biopython tells residues of different case apart, goombay does not
+            ops = self.store.values(
+                config,
+                "alignment_ops",
+                seqs,
+                pairs,
+                align_pairs,
+                case_sensitive=aligner is None,
+            )
+        else:
+            ops = dict(zip(pairs, align_pairs(pairs)))
+
+        return {
+            (i, j): self._identity_constraints(seqs[i], seqs[j], ops[i, j])
+            for i, j in pairs
+        }
+
+    def _identity_constraints(
+        self, seq_a: str, seq_b: str, ops: bytes
+    ) -> tuple[NDArray[intp], NDArray[intp], float]:
         """
-        Docstring for _merge_weight_calc
+        Identical residues aligned to each other by the operations ``ops`` of
+        A(a,b), as (0-based) residue indices in a and in b, and the percent
+        identity of the alignment over the shorter sequence.
 
-        Args:
         :param self: for object instantiation calling
-        :param seq_ab: seq_ab is the A(a,b) or alignment of sequence a and sequence b
+        :param seq_a: sequence a
+        :param seq_b: sequence b
+        :param ops: alignment operations from the pairwise stage
         """
-        total_match = 0
-        sequences = seq_ab.split("\n")
-        seq_a, seq_b = sequences[0], sequences[1]
-        # get the total character length not including gaps of the min seq
-        seqa_trimmed, seqb_trimmed = seq_a.replace("-", ""), seq_b.replace("-", "")
-        total_count = min(len(seqa_trimmed), len(seqb_trimmed))
-        for i in range(len(seq_a)):
-            if seq_a[i] != "-" and seq_b[i] != "-":  # skip over indels if both are gaps
-                if seq_a[i] == seq_b[i]:
-                    total_match += 1
-        return round((total_match * 100) / (total_count), 1)
+        alignment = Alignment(seq_a, seq_b, ops)
+        i_pos, j_pos = alignment.indices[:, alignment.ops == OP_MATCH]
+        codes_a = numpy.frombuffer(seq_a.upper().encode("utf-32-le"), uint32)
+        codes_b = numpy.frombuffer(seq_b.upper().encode("utf-32-le"), uint32)
+        identical = codes_a[i_pos] == codes_b[j_pos]
+        shorter = min(len(seq_a), len(seq_b))
+        identity = round(identical.sum() * 100 / shorter, 1) if shorter else 0.0
+        return i_pos[identical], j_pos[identical], float(identity)
 
     def compute_primary_library(
         self,
-        alignments: dict[str, tuple[str, float]],
-        seqs: list[str],
-        seq_tracker: dict[str],
-    ):
-        # primary library forming logic - primary library is interesting in that its actually a dictionary containing a list of tuples as the values assigned to keys determined by their indexes unicode value
-        primary_library = {}
-        for m in range(len(seqs)):
-            for n in range(m + 1, len(seqs)):
-                if n < len(seqs):
-                    primary_library[chr(m + 65).lower() + "-" + chr(n + 65).lower()] = (
-                        self._form_primary_constraints(alignments, seq_tracker, m, n)
-                    )
-        return primary_library
-
-    def _form_primary_constraints(
-        self,
-        alignments: dict[str, tuple[str, float]],
-        seq_tracker: dict[str, str],
-        m: int,
+        alignments: dict[tuple[int, int], tuple[NDArray[intp], NDArray[intp], float]],
         n: int,
-    ):  # forming the primary library
+    ) -> dict[tuple[int, int], tuple[NDArray[intp], NDArray[intp], NDArray[float64]]]:
         """
-        Docstring for form_primary_constraints: follows the examples from https://backofenlab.github.io/BioinformaticsII-pages/exercise-sheet-3.html
-
-        :param self: Description
-        :param seqs: Original input, to hold the original positions when forming the library
-        :param A: Alignments, calculated from compute_alignments
-
+        Sparse primary library: for every pair of sequences ``a < b`` the
+        residue pairs their alignment matches, as arrays of (0-based) residue
+        indices in ``a``, residue indices in ``b`` and weights. Only identical
+        residues aligned to each other become constraints, all carrying the
+        percent identity of the alignment as their weight.
         """
-        seq_keys, alignment_keys = list(seq_tracker.keys()), list(alignments.keys())
-        primary_lib_tuples = []
-
-        # The primary sequence is the first one
-        seqi_key = seq_keys[m]
-        orig_seqi = seq_tracker[seqi_key][:]
-
-        # Compare against sequence 'b' (second sequence)
-        seqj_key = seq_keys[n]
-        orig_seqj = seq_tracker[seqj_key][:]
-
-        # Get the alignment between primary and secondary
-        alignment_key = f"{seqi_key}-{seqj_key}"
-        current_aligned_seqs = alignments[alignment_key][0].split("\n")
-        aligned_primary = current_aligned_seqs[0]
-        aligned_secondary = current_aligned_seqs[1]
-        # get the weight for each compared position
-        weight = alignments[alignment_key][1]
-
-        # Track positions in original sequences
-        i_pos = 0  # position in original primary sequence (0-indexed)
-        j_pos = 0  # position in original secondary sequence (0-indexed)
-
-        # Create mapping: which primary positions align to which secondary positions
-        alignment_map = {}  # key: (i_pos+1, j_pos+1), value: weight
-
-        for k in range(len(aligned_primary)):
-            # booleans for tracking true characters from the original unaligned sequence imposed with its aligned counterpart
-            has_primary = aligned_primary[k] != "-"
-            has_secondary = aligned_secondary[k] != "-"
-
-            # If both positions have characters and they match, record the alignment
-            if has_primary and has_secondary:
-                if aligned_primary[k] == aligned_secondary[k]:
-                    alignment_map[(i_pos + 1, j_pos + 1)] = weight
-
-            # Increment position counters (only when not a gap)
-            if has_primary:
-                i_pos += 1
-            if has_secondary:
-                j_pos += 1
-
-        # Now generate tuples for ALL position combinations in order
-        for i in range(1, len(orig_seqi) + 1):
-            for j in range(1, len(orig_seqj) + 1):
-                weight = alignment_map.get((i, j), 0)
-                primary_lib_tuples.append((i, j, weight))
-
-        return primary_lib_tuples
+        primary_library = {}
+        for a in range(n):
+            for b in range(a + 1, n):
+                i_idx, j_idx, identity = alignments[a, b]
+                primary_library[a, b] = (
+                    i_idx,
+                    j_idx,
+                    numpy.full(len(i_idx), identity, dtype=float64),
+                )
+        return primary_library
 
     def form_extension_library(
-        self, prim_lib: dict[list[tuple]], n: int
-    ):  # n is the number of sequences
+        self,
+        prim_lib: dict[
+            tuple[int, int], tuple[NDArray[intp], NDArray[intp], NDArray[float64]]
+        ],
+        n: int,
+    ) -> dict[tuple[int, int], tuple[NDArray[intp], NDArray[intp], NDArray[float64]]]:
         """
         Docstring for form_extension_library
-        This method performs the step to increment
+        Every residue pair of a and b gains, for each third sequence c, the
+        weaker weight of the constraints a[i] -> c[k] and c[k] -> b[j]. All
+        constraints of a sequence are gathered once into its neighbourhood,
+        keyed by (c, k), so each pair is one vectorized join. Pairs are spread
+        over ``self.workers`` processes when there is more than one.
+
         :param self: Description
-        :param prim_lib: Description
-        :param n: Description
+        :param prim_lib: sparse primary library from compute_primary_library
+        :param n: number of sequences
+        :return: sparse library of the same form with the extended weights,
+            residue pairs in lexicographic order
         """
-        extension_library = {pair: {} for pair in prim_lib}
-        # for tracking iterations, the letters are indexed back to their chr value
-
-        # ab_key represents sequence a and sequence b
-        for ab_key in prim_lib.keys():
-            a, b = ab_key.split("-")
-            possible_pairs = {}
-            # initialize all possible pairs identified in primary libary
-            for i, j, w_ab in prim_lib[ab_key]:
-                possible_pairs[i, j] = w_ab
-            # iterating over the tuples stored, which is residue i and residue j and weight from the key
-            # find triangulated matchs
-            for c in range(n):
-                if chr(c + ord("a")) in (a, b):
-                    continue  # exit this iteration
-
-                # triangulation step: check all positions k of c, i2 is the same residue as i
-                c_key = chr(c + ord("a"))
-                ac_key = f"{a}-{c_key}"
-                cb_key = f"{c_key}-{b}"
-                ca_key = f"{c_key}-{a}"
-                bc_key = f"{b}-{c_key}"
-
-                # Get matches from primary library (check both orderings)
-                ac_matches = prim_lib.get(ac_key, [])
-                ca_matches = [
-                    (k, i, w) for i, k, w in prim_lib.get(ca_key, [])
-                ]  # Swap i,k for reversed pair
-
-                cb_matches = prim_lib.get(cb_key, [])
-                bc_matches = [
-                    (j, k, w) for k, j, w in prim_lib.get(bc_key, [])
-                ]  # Swap k,j for reversed pair
-
-                # Combine both directions
-                all_ac = ac_matches + ca_matches
-                all_cb = cb_matches + bc_matches
-
-                # For all matches a[i] -> c[k]
-                for i, k, w_ac in all_ac:
-                    # For all matches c[k] -> b[j]
-                    for k2, j, w_cb in all_cb:
-                        if k2 == k:  # Same position k in sequence c
-                            # Triangulation found: a[i] -> c[k] -> b[j]
-                            triangulation_weight = min(w_ac, w_cb)
-
-                            # Add to the (i,j) pair's total weight
-                            if (i, j) not in possible_pairs:
-                                possible_pairs[(i, j)] = 0  # No primary library match
-                            possible_pairs[(i, j)] += triangulation_weight
-
-            # Store all pairs with their accumulated weights
-            extension_library[ab_key] = possible_pairs
-        return extension_library
+        pairs = list(prim_lib)
+        # residue keys of a neighbourhood need room for the longest sequence
+        width = 1 + max(
+            (
+                int(idx.max(initial=0))
+                for entry in prim_lib.values()
+                for idx in entry[:2]
+            ),
+            default=0,
+        )
+        neighbourhoods = [_neighbourhood(prim_lib, x, n, width) for x in range(n)]
+        if self.workers == 1 or len(pairs) < 2:
+            return {
+                (a, b): _extend_pair(prim_lib, neighbourhoods, a, b) for a, b in pairs
+            }
+
+        # the library is sent once per worker, then only pair indices
+        chunks = [pairs[k :: 4 * self.workers] for k in range(4 * self.workers)]
+        chunks = [chunk for chunk in chunks if chunk]
+        extension_library = {}
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(chunks)),
+            initializer=_init_extension_worker,
+            initargs=(prim_lib, neighbourhoods),
+        ) as pool:
+            results = pool.map(_chunk_extensions, chunks)
+            for chunk, extended in zip(chunks, results):
+                extension_library.update(zip(chunk, extended))
+        return {pair: extension_library[pair] for pair in pairs}
 
     def create_distance_matrix_NNH(
-        self, extension_library: dict[dict], seq_tracker: dict[str]
-    ):
+        self,
+        extension_library: dict[
+            tuple[int, int], tuple[NDArray[intp], NDArray[intp], NDArray[float64]]
+        ],
+        n: int,
+    ) -> NDArray[float64]:
         """
         Docstring for create_distance_matrix_NNH
+        The distance of a pair is one minus its mean extended weight, or 1
+        when none of its residues are paired. An extended weight adds the
+        direct constraint to one path through each of the other n - 2
+        sequences, each at most 100, so the mean is divided by 100 * (n - 1)
+        rather than 100, which would give negative distances past two
+        sequences.
 
         :param self: Description
-        :param extension_library: Description
-        :type extension_library: dict[dict]
-        :param seqs: Description
-        :type seqs: list[str]
+        :param extension_library: sparse library from form_extension_library
+        :param n: number of sequences
         """
-        n = len(seq_tracker)
         distance_matrix = numpy.zeros((n, n))
-
-        for i, a in enumerate(seq_tracker.keys()):
-            for j, b in enumerate(seq_tracker.keys()):
-                if i >= j:  # Skip diagonal and lower triangle
-                    continue
-
-                # Try both orderings of the pair
-                pair_key = f"{a}-{b}"
-                reverse_key = f"{b}-{a}"
-
-                if pair_key in extension_library:
-                    pair_dict = extension_library[pair_key]
-                elif reverse_key in extension_library:
-                    pair_dict = extension_library[reverse_key]
-                else:
-                    continue
-
-                # Collect all non-zero scores
-                scores = [
-                    weight for (ai, bj), weight in pair_dict.items() if weight > 0
-                ]
-
-                if not scores:
-                    distance_matrix[i, j] = 1.0
-                    distance_matrix[j, i] = 1.0
-                else:
-                    avg_score = numpy.mean(scores)
-                    similarity = avg_score / 100.0
-                    distance = 1.0 - similarity
-
-                    distance_matrix[i, j] = distance
-                    distance_matrix[j, i] = distance
+        if not extension_library:
+            return distance_matrix
+        pairs = numpy.array(list(extension_library), dtype=intp).reshape(-1, 2)
+        weights = [entry[2] for entry in extension_library.values()]
+
+        # condensed sums and counts of the positive weights of every pair
+        pair_ids = numpy.repeat(numpy.arange(len(pairs)), [len(w) for w in weights])
+        weights = numpy.concatenate(weights)
+        positive = weights > 0
+        totals = numpy.bincount(
+            pair_ids[positive], weights[positive], minlength=len(pairs)
+        )
+        counts = numpy.bincount(pair_ids[positive], minlength=len(pairs))
+        scale = 100.0 * max(n - 1, 1)
+        distances = numpy.where(
+            counts > 0, 1.0 - totals / numpy.maximum(counts, 1) / scale, 1.0
+        )
+        distance_matrix[pairs[:, 0], pairs[:, 1]] = distances
+        distance_matrix[pairs[:, 1], pairs[:, 0]] = distances
         return distance_matrix
 
 
@@ -0,0 +1,285 @@
+# standard library
+import os
+from bisect import bisect_left
+from collections.abc import Iterable
+from itertools import chain
+
+try:
+    # external dependencies
+    import numpy
+    from numpy import float64, intp
+    from numpy._typing import NDArray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+# internal dependencies
+from goombay.align.edit import Hamming
+
+__all__ = ["HammingIndex", "PrefixIndex", "PostfixIndex"]
+
+
+class HammingIndex:
+    """
+    Radius search over a whitelist of barcodes by multi-index hashing.
+
+    Every barcode is split into ``max_radius + 1`` segments with one hash table
+    per segment. A read within ``r <= max_radius`` substitutions of a barcode
+    still matches it exactly on one of any ``r + 1`` segments (pigeonhole
+    principle), so only barcodes sharing a bucket with the read are compared
+    with ``Hamming.batch_distance``. Barcodes of different lengths are kept apart.
+    """
+
+    def __init__(
+        self,
+        barcodes: Iterable[str] = (),
+        max_radius: int = 1,
+        hamming: Hamming | None = None,
+    ) -> None:
+        if max_radius < 0:
+            raise ValueError("max_radius must be non-negative")
+        self.max_radius = max_radius
+        self.hamming = hamming if hamming is not None else Hamming()
+        self.barcodes: list[str] = []
+        self._ids: dict[str, int] = {}
+        # barcode length -> one {segment: [barcode ids]} table per segment
+        self._tables: dict[int, list[dict[str, list[int]]]] = {}
+        self._bounds: dict[int, list[tuple[int, int]]] = {}
+        for barcode in barcodes:
+            self.add(barcode)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike,
+        max_radius: int = 1,
+        hamming: Hamming | None = None,
+    ) -> "HammingIndex":
+        """
+        Index the first whitespace-separated field of every line of a file,
+        skipping blank lines and ``#`` comments. Lines are streamed, so
+        whitelists with millions of barcodes are never held twice in memory.
+        """
+        with open(path) as handle:
+            barcodes = (
+                line.split()[0]
+                for line in handle
+                if line.strip() and not line.startswith("#")
+            )
+            return cls(barcodes, max_radius, hamming)
+
+    def __len__(self) -> int:
+        return len(self.barcodes)
+
+    def __contains__(self, barcode: str) -> bool:
+        return barcode.upper() in self._ids
+
+    def _segments(self, length: int) -> list[tuple[int, int]]:
+        if length not in self._bounds:
+            count = self.max_radius + 1
+            edges = [i * length // count for i in range(count + 1)]
+            self._bounds[length] = list(zip(edges, edges[1:]))
+        return self._bounds[length]
+
+    def add(self, barcode: str) -> None:
+        """Add a barcode; repeats (ignoring case) are indexed once"""
+        key = barcode.upper()
+        if key in self._ids:
+            return
+        barcode_id = len(self.barcodes)
+        self.barcodes.append(barcode)
+        self._ids[key] = barcode_id
+
+        tables = self._tables.get(len(key))
+        if tables is None:
+            tables = self._tables[len(key)] = [{} for _ in range(self.max_radius + 1)]
+        for table, (start, end) in zip(tables, self._segments(len(key))):
+            table.setdefault(key[start:end], []).append(barcode_id)
+
+    def query(self, read: str, radius: int | None = None) -> list[tuple[str, int]]:
+        """
+        ``(barcode, distance)`` of every barcode within ``radius`` substitutions
+        of ``read`` (default ``max_radius``), closest first and otherwise in
+        the order the barcodes were added.
+        """
+        radius = self.max_radius if radius is None else radius
+        if not 0 <= radius <= self.max_radius:
+            raise ValueError(f"radius must be between 0 and {self.max_radius}")
+        key = read.upper()
+        tables = self._tables.get(len(key))
+        if tables is None:
+            return []
+
+        # any radius + 1 segments hold at least one exact match
+        candidates = set()
+        segments = self._segments(len(key))
+        for table, (start, end) in zip(tables[: radius + 1], segments):
+            candidates.update(table.get(key[start:end], ()))
+
+        if not candidates:
+            return []
+        barcodes = [self.barcodes[barcode_id] for barcode_id in sorted(candidates)]
+        distances = self.hamming.batch_distance([key], barcodes)[0].tolist()
+        hits = [hit for hit in zip(barcodes, distances) if hit[1] <= radius]
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+    def query_similar(self, read: str, min_similarity: int) -> list[tuple[str, int]]:
+        """``(barcode, similarity)`` of every barcode sharing at least ``min_similarity`` positions"""
+        radius = len(read) - min_similarity
+        if radius < 0:
+            return []
+        return [
+            (barcode, self.hamming.similarity(read, barcode))
+            for barcode, _ in self.query(read, radius)
+        ]
+
+    def nearest(self, read: str, radius: int | None = None) -> str | None:
+        """Closest barcode within ``radius``, or None if there is none or a tie"""
+        hits = self.query(read, radius)
+        if not hits or (len(hits) > 1 and hits[0][1] == hits[1][1]):
+            return None
+        return hits[0][0]
+
+
+class PrefixIndex:
+    """
+    Longest-shared-prefix search over a corpus stored in a compressed trie.
+
+    Items are kept in lexicographic order, so every trie node covers one
+    contiguous range of them. Walking a query down the trie visits at most
+    ``len(query)`` characters and yields nested ranges of items sharing ever
+    longer prefixes with it, from which the ``Prefix`` similarity to every
+    item (or only the best items) is read off. Matching ignores case.
+    """
+
+    def __init__(self, corpus: Iterable[str]) -> None:
+        self.corpus = list(corpus)
+        keys = [self._key(item) for item in self.corpus]
+        # corpus positions in lexicographic order of their keys
+        self._order = numpy.array(
+            sorted(range(len(keys)), key=keys.__getitem__), dtype=intp
+        )
+        self._keys = [keys[i] for i in self._order]
+        self._lengths = numpy.array([len(key) for key in keys], dtype=intp)
+
+        # node -> (label, lo, hi): the edge label leading to the node and the
+        # range of sorted keys below it; children are keyed by first character
+        self._nodes: list[tuple[str, int, int]] = []
+        self._children: list[dict[str, int]] = []
+        if self._keys:
+            self._build()
+
+    def _key(self, seq: str) -> str:
+        return seq.upper()
+
+    def __len__(self) -> int:
+        return len(self.corpus)
+
+    def _add_node(self, label: str, lo: int, hi: int) -> int:
+        self._nodes.append((label, lo, hi))
+        self._children.append({})
+        return len(self._nodes) - 1
+
+    def _build(self) -> None:
+        keys = self._keys
+        # (parent, depth of parent, lo, hi) of ranges sharing parent's prefix
+        stack = [(None, 0, 0, len(keys))]
+        while stack:
+            parent, parent_depth, lo, hi = stack.pop()
+            # sorted keys share the prefix their first and last keys share
+            first, last = keys[lo], keys[hi - 1]
+            depth = len(first) if first == last else parent_depth
+            while depth < min(len(first), len(last)) and first[depth] == last[depth]:
+                depth += 1
+            node = self._add_node(first[parent_depth:depth], lo, hi)
+            if parent is not None:
+                self._children[parent][first[parent_depth]] = node
+
+            # keys ending here sort first; the rest group by their next character
+            start = lo
+            while start < hi and len(keys[start]) == depth:
+                start += 1
+            while start < hi:
+                # first key past every key sharing the next character
+                bound = keys[start][:depth] + chr(ord(keys[start][depth]) + 1)
+                end = bisect_left(keys, bound, start + 1, hi)
+                stack.append((node, depth, start, end))
+                start = end
+
+    def _levels(self, query: str) -> list[tuple[int, int, int]]:
+        """Nested ``(lo, hi, shared)`` ranges of sorted keys sharing ``shared`` characters"""
+        key = self._key(query)
+        levels = [(0, len(self._keys), 0)]
+        if not self._nodes:
+            return levels
+        node, depth = 0, 0
+        while True:
+            label, lo, hi = self._nodes[node]
+            matched = 0
+            while (
+                matched < len(label)
+                and depth + matched < len(key)
+                and key[depth + matched] == label[matched]
+            ):
+                matched += 1
+            if matched:
+                levels.append((lo, hi, depth + matched))
+            if matched < len(label):
+                return levels
+            depth += matched
+            if depth == len(key) or key[depth] not in self._children[node]:
+                return levels
+            node = self._children[node][key[depth]]
+
+    def similarity(self, query: str) -> NDArray[intp]:
+        """Length of the prefix shared by ``query`` and each corpus item"""
+        shared = numpy.zeros(len(self._keys), dtype=intp)
+        for lo, hi, length in self._levels(query):
+            shared[lo:hi] = length
+        similarity = numpy.empty_like(shared)
+        similarity[self._order] = shared
+        return similarity
+
+    def distance(self, query: str) -> NDArray[intp]:
+        return numpy.maximum(self._lengths, len(query)) - self.similarity(query)
+
+    def normalized_similarity(self, query: str) -> NDArray[float64]:
+        """Similarity over the longer length; empty corpus items score 0"""
+        if not query:
+            raise ValueError("Both strings must be non-empty")
+        return self.similarity(query) / numpy.maximum(self._lengths, len(query))
+
+    def normalized_distance(self, query: str) -> NDArray[float64]:
+        return 1 - self.normalized_similarity(query)
+
+    def top(self, query: str, k: int = 1) -> list[tuple[str, int]]:
+        """
+        ``(item, similarity)`` of the ``k`` corpus items sharing the longest
+        prefix with ``query``, ties in lexicographic order. Only the trie path
+        of the query and the returned items are visited.
+        """
+        levels = self._levels(query)
+        hits = []
+        # innermost range first, then what each enclosing range adds around it
+        inner_lo = inner_hi = None
+        for lo, hi, length in reversed(levels):
+            if inner_lo is None:
+                ring = range(lo, hi)
+            else:
+                ring = chain(range(lo, inner_lo), range(inner_hi, hi))
+            for i in ring:
+                if len(hits) == k:
+                    return hits
+                hits.append((self.corpus[self._order[i]], length))
+            inner_lo, inner_hi = lo, hi
+        return hits
+
+
+class PostfixIndex(PrefixIndex):
+    """
+    Longest-shared-suffix search over a corpus, stored as a trie of the
+    reversed items. Similarities match ``Postfix``.
+    """
+
+    def _key(self, seq: str) -> str:
+        return seq.upper()[::-1]
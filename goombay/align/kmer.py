@@ -0,0 +1,182 @@
+# standard library
+from collections.abc import Iterable
+
+try:
+    # external dependencies
+    import numpy
+    from numpy import float64, intp, uint32
+    from numpy._typing import NDArray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+__all__ = ["KmerDistance", "kmer_distance"]
+
+
+class KmerDistance:
+    """
+    Alignment-free distance from the k-mers two sequences have in common.
+
+    Residues are first reduced to a compressed alphabet, so that k-mers of
+    related but mutated sequences still match. The similarity of a pair is
+    the fractional common k-mer count of MUSCLE (Edgar, 2004),
+    ``F = sum_t min(n_x(t), n_y(t)) / min(#k-mers of x, #k-mers of y)``,
+    and the distance is ``1 - F``. K-mers holding residues outside the
+    alphabet are skipped.
+
+    ``distance_matrix`` builds one k-mer count profile per sequence and scores
+    every pair with vectorized NumPy, which takes ``O(n^2 * L)`` time and no
+    dynamic programming. This is what guide trees of large inputs need.
+    """
+
+    # upper bound on the sequence pairs compared at once in similarity_matrix
+    batch_pairs = 1 << 22
+
+    alphabets = {
+        # Dayhoff groups of exchangeable amino acids
+        "dayhoff6": ("AGPST", "C", "DENQ", "FWY", "HKR", "ILMV"),
+        "nucleotide": ("A", "C", "G", "TU"),
+    }
+
+    def __init__(self, k: int = 6, alphabet: str | Iterable[str] = "auto") -> None:
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if isinstance(alphabet, str):
+            if alphabet != "auto" and alphabet not in self.alphabets:
+                raise ValueError(f"Unsupported alphabet: {alphabet}")
+            self.alphabet = alphabet
+        else:
+            # custom groups, stored in the same comma-separated form they print as
+            self.alphabet = ",".join(group.upper() for group in alphabet)
+        self.k = k
+
+    def _groups(self, seqs: list[str]) -> tuple[str, ...]:
+        if self.alphabet == "auto":
+            residues = set("".join(seqs).upper())
+            if residues <= set("ACGTUN"):
+                return self.alphabets["nucleotide"]
+            return self.alphabets["dayhoff6"]
+        if self.alphabet in self.alphabets:
+            return self.alphabets[self.alphabet]
+        return tuple(self.alphabet.split(","))
+
+    def profiles(
+        self, seqs: list[str]
+    ) -> tuple[NDArray[intp], NDArray[intp], NDArray[uint32]]:
+        """
+        Sparse k-mer count profiles of ``seqs`` in compressed row form: the
+        k-mers of sequence ``i`` are ``kmers[offsets[i]:offsets[i + 1]]``,
+        sorted and distinct, with their numbers of occurrences in ``counts``.
+        Memory grows with the total sequence length, not with the number of
+        distinct k-mers times the number of sequences.
+        """
+        groups = self._groups(seqs)
+        size = len(groups)
+        if size**self.k >= 2**62:
+            raise ValueError("k is too large for the alphabet")
+        # code point -> group, with len(groups) marking residues outside it;
+        # the last entry catches every code point past the alphabet
+        residues = {
+            case: code
+            for code, group in enumerate(groups)
+            for residue in group
+            for case in (residue.upper(), residue.lower())
+        }
+        lookup = numpy.full(max(map(ord, residues)) + 2, size, dtype=intp)
+        for residue, code in residues.items():
+            lookup[ord(residue)] = code
+        weights = size ** numpy.arange(self.k - 1, -1, -1, dtype=intp)
+
+        rows, ids = [numpy.zeros(0, dtype=intp)], [numpy.zeros(0, dtype=intp)]
+        for row, seq in enumerate(seqs):
+            if len(seq) < self.k:
+                continue
+            points = numpy.frombuffer(seq.encode("utf-32-le"), uint32)
+            codes = lookup[numpy.minimum(points, len(lookup) - 1)]
+            windows = numpy.lib.stride_tricks.sliding_window_view(codes, self.k)
+            windows = windows[(windows < size).all(axis=1)]
+            ids.append(windows @ weights)
+            rows.append(numpy.full(len(windows), row, dtype=intp))
+
+        rows, ids = numpy.concatenate(rows), numpy.concatenate(ids)
+        # sort by sequence, then k-mer, and collapse runs of the same pair
+        order = numpy.lexsort((ids, rows))
+        rows, ids = rows[order], ids[order]
+        first = numpy.ones(min(1, len(ids)), dtype=bool)
+        changed = (rows[1:] != rows[:-1]) | (ids[1:] != ids[:-1])
+        starts = numpy.flatnonzero(numpy.concatenate((first, changed)))
+        counts = numpy.diff(numpy.append(starts, len(ids))).astype(uint32)
+        offsets = numpy.searchsorted(rows[starts], numpy.arange(len(seqs) + 1))
+        return offsets.astype(intp), ids[starts], counts
+
+    def similarity_matrix(self, seqs: list[str]) -> NDArray[float64]:
+        """
+        Fractional common k-mer count of every pair of ``seqs``. The profiles
+        are inverted into one posting list per k-mer, and only pairs of
+        sequences found in the same posting list are compared, in batches of
+        at most ``batch_pairs`` pairs.
+        """
+        offsets, kmers, counts = self.profiles(seqs)
+        n = len(seqs)
+        owners = numpy.repeat(numpy.arange(n), numpy.diff(offsets))
+        totals = numpy.bincount(owners, counts, minlength=n).astype(intp)
+
+        # posting lists: entries grouped by k-mer, in sequence order within each
+        order = numpy.argsort(kmers, kind="stable")
+        kmers, owners, counts = kmers[order], owners[order], counts[order]
+        index = numpy.arange(len(kmers))
+        first = numpy.concatenate(([True], kmers[1:] != kmers[:-1]))[: len(kmers)]
+        group_start = numpy.maximum.accumulate(numpy.where(first, index, 0))
+        # every entry pairs with the entries before it in its posting list
+        partners = index - group_start
+        ends = numpy.cumsum(partners)
+
+        shared = numpy.zeros(n * n, dtype=float64)
+        lo = 0
+        while lo < len(kmers):
+            # the largest run of entries whose pairs fit in one batch
+            limit = (ends[lo] - partners[lo]) + max(self.batch_pairs, partners[lo])
+            hi = int(numpy.searchsorted(ends, limit, side="right"))
+            left = numpy.repeat(index[lo:hi], partners[lo:hi])
+            # position of each pair among the pairs of its left entry
+            first_pair = ends[lo:hi] - partners[lo:hi]
+            rank = (
+                numpy.arange(len(left))
+                + first_pair[0]
+                - numpy.repeat(first_pair, partners[lo:hi])
+            )
+            right = group_start[left] + rank
+            shared += numpy.bincount(
+                owners[right] * n + owners[left],
+                numpy.minimum(counts[left], counts[right]),
+                minlength=n * n,
+            )
+            lo = hi
+        shared = shared.reshape(n, n).astype(intp)
+        shared += shared.T
+
+        smaller = numpy.minimum(totals[:, None], totals[None, :])
+        similarity = shared / numpy.maximum(smaller, 1)
+        # pairs without k-mers only count as similar when they are identical
+        for i, j in zip(*numpy.nonzero(smaller == 0)):
+            similarity[i, j] = float(seqs[i].upper() == seqs[j].upper())
+        numpy.fill_diagonal(similarity, 1.0)
+        return similarity
+
+    def distance_matrix(self, seqs: list[str]) -> NDArray[float64]:
+        """``1 - F`` for every pair of ``seqs``, with zeros on the diagonal"""
+        return 1.0 - self.similarity_matrix(seqs)
+
+    def similarity(self, query_seq: str, subject_seq: str) -> float:
+        return float(self.similarity_matrix([query_seq, subject_seq])[0, 1])
+
+    def distance(self, query_seq: str, subject_seq: str) -> float:
+        return 1.0 - self.similarity(query_seq, subject_seq)
+
+    def normalized_similarity(self, query_seq: str, subject_seq: str) -> float:
+        return self.similarity(query_seq, subject_seq)
+
+    def normalized_distance(self, query_seq: str, subject_seq: str) -> float:
+        return self.distance(query_seq, subject_seq)
+
+
+kmer_distance = KmerDistance()
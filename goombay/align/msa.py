@@ -0,0 +1,164 @@
+# standard library
+import os
+from collections.abc import Iterable
+
+try:
+    # external dependencies
+    import numpy
+    from numpy import float64, intp, uint8
+    from numpy._typing import NDArray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+# internal dependencies
+from goombay.align.profile import ProfileAligner
+from goombay.utils import fasta_file_parser
+
+__all__ = ["MSA"]
+
+GAP = ord("-")
+
+
+class MSA:
+    """
+    Multiple sequence alignment held as an ``n x L`` uint8 array of residue
+    bytes, one row per member and ``-`` for gaps.
+
+    Every statistic starts from the column-by-symbol counts, built with one
+    ``bincount`` over the whole array: sum-of-pairs scores come from the
+    counts and the compiled substitution matrix of a ``ProfileAligner``, and
+    the pairwise identity matrix from one matrix product per symbol. Nothing
+    loops over the members or columns in Python.
+    """
+
+    def __init__(
+        self, rows: str | Iterable[str], names: Iterable[str] | None = None
+    ) -> None:
+        if isinstance(rows, str):
+            # the newline-joined form returned by align
+            rows = rows.split("\n")
+        rows = [row.upper() for row in rows]
+        if len({len(row) for row in rows}) > 1:
+            raise ValueError("Alignment rows must be of equal length")
+        if not all(row.isascii() for row in rows):
+            raise ValueError("Alignment rows must only contain ASCII characters")
+        data = "".join(rows).encode("ascii")
+        width = len(rows[0]) if rows else 0
+        self.array = numpy.frombuffer(data, dtype=uint8).reshape(len(rows), width)
+        self.array.flags.writeable = False
+        self.names = list(names) if names is not None else None
+        if self.names is not None and len(self.names) != len(rows):
+            raise ValueError("Expected one name per alignment row")
+
+    @classmethod
+    def from_fasta(cls, path: str | os.PathLike) -> "MSA":
+        """Load an aligned FASTA file, naming the rows after their headers"""
+        records = fasta_file_parser(os.fspath(path))
+        names = [name.lstrip(">") for name in records]
+        return cls(records.values(), names)
+
+    def __len__(self) -> int:
+        return self.array.shape[0]
+
+    def __repr__(self) -> str:
+        return f"MSA(rows={len(self)}, columns={self.width})"
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows)
+
+    @property
+    def width(self) -> int:
+        """Number of alignment columns"""
+        return self.array.shape[1]
+
+    @property
+    def rows(self) -> list[str]:
+        return [row.tobytes().decode("ascii") for row in self.array]
+
+    @property
+    def symbols(self) -> str:
+        """Residue symbols found in the alignment, sorted, without the gap"""
+        present = numpy.flatnonzero(numpy.bincount(self.array.ravel(), minlength=256))
+        return "".join(chr(code) for code in present if code != GAP)
+
+    def codes(self) -> NDArray[intp]:
+        """Members as rows of indices into ``symbols``, ``len(symbols)`` for gaps"""
+        symbols = self.symbols
+        lookup = numpy.full(256, len(symbols), dtype=intp)
+        lookup[[ord(symbol) for symbol in symbols]] = numpy.arange(len(symbols))
+        return lookup[self.array]
+
+    def counts(self) -> NDArray[intp]:
+        """``L x (m + 1)`` counts of each of the ``m`` symbols per column, gaps last"""
+        size = len(self.symbols)
+        flat = self.codes() + (size + 1) * numpy.arange(self.width, dtype=intp)
+        counts = numpy.bincount(flat.ravel(), minlength=self.width * (size + 1))
+        return counts.reshape(self.width, size + 1)
+
+    def _profile_aligner(self, aligner) -> ProfileAligner:
+        if aligner is None:
+            return ProfileAligner()
+        if isinstance(aligner, ProfileAligner):
+            return aligner
+        return ProfileAligner.from_aligner(aligner)
+
+    def column_scores(self, aligner=None) -> NDArray[float64]:
+        """
+        Sum-of-pairs score of each column: every pair of members scored with
+        the scores of ``aligner`` (a ``ProfileAligner`` or any pairwise
+        aligner, the ``ProfileAligner`` defaults when None). Gaps cost ``gap``
+        against residues and nothing against each other.
+        """
+        aligner = self._profile_aligner(aligner)
+        counts = self.counts()
+        scores = aligner.compile(self.symbols)
+        # every unordered pair of rows: (c S c - c diag(S)) / 2
+        pairs = ((counts @ scores) * counts).sum(axis=1) - counts @ numpy.diag(scores)
+        return pairs / 2
+
+    def sum_of_pairs(self, aligner=None) -> float:
+        """Sum-of-pairs score of the alignment, summed over ``column_scores``"""
+        return float(self.column_scores(aligner).sum())
+
+    def gap_fraction(self) -> NDArray[float64]:
+        """Fraction of members with a gap in each column"""
+        return (self.array == GAP).mean(axis=0, dtype=float64)
+
+    def conservation(self) -> NDArray[float64]:
+        """Fraction of members holding the most common residue of each column"""
+        if not len(self):
+            return numpy.zeros(self.width, dtype=float64)
+        return self.counts()[:, :-1].max(axis=1, initial=0) / len(self)
+
+    def entropy(self, base: float = 2) -> NDArray[float64]:
+        """
+        Shannon entropy of the residue frequencies of each column, gaps left
+        out; 0 for fully conserved and all-gap columns.
+        """
+        residues = self.counts()[:, :-1].astype(float64)
+        totals = residues.sum(axis=1, keepdims=True)
+        freq = numpy.divide(
+            residues, totals, out=numpy.zeros_like(residues), where=totals > 0
+        )
+        logs = numpy.log(freq, out=numpy.zeros_like(freq), where=freq > 0)
+        return -(freq * logs).sum(axis=1) / numpy.log(base)
+
+    def identity_matrix(self) -> NDArray[float64]:
+        """
+        Fraction of identical residues over the columns where both members
+        hold a residue, for every pair of members; 0 for pairs sharing no
+        such column and 1 on the diagonal.
+        """
+        codes = self.codes()
+        size = len(self.symbols)
+        residues = (codes < size).astype(float64)
+        aligned = residues @ residues.T
+        identical = numpy.zeros_like(aligned)
+        for symbol in range(size):
+            hits = (codes == symbol).astype(float64)
+            identical += hits @ hits.T
+        identity = numpy.divide(
+            identical, aligned, out=numpy.zeros_like(aligned), where=aligned > 0
+        )
+        numpy.fill_diagonal(identity, 1.0)
+        return identity
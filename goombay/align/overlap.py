@@ -1,7 +1,7 @@
 try:
     # external dependencies
     import numpy
-    from numpy import float64
+    from numpy import float64, intp, uint32
     from numpy._typing import NDArray
 except ImportError:
     raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
@@ -9,6 +9,8 @@ except ImportError:
 # internal dependencies
 from goombay.align.base import OverlapBase as _OverlapBase
 from goombay.align.edit import hamming
+from goombay.align.packed import PackedBits
+from goombay.align.suffix import SuffixAutomaton
 
 __all__ = [
     "LongestCommonSubsequence",
@@ -124,39 +126,64 @@ class LongestCommonSubstring(_OverlapBase):
                 alignment_matrix[i][j] = match
         return alignment_matrix
 
+    def substrings(
+        self, query_seq: str, subject_seq: str
+    ) -> tuple[int, list[tuple[int, int]]]:
+        """
+        Length of the longest common substrings and the 0-based
+        ``(query_start, subject_start)`` of every occurrence, in the same order
+        as the cells of the matrix holding the longest match.
+
+        Uses a suffix automaton of the subject, so it runs in linear time and
+        memory instead of filling the quadratic matrix.
+        """
+        automaton = SuffixAutomaton(subject_seq.upper())
+        return automaton.longest_common_substrings(query_seq.upper())
+
+    def _longest(self, query_seq: str, subject_seq: str) -> float:
+        return float(self.substrings(query_seq, subject_seq)[0] * self.match)
+
     def distance(self, query_seq: str, subject_seq: str) -> float:
-        return super().distance(query_seq, subject_seq)
+        query_length = len(query_seq)
+        subject_length = len(subject_seq)
+        if not query_seq and not subject_seq:
+            return 0.0
+        if not query_seq or not subject_seq:
+            return max(query_length, subject_length)
+        max_score = self.match * max(query_length, subject_length)
+        return max_score - self._longest(query_seq, subject_seq)
 
     def similarity(self, query_seq: str, subject_seq: str) -> float:
-        return super().similarity(query_seq, subject_seq)
+        if not query_seq and not subject_seq:
+            return 1.0
+        if not query_seq or not subject_seq:
+            return 0.0
+        if len(query_seq) == 1 and len(subject_seq) == 1 and query_seq == subject_seq:
+            return 1.0
+        longest = self._longest(query_seq, subject_seq)
+        return longest if longest > 1 else 0.0
 
     def normalized_distance(self, query_seq: str, subject_seq: str) -> float:
         return super().normalized_distance(query_seq, subject_seq)
 
     def normalized_similarity(self, query_seq: str, subject_seq: str) -> float:
-        return super().normalized_similarity(query_seq, subject_seq)
+        if not query_seq and not subject_seq:
+            return 1.0
+        if not query_seq or not subject_seq:
+            return 0.0
+        if len(query_seq) == 1 and len(subject_seq) == 1 and query_seq == subject_seq:
+            return 1.0
+        longest = self._longest(query_seq, subject_seq)
+        return longest / min(len(query_seq), len(subject_seq))
 
     def matrix(self, query_seq: str, subject_seq: str) -> NDArray:
         return super().matrix(query_seq, subject_seq)
 
     def align(self, query_seq: str, subject_seq: str, min_match: int = 2) -> list[str]:
-        matrix = self(query_seq, subject_seq)
-
-        longest_match = numpy.max(matrix)
+        longest_match, positions = self.substrings(query_seq, subject_seq)
         if longest_match < min_match or longest_match == 0 or min_match <= 0:
             return [""]
-
-        longest_substrings = []
-        positions = numpy.argwhere(matrix == longest_match)
-        for position in positions:
-            temp = []
-            i, j = position
-            while matrix[i][j] != 0:
-                temp.append(query_seq[i - 1])
-                i -= 1
-                j -= 1
-            longest_substrings.append("".join(temp[::-1]))
-        return longest_substrings
+        return [query_seq[i : i + longest_match] for i, _ in positions]
 
 
 class ShortestCommonSupersequence:
@@ -260,23 +287,22 @@ class ShortestCommonSupersequence:
 
 class LIPNS:
     # Language-Independent Product Name Search
+    # columns compared per step of batch_is_similar before dropping candidates
+    batch_columns = 16
+
     def __init__(self, threshold: float = 0.25):
         self.match = 1
         self.threshold = threshold
 
     def __call__(self, query_seq: str, subject_seq: str):
-        qs, ss = [], []
-        qs.extend([x.upper() for x in query_seq])
-        ss.extend([x.upper() for x in subject_seq])
-        qs_len = len(qs)
-        ss_len = len(ss)
+        qs, ss = hamming._codes(query_seq), hamming._codes(subject_seq)
+        overlap = min(len(qs), len(ss))
 
         # Matrix initialization with correct shape
-        score = numpy.zeros((qs_len, ss_len), dtype=float64)
+        score = numpy.zeros((len(qs), len(ss)), dtype=float64)
 
-        for i in range(min(qs_len, ss_len)):
-            if qs[i] == ss[i]:
-                score[i, i] = self.match
+        matches = numpy.flatnonzero(qs[:overlap] == ss[:overlap])
+        score[matches, matches] = self.match
         return score
 
     def distance(self, query_seq: str, subject_seq: str) -> float:
@@ -307,6 +333,52 @@ class LIPNS:
         sim_score = self.similarity(query_seq, subject_seq)
         return sim_score <= self.threshold
 
+    def _can_pass(
+        self, mismatches: NDArray[intp], query_len: int, subject_len: int
+    ) -> NDArray[numpy.bool_]:
+        # whether pairs with this many mismatches (so far) can still be similar
+        if not query_len and not subject_len:
+            return numpy.full(len(mismatches), 0 <= self.threshold)
+        matches = min(query_len, subject_len) - mismatches
+        return 1 - matches / max(query_len, subject_len) <= self.threshold
+
+    def _passes(
+        self, mismatches: NDArray[intp], query_len: int, subject_len: int
+    ) -> NDArray[numpy.bool_]:
+        return self._can_pass(mismatches, query_len, subject_len)
+
+    def batch_is_similar(self, query_seq: str, candidates) -> NDArray[numpy.bool_]:
+        """
+        ``is_similar`` of the query against every candidate at once.
+
+        Candidates are a list of equal-length strings or a 2-D integer array of
+        encoded sequences (one row each, e.g. uint8 ASCII codes). Positions are
+        compared a block of columns at a time, and candidates that can no
+        longer pass are dropped from the remaining blocks.
+        """
+        if not len(candidates):
+            return numpy.zeros(0, dtype=bool)
+        codes = hamming._encode_batch(candidates)
+        if codes.ndim != 2:
+            raise TypeError("Candidates must be strings or a 2-D integer array")
+        query = hamming._codes(query_seq)
+        query_len, subject_len = len(query), codes.shape[1]
+        overlap = min(query_len, subject_len)
+
+        mismatches = numpy.zeros(len(codes), dtype=intp)
+        alive = numpy.flatnonzero(self._can_pass(mismatches, query_len, subject_len))
+        for start in range(0, overlap, self.batch_columns):
+            if not alive.size:
+                break
+            stop = min(start + self.batch_columns, overlap)
+            block = codes[alive, start:stop] != query[start:stop]
+            mismatches[alive] += numpy.count_nonzero(block, axis=1)
+            alive = alive[self._can_pass(mismatches[alive], query_len, subject_len)]
+
+        similar = numpy.zeros(len(codes), dtype=bool)
+        similar[alive] = self._passes(mismatches[alive], query_len, subject_len)
+        return similar
+
 
 class MLIPNS(LIPNS):
     # Modified Language-Independent Product Name Search
@@ -315,9 +387,7 @@ class MLIPNS(LIPNS):
         self.max_mismatch = max_mismatch
 
     def __call__(self, query_seq: str, subject_seq: str):
-        qs, ss = [], []
-        qs.extend([x.upper() for x in query_seq])
-        ss.extend([x.upper() for x in subject_seq])
+        qs, ss = hamming._codes(query_seq), hamming._codes(subject_seq)
         qs_len = len(qs)
         ss_len = len(ss)
 
@@ -327,18 +397,12 @@ class MLIPNS(LIPNS):
         if abs(qs_len - ss_len) > self.max_mismatch:
             return score
 
-        i = 0
-        max_len = min(qs_len, ss_len)
-        mismatch = 0
-
-        while i < max_len:
-            if qs[i] != ss[i]:
-                mismatch += 1
-                if mismatch > self.max_mismatch:
-                    return numpy.zeros((qs_len, ss_len), dtype=float64)
-            score[i, i] = self.match if qs[i] == ss[i] else 0
-            i += 1
-
+        overlap = min(qs_len, ss_len)
+        equal = qs[:overlap] == ss[:overlap]
+        if overlap - numpy.count_nonzero(equal) > self.max_mismatch:
+            return score
+        matches = numpy.flatnonzero(equal)
+        score[matches, matches] = self.match
         return score
 
     def distance(self, query_seq: str, subject_seq: str) -> float:
@@ -372,6 +436,22 @@ class MLIPNS(LIPNS):
             return True
         return False
 
+    def _can_pass(
+        self, mismatches: NDArray[intp], query_len: int, subject_len: int
+    ) -> NDArray[numpy.bool_]:
+        if abs(query_len - subject_len) > self.max_mismatch:
+            return numpy.zeros(len(mismatches), dtype=bool)
+        return mismatches <= self.max_mismatch
+
+    def _passes(
+        self, mismatches: NDArray[intp], query_len: int, subject_len: int
+    ) -> NDArray[numpy.bool_]:
+        if not query_len and not subject_len:
+            return numpy.ones(len(mismatches), dtype=bool)
+        # at least one position must match
+        matched = min(query_len, subject_len) - mismatches > 0
+        return self._can_pass(mismatches, query_len, subject_len) & matched
+
 
 class LengthRatio:
     def __call__(self, query_seq: str, subject_seq: str) -> float:
@@ -414,6 +494,26 @@ class LengthRatio:
         return f"{query_seq}\n{subject_seq}"
 
 
+def _bits(seq: str) -> tuple[NDArray[numpy.bool_], NDArray[numpy.bool_]]:
+    # positions holding "1" and positions holding "0"
+    codes = numpy.frombuffer(seq.encode("utf-32-le"), dtype=uint32)
+    return codes == ord("1"), codes == ord("0")
+
+
+def _agreements(queries, subjects) -> tuple[NDArray[intp], int]:
+    # agreeing bits of every query/subject pair; 1-D for a single query string
+    packed_queries, packed_subjects = (
+        fps if isinstance(fps, PackedBits) else PackedBits.from_strings(fps)
+        for fps in (queries, subjects)
+    )
+    if not packed_queries.n_bits:
+        raise ValueError("Sequences must be non-empty")
+    agreements = packed_queries.agreements(packed_subjects)
+    if isinstance(queries, str):
+        agreements = agreements[0]
+    return agreements, packed_queries.n_bits
+
+
 class Hamann:
     def _check_inputs(self, query_seq: str, subject_seq: str) -> None:
         if not isinstance(query_seq, (str)) or not isinstance(subject_seq, (str)):
@@ -424,25 +524,15 @@ class Hamann:
     def __call__(self, query_seq: str, subject_seq: str, binary: bool):
         self._check_inputs(query_seq, subject_seq)
         if binary:
+            query, subject = _bits(query_seq), _bits(subject_seq)
             matrix = numpy.zeros((2, 2))
-            for i in range(len(query_seq)):
-                if query_seq[i] == "1" and subject_seq[i] == "1":
-                    matrix[0, 0] += 1
-                elif query_seq[i] == "1" and subject_seq[i] == "0":
-                    matrix[1, 0] += 1
-                elif query_seq[i] == "0" and subject_seq[i] == "1":
-                    matrix[0, 1] += 1
-                elif query_seq[i] == "0" and subject_seq[i] == "0":
-                    matrix[1, 1] += 1
+            # rows follow the subject bit, columns the query bit
+            for row, subject_bit in enumerate(subject):
+                for col, query_bit in enumerate(query):
+                    matrix[row, col] = numpy.count_nonzero(query_bit & subject_bit)
         else:
-            query_seq = query_seq.upper()
-            subject_seq = subject_seq.upper()
-            matrix = numpy.zeros((2))
-            for i in range(len(query_seq)):
-                if query_seq[i] == subject_seq[i]:
-                    matrix[0] += 1
-                else:
-                    matrix[1] += 1
+            mismatches = hamming.distance(query_seq, subject_seq)
+            matrix = numpy.array([len(query_seq) - mismatches, mismatches], float)
         return matrix
 
     def similarity(self, query_seq: str, subject_seq: str) -> float:
@@ -466,21 +556,27 @@ class Hamann:
     def matrix(self, query_seq: str, subject_seq: str, binary: bool):
         return self(query_seq, subject_seq, binary)
 
+    def batch_similarity(self, queries, subjects) -> NDArray[float64]:
+        """
+        Hamann similarity of binary fingerprints ("0"/"1" strings or
+        PackedBits). A single query string gives a 1-D array over the
+        subjects; several queries give a queries x subjects array.
+        """
+        agreements, n_bits = _agreements(queries, subjects)
+        return (2 * agreements - n_bits) / n_bits
+
+    def batch_distance(self, queries, subjects) -> NDArray[float64]:
+        agreements, n_bits = _agreements(queries, subjects)
+        return 1 - agreements / n_bits
+
     def align(self, query_seq: str, subject_seq: str) -> str:
         return f"{query_seq}\n{subject_seq}"
 
 
 class SimpleMatchingCoefficient:
     def __call__(self, query_seq: str, subject_seq: str):
-        query_seq = query_seq.upper()
-        subject_seq = subject_seq.upper()
-        matrix = numpy.zeros((1, 1))
-        for i in range(len(query_seq)):
-            if query_seq[i] == subject_seq[i]:
-                matrix[0, 0] += 1
-            else:
-                matrix[0, 1] += 1
-        return matrix
+        mismatches = hamming.distance(query_seq, subject_seq)
+        return numpy.array([[len(query_seq) - mismatches, mismatches]], float)
 
     def similarity(self, query_seq: str, subject_seq: str) -> float:
         if not query_seq or not subject_seq:
@@ -503,6 +599,19 @@ class SimpleMatchingCoefficient:
     def matrix(self, query_seq: str, subject_seq: str):
         return self(query_seq, subject_seq)
 
+    def batch_similarity(self, queries, subjects) -> NDArray[float64]:
+        """
+        SMC of binary fingerprints ("0"/"1" strings or PackedBits). A single
+        query string gives a 1-D array over the subjects; several queries give
+        a queries x subjects array.
+        """
+        agreements, n_bits = _agreements(queries, subjects)
+        return agreements / n_bits
+
+    def batch_distance(self, queries, subjects) -> NDArray[float64]:
+        agreements, n_bits = _agreements(queries, subjects)
+        return 1 - agreements / n_bits
+
     def align(self, query_seq: str, subject_seq: str) -> str:
         return f"{query_seq}\n{subject_seq}"
 
@@ -612,26 +721,30 @@ class Postfix:
 
 
 class RatcliffObershelp:
-    def __call__(self, query_seq: str, subject_seq: str):
+    def __call__(self, query_seq: str, subject_seq: str) -> list[str]:
+        qs, ss = query_seq.upper(), subject_seq.upper()
         matched = []
-        stack = [(query_seq.upper(), subject_seq.upper())]
+        # one index over the whole subject answers every range below
+        automaton = SuffixAutomaton(ss)
+        stack = [(0, len(qs), 0, len(ss))]
         while len(stack) >= 1:
-            # Get remaining characters
-            remaining = stack.pop()
-            qs = remaining[0]
-            ss = remaining[1]
-
-            # Find LSString
-            matches = longest_common_substring.align(qs, ss, min_match=1)
-            if matches == [""]:
+            # Get remaining ranges
+            q_lo, q_hi, s_lo, s_hi = stack.pop()
+
+            if q_lo >= q_hi or s_lo >= s_hi:
+                continue
+
+            # Find LSString (earliest in the query, then in the subject) in
+            # time linear in the size of the remaining query range
+            q_idx, s_idx, size = automaton.longest_match(qs[q_lo:q_hi], s_lo, s_hi)
+            if size == 0:
                 continue
+            q_idx += q_lo
             # Save matches and add remaining back to stack
-            q_idx = qs.find(matches[0])
-            s_idx = ss.find(matches[0])
-            left = (qs[:q_idx], ss[:s_idx])
-            right = (qs[q_idx + len(matches[0]) :], ss[s_idx + len(matches[0]) :])
+            left = (q_lo, q_idx, s_lo, s_idx)
+            right = (q_idx + size, q_hi, s_idx + size, s_hi)
             stack.extend([left, right])
-            matched.append(matches[0])
+            matched.append(qs[q_idx : q_idx + size])
         return matched
 
     def distance(self, query_seq: str, subject_seq: str) -> float:
@@ -1,26 +1,10 @@
+# internal dependencies
+from goombay.align.suffix import SuffixAutomaton
+
 __all__ = ["LongestCommonSubstringMSA", "longest_common_substring_msa"]
 
 
 class LongestCommonSubstringMSA:
-    def _common_substrings(self, seqs: list[str]) -> list[str]:
-        if not isinstance(seqs, list):
-            raise TypeError("common_substrings expects a list of strings")
-        if len(seqs) != 2:
-            raise ValueError("common_substrings requires exactly two strings")
-
-        s1, s2 = seqs
-        common = set()
-        s2_length = len(s2)
-
-        for start in range(s2_length):
-            for end in range(start + 2, s2_length + 1):  # substrings of length >= 2
-                substr = s2[start:end]
-                if substr not in s1:
-                    break
-                common.add(substr)
-
-        return list(common)
-
     def __call__(self, seqs: list[str]) -> list[str]:
         if (not isinstance(seqs, list) and not isinstance(seqs, tuple)) or not all(
             isinstance(s, str) for s in seqs
@@ -31,22 +15,17 @@ class LongestCommonSubstringMSA:
 
         seqs = [seq.upper() for seq in seqs]
 
-        # Generate substrings from first and last strings
-        motifs = self._common_substrings([seqs[0], seqs[-1]])
-        if not motifs:
-            return [""]
+        # Intersect a suffix automaton of the last sequence with every other one
+        automaton = SuffixAutomaton(seqs[-1])
+        longest, motifs = automaton.common_substrings(seqs[:-1])
+        if longest >= 2:
+            return motifs
 
-        longest = []
-        longest_len = -1
-        motifs.sort(key=len, reverse=True)
-        for motif in motifs:
-            motif_len = len(motif)
-            if all(motif in seq for seq in seqs) and motif_len >= longest_len:
-                longest.append(motif)
-                longest_len = motif_len
-            if motif_len < longest_len:
-                break
-        return longest
+        # only substrings of at least two characters count as shared motifs
+        pairwise_longest, _ = automaton.longest_common_substrings(seqs[0])
+        if pairwise_longest < 2:
+            return [""]
+        return []
 
     def align(self, seqs: list[str]) -> list[str]:
         return self(seqs)
@@ -0,0 +1,110 @@
+# standard library
+from collections.abc import Iterable
+
+try:
+    # external dependencies
+    import numpy
+    from numpy import intp, uint8, uint32, uint64
+    from numpy.typing import ArrayLike, NDArray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+__all__ = ["PackedBits"]
+
+
+class PackedBits:
+    """
+    Binary fingerprints packed into rows of uint64 words.
+
+    Bit ``i`` of a fingerprint is stored in word ``i // 64``; padding bits are
+    zero in every row, so counts of set bits, XORs and ANDs between rows only
+    see the real ``n_bits`` positions. Pairwise counts are computed with
+    popcounts over whole words, a block of rows at a time.
+    """
+
+    # upper bound on the word block built per chunk of rows in pairwise counts
+    batch_bytes = 1 << 24
+
+    def __init__(self, words: NDArray[uint64], n_bits: int) -> None:
+        words = numpy.ascontiguousarray(words, dtype=uint64)
+        self.words = words[None, :] if words.ndim == 1 else words
+        self.n_bits = n_bits
+
+    @classmethod
+    def from_array(cls, bits: ArrayLike) -> "PackedBits":
+        """Pack a 2-D array (one row per fingerprint) of booleans or 0/1 values"""
+        bits = numpy.asarray(bits)
+        if bits.ndim == 1:
+            bits = bits[None, :]
+        if bits.ndim != 2:
+            raise ValueError("Fingerprints must be a 1-D or 2-D array")
+        n_rows, n_bits = bits.shape
+        packed = numpy.packbits(bits.astype(bool), axis=1, bitorder="little")
+        # pad each row to whole words
+        words = numpy.zeros((n_rows, (n_bits + 63) // 64 * 8), dtype=uint8)
+        words[:, : packed.shape[1]] = packed
+        return cls(words.view(uint64), n_bits)
+
+    @classmethod
+    def from_strings(cls, fingerprints: str | Iterable[str]) -> "PackedBits":
+        """Pack equal-length strings of "0" and "1" characters"""
+        if isinstance(fingerprints, str):
+            fingerprints = [fingerprints]
+        fingerprints = list(fingerprints)
+        if not fingerprints:
+            return cls(numpy.zeros((0, 0), dtype=uint64), 0)
+        n_bits = len(fingerprints[0])
+        if any(len(fp) != n_bits for fp in fingerprints):
+            raise ValueError("Sequences must be of equal length")
+        codes = numpy.frombuffer("".join(fingerprints).encode("utf-32-le"), uint32)
+        if not numpy.isin(codes, (ord("0"), ord("1"))).all():
+            raise ValueError('Fingerprints must only contain "0" and "1"')
+        return cls.from_array((codes == ord("1")).reshape(len(fingerprints), n_bits))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __getitem__(self, rows) -> "PackedBits":
+        return PackedBits(self.words[rows], self.n_bits)
+
+    def __repr__(self) -> str:
+        return f"PackedBits(rows={len(self)}, n_bits={self.n_bits})"
+
+    def to_array(self) -> NDArray[numpy.bool_]:
+        bits = numpy.unpackbits(
+            self.words.view(uint8), axis=1, count=self.n_bits, bitorder="little"
+        )
+        return bits.astype(bool)
+
+    def ones(self) -> NDArray[intp]:
+        """Number of set bits in each row"""
+        return numpy.bitwise_count(self.words).sum(axis=1, dtype=intp)
+
+    def _pairwise(self, other: "PackedBits", op) -> NDArray[intp]:
+        if self.n_bits != other.n_bits:
+            raise ValueError("Sequences must be of equal length")
+        counts = numpy.empty((len(self), len(other)), dtype=intp)
+        chunk = max(1, self.batch_bytes // max(1, other.words.nbytes))
+        for start in range(0, len(self), chunk):
+            block = op(self.words[start : start + chunk, None], other.words[None])
+            counts[start : start + chunk] = numpy.bitwise_count(block).sum(
+                axis=-1, dtype=intp
+            )
+        return counts
+
+    def agreements(self, other: "PackedBits") -> NDArray[intp]:
+        """Positions where each row of self and each row of other hold the same bit"""
+        return self.n_bits - self._pairwise(other, numpy.bitwise_xor)
+
+    def contingency(
+        self, other: "PackedBits"
+    ) -> tuple[NDArray[intp], NDArray[intp], NDArray[intp], NDArray[intp]]:
+        """
+        2x2 contingency counts of every pair of rows as ``len(self) x len(other)``
+        arrays: both set, set only in self, set only in other, neither set.
+        """
+        both = self._pairwise(other, numpy.bitwise_and)
+        only_self = self.ones()[:, None] - both
+        only_other = other.ones()[None, :] - both
+        neither = self.n_bits - both - only_self - only_other
+        return both, only_self, only_other, neither
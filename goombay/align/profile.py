@@ -0,0 +1,271 @@
+# standard library
+import time
+
+try:
+    # external dependencies
+    import numpy
+    from numpy import float64, intp, uint8
+    from numpy._typing import NDArray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+# internal dependencies
+from goombay.align.alignment import Alignment
+from goombay.align.base import _at_origin, _walk
+
+__all__ = ["ProfileAligner"]
+
+# Pointer direction constants (as in goombay.align.edit)
+MATCH = 2
+UP = 3
+LEFT = 4
+
+
+class ProfileAligner:
+    """
+    Global alignment of two profiles (blocks of aligned sequences).
+
+    Every profile is reduced to a position-by-symbol frequency matrix whose
+    last column is the gap fraction. All column-pair scores then come from a
+    single matrix product with the substitution matrix compiled over the
+    symbols of both profiles, extended with a gap symbol that scores
+    ``-gap`` against residues and 0 against gaps (sum-of-pairs scoring).
+    Opening a gap column across a profile costs ``gap`` times its residue
+    fraction. The DP is filled a row at a time with NumPy, and the resulting
+    gap pattern is applied to every member at once with index arrays.
+    """
+
+    def __init__(
+        self, match: int = 2, mismatch: int = 1, gap: int = 2, substitution_matrix=None
+    ) -> None:
+        self.match = match
+        self.mismatch = mismatch
+        self.gap = gap
+        self.sub_mat = substitution_matrix
+
+    @classmethod
+    def from_aligner(cls, aligner) -> "ProfileAligner":
+        """
+        Profile aligner scoring residues like a pairwise aligner, or with the
+        defaults for aligners without match/mismatch scores (edit distances,
+        Jaro). Affine aligners contribute their gap opening cost.
+        """
+        if not hasattr(aligner, "match") or not hasattr(aligner, "mismatch"):
+            return cls()
+        return cls(
+            aligner.match,
+            aligner.mismatch,
+            aligner.gap,
+            getattr(aligner, "sub_mat", None),
+        )
+
+    def _score(self, a: str, b: str) -> float:
+        if self.sub_mat is not None:
+            return self.sub_mat[a][b]
+        return self.match if a == b else -self.mismatch
+
+    def compile(self, symbols: str) -> NDArray[float64]:
+        """Score matrix over ``symbols`` followed by the gap symbol"""
+        size = len(symbols)
+        scores = numpy.full((size + 1, size + 1), -float(self.gap), dtype=float64)
+        for i, a in enumerate(symbols):
+            for j, b in enumerate(symbols):
+                scores[i, j] = self._score(a, b)
+        scores[size, size] = 0.0
+        return scores
+
+    def _residues(self, profile: list[str]) -> NDArray:
+        if len({len(seq) for seq in profile}) != 1:
+            raise ValueError("Profile members must be of equal length")
+        return numpy.array([list(seq.upper()) for seq in profile]).reshape(
+            len(profile), -1
+        )
+
+    def frequencies(self, profile: list[str], symbols: str) -> NDArray[float64]:
+        """
+        Position-by-symbol frequencies of a profile over ``symbols`` and a
+        last gap column; every row sums to 1.
+        """
+        residues = self._residues(profile)
+        alphabet = numpy.array(list(symbols) + ["-"])
+        # one-hot counts of each symbol per column, averaged over the members
+        hits = residues[:, :, None] == alphabet[None, None, :]
+        return hits.mean(axis=0, dtype=float64)
+
+    def _symbols(self, profile1: list[str], profile2: list[str]) -> str:
+        return "".join(sorted(set("".join(profile1 + profile2).upper()) - {"-"}))
+
+    def traceback(self, profile1: list[str], profile2: list[str]) -> Alignment:
+        """Alignment of the columns of two profiles, rendered with their first members"""
+        symbols = self._symbols(profile1, profile2)
+        scores = self.compile(symbols)
+        freq1 = self.frequencies(profile1, symbols)
+        freq2 = self.frequencies(profile2, symbols)
+        return Alignment(profile1[0], profile2[0], self._ops(freq1, freq2, scores))
+
+    def _ops(
+        self, freq1: NDArray[float64], freq2: NDArray[float64], scores: NDArray[float64]
+    ) -> bytearray:
+        """Operations of the best alignment of two position-by-symbol frequency matrices"""
+        # column pair scores and the score of each column against a gap column
+        pair_scores = freq1 @ scores @ freq2.T
+        up_gaps = freq1 @ scores[:, -1]
+        left_gaps = freq2 @ scores[:, -1]
+
+        rows, cols = len(freq1) + 1, len(freq2) + 1
+        score = numpy.zeros((rows, cols), dtype=float64)
+        pointer = numpy.zeros((rows, cols), dtype=uint8)
+        score[1:, 0] = numpy.cumsum(up_gaps)
+        score[0, 1:] = numpy.cumsum(left_gaps)
+        pointer[1:, 0] = UP
+        pointer[0, 1:] = LEFT
+        # running cost of gap columns along a row
+        left_cost = numpy.concatenate(([0.0], numpy.cumsum(left_gaps)))
+
+        for i in range(1, rows):
+            diag = score[i - 1, :-1] + pair_scores[i - 1]
+            up = score[i - 1, 1:] + up_gaps[i - 1]
+            best = numpy.maximum(diag, up)
+            # a run of gaps ends in column j when some earlier column k < j
+            # beats j itself: score[i, k] + left_cost[j] - left_cost[k]
+            start = numpy.concatenate(([score[i, 0]], best)) - left_cost
+            left = numpy.maximum.accumulate(start)[:-1] + left_cost[1:]
+            score[i, 1:] = numpy.maximum(best, left)
+            pointer[i, 1:] = numpy.where(
+                left > best, LEFT, numpy.where(diag >= up, MATCH, UP)
+            )
+
+        ops, _, _ = _walk(pointer, rows - 1, cols - 1, _at_origin)
+        return ops
+
+    def merge(self, profile1: list[str], profile2: list[str]) -> list[str]:
+        """Members of both profiles with the gaps of their profile alignment applied"""
+        indices = self.traceback(profile1, profile2).indices
+        merged = []
+        for row, profile in enumerate((profile1, profile2)):
+            # index -1 picks the trailing gap column
+            residues = numpy.array([list(seq) + ["-"] for seq in profile])
+            merged.extend("".join(seq) for seq in residues[:, indices[row]])
+        return merged
+
+    def _codes(self, profile: list[str], symbols: str) -> NDArray[intp]:
+        """Members as rows of symbol indices, ``len(symbols)`` marking gaps"""
+        residues = self._residues(profile)
+        alphabet = numpy.array(list(symbols) + ["-"])
+        order = numpy.argsort(alphabet)
+        position = numpy.searchsorted(alphabet, residues, sorter=order)
+        return order[position].astype(intp)
+
+    def _counts(self, codes: NDArray[intp], size: int) -> NDArray[intp]:
+        """Column-by-symbol counts of rows of symbol indices"""
+        columns = codes.shape[1]
+        flat = codes + (size + 1) * numpy.arange(columns, dtype=intp)
+        return numpy.bincount(flat.ravel(), minlength=columns * (size + 1)).reshape(
+            columns, size + 1
+        )
+
+    def _pair_score(self, counts: NDArray[intp], scores: NDArray[float64]) -> float:
+        # every unordered pair of rows in every column: (c S c - c diag(S)) / 2
+        pairs = ((counts @ scores) * counts).sum() - (counts @ numpy.diag(scores)).sum()
+        return float(pairs / 2)
+
+    def sum_of_pairs(self, profile: list[str]) -> float:
+        """
+        Sum-of-pairs score of an alignment: every pair of members scored
+        column by column, gaps costing ``gap`` against residues and nothing
+        against each other. Computed from the column symbol counts.
+        """
+        symbols = self._symbols(profile, [])
+        counts = self._counts(self._codes(profile, symbols), len(symbols))
+        return self._pair_score(counts, self.compile(symbols))
+
+    def refine(
+        self,
+        profile: list[str],
+        splits: list[list[int]],
+        iterations: int = 1,
+        time_limit: float | None = None,
+    ) -> list[str]:
+        """
+        Tree-dependent iterative refinement of an alignment.
+
+        Each split divides the members in two (the subtrees on either side of
+        a guide-tree edge). Both sides are stripped of their all-gap columns
+        and realigned as profiles, and the result is kept only if it raises
+        the sum-of-pairs score. The column counts of the whole alignment are
+        kept up to date: each side is aligned straight from its counts, and a
+        candidate is scored from the counts of its smaller side in
+        ``O(L * alphabet ** 2)`` rather than over all pairs of members.
+
+        :param profile: aligned sequences of equal length
+        :param splits: member indices of one side of each split
+        :param iterations: passes over the splits; stops early after a pass
+            without improvement
+        :param time_limit: seconds after which no further split is tried
+        :return: the refined members, in the order of ``profile``
+        """
+        if len(profile) < 3 or not splits:
+            return list(profile)
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        symbols = self._symbols(profile, [])
+        size = len(symbols)
+        alphabet = numpy.array(list(symbols) + ["-"])
+        scores = self.compile(symbols)
+        codes = self._codes(profile, symbols)
+        counts = self._counts(codes, size)
+        best = self._pair_score(counts, scores)
+
+        members = len(profile)
+        for _ in range(iterations):
+            improved = False
+            for split in splits:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return self._rows(alphabet, codes)
+                side = numpy.zeros(members, dtype=bool)
+                side[split] = True
+                if side.all() or not side.any():
+                    continue
+                groups = (numpy.flatnonzero(side), numpy.flatnonzero(~side))
+                # counts of the smaller side, the other side by subtraction
+                small = 0 if len(groups[0]) <= len(groups[1]) else 1
+                group_counts = [None, None]
+                group_counts[small] = self._counts(codes[groups[small]], size)
+                group_counts[1 - small] = counts - group_counts[small]
+
+                sub_codes, sub_counts = [], []
+                for rows, rows_counts in zip(groups, group_counts):
+                    # drop the columns that are gaps throughout this side
+                    kept = rows_counts[:, size] < len(rows)
+                    gap_row = numpy.zeros((1, size + 1), dtype=intp)
+                    gap_row[0, size] = len(rows)
+                    # a trailing gap column and count row, picked by index -1
+                    sub_codes.append(
+                        numpy.hstack(
+                            (codes[rows][:, kept], numpy.full((len(rows), 1), size))
+                        )
+                    )
+                    sub_counts.append(numpy.vstack((rows_counts[kept], gap_row)))
+
+                # the frequencies of each side are its counts over its members
+                ops = self._ops(
+                    sub_counts[0][:-1] / len(groups[0]),
+                    sub_counts[1][:-1] / len(groups[1]),
+                    scores,
+                )
+                indices = Alignment("", "", ops).indices
+                new_counts = sub_counts[0][indices[0]] + sub_counts[1][indices[1]]
+                score = self._pair_score(new_counts, scores)
+                if score > best + 1e-9:
+                    new_codes = numpy.empty((members, indices.shape[1]), dtype=intp)
+                    for rows, rows_codes, row_indices in zip(
+                        groups, sub_codes, indices
+                    ):
+                        new_codes[rows] = rows_codes[:, row_indices]
+                    codes, counts, best = new_codes, new_counts, score
+                    improved = True
+            if not improved:
+                break
+        return self._rows(alphabet, codes)
+
+    def _rows(self, alphabet: NDArray, codes: NDArray[intp]) -> list[str]:
+        return ["".join(row) for row in alphabet[codes]]
@@ -0,0 +1,140 @@
+# standard library
+from collections.abc import Iterable, Iterator
+from functools import cached_property
+
+try:
+    # external dependencies
+    import numpy
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+# internal dependencies
+from goombay.align.alignment import Alignment
+from goombay.align.base import _walk
+from goombay.align.edit import Hamming, MATCH, UP, LEFT
+
+__all__ = ["ApproxMatch", "find_approx"]
+
+
+class ApproxMatch:
+    """
+    One end position where a pattern occurs in a text with at most
+    ``max_edits`` edits. ``end`` is the 0-based, end-exclusive text position
+    and ``distance`` the edit distance of the best occurrence ending there.
+
+    Only the stretch of text an occurrence can span is kept, so the alignment
+    (and with it ``start``) is traced back when first asked for.
+    """
+
+    def __init__(
+        self, pattern: str, window: str, window_start: int, end: int, distance: int
+    ) -> None:
+        self.pattern = pattern
+        self.window = window
+        self.window_start = window_start
+        self.end = end
+        self.distance = distance
+
+    def __repr__(self) -> str:
+        return f"ApproxMatch(end={self.end}, distance={self.distance})"
+
+    def __iter__(self) -> Iterator[int]:
+        # unpacks as (end, distance)
+        return iter((self.end, self.distance))
+
+    @cached_property
+    def alignment(self) -> Alignment:
+        """Alignment of the pattern to the text ending at ``end``"""
+        pattern, window = Hamming._upper(self.pattern), Hamming._upper(self.window)
+        rows, cols = len(pattern) + 1, len(window) + 1
+
+        # semi-global edit distance: the occurrence may start anywhere in the window
+        score = numpy.zeros((rows, cols), dtype=int)
+        pointer = numpy.zeros((rows, cols), dtype=int)
+        score[:, 0] = numpy.arange(rows)
+        pointer[1:, 0] = UP
+        for i in range(1, rows):
+            for j in range(1, cols):
+                substitution = score[i - 1, j - 1] + (pattern[i - 1] != window[j - 1])
+                ugap = score[i - 1, j] + 1
+                lgap = score[i, j - 1] + 1
+                tmin = min(substitution, ugap, lgap)
+                score[i, j] = tmin
+                if substitution == tmin:
+                    pointer[i, j] += MATCH
+                if ugap == tmin:
+                    pointer[i, j] += UP
+                if lgap == tmin:
+                    pointer[i, j] += LEFT
+
+        ops, _, start = _walk(pointer, rows - 1, cols - 1, lambda i, j: i == 0)
+        return Alignment(self.pattern, self.window, ops, 0, start)
+
+    @property
+    def start(self) -> int:
+        """0-based text position where the traced occurrence starts"""
+        return self.window_start + self.alignment.subject_start
+
+
+def find_approx(
+    pattern: str, text: str | Iterable[str], max_edits: int
+) -> Iterator[ApproxMatch]:
+    """
+    Stream every end position in ``text`` where ``pattern`` occurs with at most
+    ``max_edits`` insertions, deletions or substitutions (case-insensitive).
+
+    Uses Myers' bit-parallel algorithm with the pattern in the bits of one
+    integer, so each text character costs a handful of integer operations.
+    Text positions are free on both sides of an occurrence (semi-global). The
+    text may be a string or any iterable of string chunks, such as an open
+    file, and is never held in memory as a whole.
+    """
+    if not pattern:
+        raise ValueError("Pattern must be non-empty")
+    if max_edits < 0:
+        raise ValueError("max_edits must be non-negative")
+    if isinstance(text, str):
+        text = [text]
+
+    # bit i of peq[c] is set when pattern[i] is c
+    peq: dict[str, int] = {}
+    for i, char in enumerate(Hamming._upper(pattern)):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    m = len(pattern)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    # vertical deltas of the current DP column: +1 (pv) and -1 (mv)
+    pv, mv, score = full, 0, m
+    # an occurrence spans at most m + max_edits text characters
+    span = m + max_edits
+    tail, offset = "", 0
+    for chunk in text:
+        buffer = tail + chunk
+        base = offset - len(tail)
+        for j, char in enumerate(Hamming._upper(chunk), start=len(tail)):
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = (mv | ~(xh | pv)) & full
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            # no carry into the first row: the occurrence may start anywhere
+            ph = (ph << 1) & full
+            mh = (mh << 1) & full
+            pv = (mh | ~(xv | ph)) & full
+            mv = ph & xv
+            if score <= max_edits:
+                window_start = max(0, j + 1 - span)
+                yield ApproxMatch(
+                    pattern,
+                    buffer[window_start : j + 1],
+                    base + window_start,
+                    base + j + 1,
+                    score,
+                )
+        offset += len(chunk)
+        tail = buffer[len(buffer) - span :] if len(buffer) > span else buffer
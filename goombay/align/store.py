@@ -0,0 +1,256 @@
+# standard library
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+
+try:
+    # external dependencies
+    import numpy
+    from numpy import float64
+    from numpy._typing import NDArray
+except ImportError:
+    raise ImportError("Numpy is not installed. Please pip install numpy to continue.")
+
+# internal dependencies
+from goombay.align.cache import scorer_config, sequence_digest
+
+__all__ = ["PairwiseStore"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pairwise (
+    config TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    query BLOB NOT NULL,
+    subject BLOB NOT NULL,
+    value,
+    PRIMARY KEY (config, metric, query, subject)
+) WITHOUT ROWID
+"""
+
+
+class PairwiseStore:
+    """
+    On-disk key-value store of pairwise results backed by SQLite.
+
+    Values are keyed by the scorer configuration (see ``scorer_config``), the
+    metric name and the digests of both sequences, so results computed by one
+    process can be reused by any later process that scores the same pair with
+    the same configuration. Pairs are stored in the order they were scored;
+    symmetric metrics are also found under the reversed pair. Sequences are
+    digested ignoring case, unless a scorer tells them apart with
+    ``case_sensitive=True``.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE TEMP TABLE wanted (digest BLOB PRIMARY KEY)")
+        self._conn.commit()
+
+    def __enter__(self) -> "PairwiseStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pairwise").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(
+        self,
+        config: str,
+        metric: str,
+        query_seq: str,
+        subject_seq: str,
+        default=None,
+        case_sensitive: bool = False,
+    ):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM pairwise WHERE config = ? AND metric = ?"
+                " AND query = ? AND subject = ?",
+                (
+                    config,
+                    metric,
+                    sequence_digest(query_seq, case_sensitive),
+                    sequence_digest(subject_seq, case_sensitive),
+                ),
+            ).fetchone()
+        return default if row is None else row[0]
+
+    def put(
+        self,
+        config: str,
+        metric: str,
+        query_seq: str,
+        subject_seq: str,
+        value,
+        case_sensitive: bool = False,
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pairwise VALUES (?, ?, ?, ?, ?)",
+                (
+                    config,
+                    metric,
+                    sequence_digest(query_seq, case_sensitive),
+                    sequence_digest(subject_seq, case_sensitive),
+                    value,
+                ),
+            )
+
+    def fetch(
+        self, config: str, metric: str, seqs: list[str], case_sensitive: bool = False
+    ) -> Iterator[tuple[int, int, object]]:
+        """Yield ``(i, j, value)`` for every stored ordered pair of ``seqs``"""
+        digests = [sequence_digest(seq, case_sensitive) for seq in seqs]
+        positions = defaultdict(list)
+        for i, digest in enumerate(digests):
+            positions[digest].append(i)
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM wanted")
+                self._conn.executemany(
+                    "INSERT INTO wanted VALUES (?)", ((d,) for d in positions)
+                )
+            rows = self._conn.execute(
+                "SELECT query, subject, value FROM pairwise"
+                " WHERE config = ? AND metric = ?"
+                " AND query IN (SELECT digest FROM wanted)"
+                " AND subject IN (SELECT digest FROM wanted)",
+                (config, metric),
+            ).fetchall()
+        for query, subject, value in rows:
+            for i in positions[query]:
+                for j in positions[subject]:
+                    if i != j:
+                        yield i, j, value
+
+    def store_many(
+        self,
+        config: str,
+        metric: str,
+        seqs: list[str],
+        items: Iterable[tuple[int, int, object]],
+        case_sensitive: bool = False,
+    ) -> None:
+        """Store ``(i, j, value)`` results computed for pairs of ``seqs``"""
+        digests = [sequence_digest(seq, case_sensitive) for seq in seqs]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pairwise VALUES (?, ?, ?, ?, ?)",
+                (
+                    (config, metric, digests[i], digests[j], value)
+                    for i, j, value in items
+                ),
+            )
+
+    def values(
+        self,
+        config: str,
+        metric: str,
+        seqs: list[str],
+        pairs: list[tuple[int, int]],
+        compute: Callable[[list[tuple[int, int]]], list],
+        symmetric: bool = False,
+        case_sensitive: bool = False,
+    ) -> dict[tuple[int, int], object]:
+        """
+        Return the value of every pair, computing only the pairs not yet stored.
+
+        ``compute`` receives the list of missing ``(i, j)`` pairs and returns
+        their values in the same order. For ``symmetric`` metrics a pair
+        stored as ``(j, i)`` is used when ``(i, j)`` is not stored.
+        """
+        wanted = set(pairs)
+        found, reversed_found = {}, {}
+        for i, j, value in self.fetch(config, metric, seqs, case_sensitive):
+            if (i, j) in wanted:
+                found[i, j] = value
+            elif symmetric and (j, i) in wanted:
+                reversed_found[j, i] = value
+        for pair, value in reversed_found.items():
+            found.setdefault(pair, value)
+        missing = [pair for pair in pairs if pair not in found]
+        if missing:
+            computed = compute(missing)
+            self.store_many(
+                config,
+                metric,
+                seqs,
+                ((i, j, value) for (i, j), value in zip(missing, computed)),
+                case_sensitive,
+            )
+            found.update(zip(missing, computed))
+        return found
+
+    def distance(self, aligner, query_seq: str, subject_seq: str) -> float:
+        """Return ``aligner.distance`` for a pair, computing it only once"""
+        config = scorer_config(aligner)
+        dist = self.get(config, "distance", query_seq, subject_seq)
+        if dist is None:
+            dist = self.get(config, "distance", subject_seq, query_seq)
+        if dist is None:
+            dist = float(aligner.distance(query_seq, subject_seq))
+            self.put(config, "distance", query_seq, subject_seq, dist)
+        return dist
+
+    def distance_matrix(
+        self,
+        aligner,
+        seqs: list[str],
+        compute: Callable[[list[tuple[int, int]]], list[float]] | None = None,
+    ) -> NDArray[float64]:
+        """
+        Return the symmetric matrix of ``aligner.distance`` over all pairs i < j.
+
+        Stored distances are read first, in either orientation since distances
+        are symmetric, and only the missing pairs are passed to
+        ``compute`` (serial ``aligner.distance`` calls by default) and stored.
+        """
+        if compute is None:
+
+            def compute(pairs):
+                return [float(aligner.distance(seqs[i], seqs[j])) for i, j in pairs]
+
+        config = scorer_config(aligner)
+        n = len(seqs)
+        dist_matrix = numpy.full((n, n), numpy.nan, dtype=float64)
+        numpy.fill_diagonal(dist_matrix, 0.0)
+        reversed_found = []
+        for i, j, value in self.fetch(config, "distance", seqs):
+            if i < j:
+                dist_matrix[i, j] = value
+            elif i > j:
+                reversed_found.append((j, i, value))
+        # distances are symmetric, so pairs stored the other way round count too
+        for i, j, value in reversed_found:
+            if numpy.isnan(dist_matrix[i, j]):
+                dist_matrix[i, j] = value
+
+        rows, cols = numpy.nonzero(numpy.isnan(numpy.triu(dist_matrix, 1)))
+        missing = [(int(i), int(j)) for i, j in zip(rows, cols)]
+        if missing:
+            computed = compute(missing)
+            self.store_many(
+                config,
+                "distance",
+                seqs,
+                ((i, j, float(d)) for (i, j), d in zip(missing, computed)),
+            )
+            for (i, j), dist in zip(missing, computed):
+                dist_matrix[i, j] = dist
+
+        upper = numpy.triu(dist_matrix, 1)
+        return upper + upper.T
@@ -0,0 +1,293 @@
+# standard library
+from bisect import bisect_left
+
+__all__ = ["SuffixAutomaton"]
+
+
+class SuffixAutomaton:
+    """
+    Suffix automaton of a sequence.
+
+    Every substring of the sequence is spelled by exactly one path from the
+    root, so the longest substring of another text that occurs in the sequence
+    can be tracked in a single left-to-right pass over that text. Building the
+    automaton and matching a text are both linear in their lengths.
+    """
+
+    def __init__(self, seq: str) -> None:
+        self.seq = seq
+        self.length = [0]
+        self.link = [-1]
+        self.transitions: list[dict[str, int]] = [{}]
+        # position in seq where the substrings of each state first end
+        self.first_end = [-1]
+        # whether a state ends a prefix of seq (every state but the clones)
+        self.prefix = [True]
+        last = 0
+        for char in seq:
+            last = self._extend(last, char)
+
+    def __len__(self) -> int:
+        """Number of states"""
+        return len(self.length)
+
+    def _extend(self, last: int, char: str) -> int:
+        length, link, transitions = self.length, self.link, self.transitions
+        current = len(length)
+        length.append(length[last] + 1)
+        link.append(0)
+        transitions.append({})
+        self.first_end.append(length[last])
+        self.prefix.append(True)
+
+        state = last
+        while state != -1 and char not in transitions[state]:
+            transitions[state][char] = current
+            state = link[state]
+        if state == -1:
+            return current
+
+        target = transitions[state][char]
+        if length[state] + 1 == length[target]:
+            link[current] = target
+            return current
+
+        # split target so that every state keeps a single set of end positions
+        clone = len(length)
+        length.append(length[state] + 1)
+        link.append(link[target])
+        transitions.append(dict(transitions[target]))
+        self.first_end.append(self.first_end[target])
+        self.prefix.append(False)
+        while state != -1 and transitions[state].get(char) == target:
+            transitions[state][char] = clone
+            state = link[state]
+        link[target] = clone
+        link[current] = clone
+        return current
+
+    def _match(self, text: str) -> tuple[list[int], list[int]]:
+        # state reached and length matched after each character of text
+        link, length, transitions = self.link, self.length, self.transitions
+        state = matched = 0
+        states, lengths = [], []
+        for char in text:
+            while state and char not in transitions[state]:
+                state = link[state]
+                matched = length[state]
+            if char in transitions[state]:
+                state = transitions[state][char]
+                matched += 1
+            states.append(state)
+            lengths.append(matched)
+        return states, lengths
+
+    def match_lengths(self, text: str) -> list[int]:
+        """
+        Length of the longest substring of ``text`` ending at each position
+        that also occurs in the sequence.
+        """
+        return self._match(text)[1]
+
+    def longest_match(
+        self, text: str, start: int = 0, end: int | None = None
+    ) -> tuple[int, int, int]:
+        """
+        ``(text_start, seq_start, length)`` of the longest common substring
+        that starts earliest in ``text`` and then earliest in the sequence.
+
+        ``start`` and ``end`` restrict the matches to ``seq[start:end]``, so a
+        single automaton answers queries on any range of the sequence; each
+        restricted step costs ``O(log(n) ** 2)`` in the sequence length.
+        """
+        end = len(self.seq) if end is None else min(end, len(self.seq))
+        if start <= 0 and end == len(self.seq):
+            states, lengths = self._match(text)
+            longest = max(lengths, default=0)
+            if longest == 0:
+                return 0, 0, 0
+            text_end = lengths.index(longest)
+            seq_end = self.first_end[states[text_end]]
+            return text_end + 1 - longest, seq_end + 1 - longest, longest
+
+        link, length, transitions = self.link, self.length, self.transitions
+        state = matched = longest = 0
+        for position, char in enumerate(text):
+            # drop characters from the front of the match until appending
+            # char keeps it inside seq[start:end]
+            while True:
+                target = transitions[state].get(char)
+                if target is not None and self._first_end_in(
+                    target, start + matched, end
+                ):
+                    break
+                if matched == 0:
+                    target = None
+                    break
+                matched -= 1
+                if matched == length[link[state]]:
+                    state = link[state]
+            if target is None:
+                continue
+            state, matched = target, matched + 1
+            if matched > longest:
+                longest, text_end, longest_state = matched, position, state
+        if longest == 0:
+            return 0, 0, 0
+        seq_end = self._first_end_in(longest_state, start + longest - 1, end) - 1
+        return text_end + 1 - longest, seq_end + 1 - longest, longest
+
+    def _children(self) -> list[list[int]]:
+        # suffix-link tree, each state listing the states linking to it
+        if getattr(self, "_tree", None) is None:
+            self._tree = [[] for _ in self.length]
+            for state in range(1, len(self.length)):
+                self._tree[self.link[state]].append(state)
+        return self._tree
+
+    def _end_positions(self, state: int) -> list[int]:
+        # every end position of the substrings of state: one per prefix state
+        # in its subtree, and a subtree holds fewer than twice as many states
+        children, first_end, prefix = self._children(), self.first_end, self.prefix
+        ends, stack = [], [state]
+        while stack:
+            state = stack.pop()
+            if prefix[state]:
+                ends.append(first_end[state])
+            stack.extend(children[state])
+        ends.sort()
+        return ends
+
+    def _range_index(self) -> tuple[list[int], list[int], list[list[int]], int]:
+        # The end positions below a state in the suffix-link tree are a
+        # contiguous run of them listed in depth-first order: ``entry`` and
+        # ``exit`` bound that run, and a merge-sort tree over the run finds the
+        # first end position past any bound inside it.
+        if getattr(self, "_ranges", None) is None:
+            children, first_end, prefix = self._children(), self.first_end, self.prefix
+            entry, exit = [0] * len(self.length), [0] * len(self.length)
+            ends, stack = [], [(0, False)]
+            while stack:
+                state, done = stack.pop()
+                if done:
+                    exit[state] = len(ends)
+                    continue
+                entry[state] = len(ends)
+                if prefix[state]:
+                    ends.append(first_end[state])
+                stack.append((state, True))
+                stack.extend((child, False) for child in children[state])
+            size = 1
+            while size < len(ends):
+                size *= 2
+            tree = [[] for _ in range(size)] + [[end] for end in ends]
+            tree += [[] for _ in range(2 * size - len(tree))]
+            for node in range(size - 1, 0, -1):
+                tree[node] = sorted(tree[2 * node] + tree[2 * node + 1])
+            self._ranges = entry, exit, tree, size
+        return self._ranges
+
+    def _first_end_in(self, state: int, lo: int, hi: int) -> int:
+        # one past the first end position of state in [lo, hi), 0 if none
+        entry, exit, tree, size = self._range_index()
+        left, right = entry[state] + size, exit[state] + size
+        first = hi
+        while left < right:
+            if left & 1:
+                node = tree[left]
+                index = bisect_left(node, lo)
+                if index < len(node) and node[index] < first:
+                    first = node[index]
+                left += 1
+            if right & 1:
+                right -= 1
+                node = tree[right]
+                index = bisect_left(node, lo)
+                if index < len(node) and node[index] < first:
+                    first = node[index]
+            left //= 2
+            right //= 2
+        return first + 1 if first < hi else 0
+
+    def occurrences(self, substring: str) -> list[int]:
+        """
+        Start positions of every (possibly overlapping) occurrence of
+        ``substring``, in time linear in its length and number of occurrences.
+        """
+        state, transitions = 0, self.transitions
+        for char in substring:
+            state = transitions[state].get(char)
+            if state is None:
+                return []
+        return [end + 1 - len(substring) for end in self._end_positions(state)]
+
+    def longest_common_substrings(self, text: str) -> tuple[int, list[tuple[int, int]]]:
+        """
+        Length of the longest common substrings of ``text`` and the sequence,
+        and the ``(text_start, seq_start)`` of each of their occurrences,
+        ordered by text position then sequence position.
+        """
+        states, lengths = self._match(text)
+        longest = max(lengths, default=0)
+        if longest == 0:
+            return 0, []
+
+        positions = []
+        seq_ends = {}
+        for end, (state, matched) in enumerate(zip(states, lengths), start=1):
+            if matched != longest:
+                continue
+            # the matched substring belongs to state, so shares its end positions
+            if state not in seq_ends:
+                seq_ends[state] = self._end_positions(state)
+            positions.extend(
+                (end - longest, seq_end + 1 - longest) for seq_end in seq_ends[state]
+            )
+        return longest, positions
+
+    def _longest_first(self) -> list[int]:
+        # non-root states ordered by decreasing length (counting sort)
+        if getattr(self, "_order", None) is None:
+            buckets = [[] for _ in range(len(self.seq) + 1)]
+            for state in range(1, len(self.length)):
+                buckets[self.length[state]].append(state)
+            self._order = [state for bucket in reversed(buckets) for state in bucket]
+        return self._order
+
+    def _matched_per_state(self, text: str) -> list[int]:
+        # longest part of each state's substrings that also occurs in text
+        link, length = self.link, self.length
+        matched_at = [0] * len(length)
+        for state, matched in zip(*self._match(text)):
+            if matched > matched_at[state]:
+                matched_at[state] = matched
+
+        # a match reaching a state also matches every suffix of it in full
+        for state in self._longest_first():
+            if matched_at[state]:
+                parent = link[state]
+                matched_at[parent] = max(matched_at[parent], length[parent])
+        return matched_at
+
+    def common_substrings(self, texts: list[str]) -> tuple[int, list[str]]:
+        """
+        Length of the longest substrings of the sequence occurring in every
+        one of ``texts``, and those distinct substrings ordered by where they
+        first end in the sequence. Linear in the total length of the inputs.
+        """
+        common = list(self.length)
+        for text in texts:
+            for state, matched in enumerate(self._matched_per_state(text)):
+                if matched < common[state]:
+                    common[state] = matched
+        longest = max(common[1:], default=0)
+        if longest == 0:
+            return 0, []
+
+        # each substring belongs to the one state whose length range holds it
+        ends = sorted(
+            self.first_end[state]
+            for state in range(1, len(common))
+            if common[state] == longest and self.length[self.link[state]] < longest
+        )
+        return longest, [self.seq[end - longest + 1 : end + 1] for end in ends]
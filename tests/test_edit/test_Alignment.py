@@ -0,0 +1,129 @@
+import unittest
+from goombay import (
+    Alignment,
+    FengDoolittle,
+    NeedlemanWunsch,
+    WagnerFischer,
+    LowranceWagner,
+    WatermanSmithBeyer,
+    WatermanSmithBeyerLocal,
+    Gotoh,
+    GotohLocal,
+    SmithWaterman,
+    Hirschberg,
+)
+from goombay.align.alignment import OP_DELETE, OP_INSERT, OP_MATCH
+
+
+class TestAlignment(unittest.TestCase):
+    """Test suite for compact alignments produced by the traceback"""
+
+    def setUp(self):
+        """Initialize algorithms for tests"""
+        self.algorithms = [
+            NeedlemanWunsch(),
+            WagnerFischer(),
+            LowranceWagner(),
+            WatermanSmithBeyer(),
+            WatermanSmithBeyerLocal(),
+            Gotoh(),
+            GotohLocal(),
+            SmithWaterman(),
+            Hirschberg(),
+        ]
+        self.pairs = [
+            ("GATTACA", "GCATGCU"),
+            ("ACTG", "ACTG"),
+            ("ACTG", "ATCG"),
+            ("actg", "ACTT"),
+            ("HOUSEOFCARDSFALLDOWN", "HOUSECARDFALLDOWN"),
+            ("ACTG", ""),
+            ("", "ACTG"),
+        ]
+
+    def test_matches_align(self):
+        """The compact alignment renders exactly like align"""
+        for algorithm in self.algorithms:
+            for query, subject in self.pairs:
+                with self.subTest(algorithm=type(algorithm).__name__, query=query):
+                    try:
+                        expected = algorithm.align(query, subject)
+                    except (IndexError, ValueError):
+                        continue
+                    traceback = algorithm.traceback(query, subject)
+                    if traceback is None:
+                        self.assertNotIn("\n", expected)
+                    else:
+                        self.assertEqual(str(traceback), expected)
+
+    def test_single_alignment_is_optimal(self):
+        """The single alignment is one of the co-optimal alignments"""
+        for algorithm in [NeedlemanWunsch(), Gotoh(), SmithWaterman()]:
+            for query, subject in self.pairs[:5]:
+                with self.subTest(algorithm=type(algorithm).__name__, query=query):
+                    self.assertIn(
+                        algorithm.align(query, subject),
+                        algorithm.align(query, subject, all_alignments=True),
+                    )
+
+    def test_long_traceback(self):
+        """Operations span the whole alignment for longer sequences"""
+        query = "ACGT" * 60
+        subject = "ACGT" * 30 + "TT" + "ACGT" * 30
+        traceback = NeedlemanWunsch().traceback(query, subject)
+        self.assertEqual(len(traceback), len(subject))
+        self.assertEqual(traceback.query_end, len(query))
+        self.assertEqual(traceback.subject_end, len(subject))
+
+    def test_ops_and_indices(self):
+        """Index arrays hold aligned positions with -1 for gaps"""
+        traceback = NeedlemanWunsch().traceback("HOLYWATER", "WATER")
+        self.assertEqual(str(traceback), "HOLYWATER\n----WATER")
+        self.assertEqual(traceback.ops.tolist(), [OP_INSERT] * 4 + [OP_MATCH] * 5)
+        self.assertEqual(traceback.indices[0].tolist(), list(range(9)))
+        self.assertEqual(traceback.indices[1].tolist(), [-1] * 4 + list(range(5)))
+
+    def test_cigar(self):
+        """CIGAR strings run-length encode the operations"""
+        traceback = Alignment("ACGTT", "AGGT", [0, 0, 0, 1, 0])
+        self.assertEqual(traceback.cigar(), "3M1I1M")
+        self.assertEqual(traceback.cigar(extended=True), "1=1X1=1I1=")
+        self.assertEqual(traceback.cigar_runs(), [(3, "M"), (1, "I"), (1, "M")])
+        self.assertEqual(str(traceback), "ACGTT\nAGG-T")
+        self.assertEqual(Alignment("", "", []).cigar(), "")
+
+    def test_local_positions(self):
+        """Local alignments keep the positions where they start and end"""
+        traceback = SmithWaterman().traceback("GATTACA", "GCATGCU")
+        self.assertEqual(str(traceback), "CA\nCA")
+        self.assertEqual((traceback.query_start, traceback.query_end), (5, 7))
+        self.assertEqual((traceback.subject_start, traceback.subject_end), (1, 3))
+        self.assertEqual(traceback.indices.tolist(), [[5, 6], [1, 2]])
+        self.assertIsNone(SmithWaterman().traceback("AAA", "CCC"))
+
+    def test_from_string(self):
+        """Alignments can be rebuilt from the string format"""
+        traceback = Alignment.from_string("AC-GT\nA-TGT")
+        self.assertEqual(
+            traceback.ops.tolist(),
+            [OP_MATCH, OP_INSERT, OP_DELETE, OP_MATCH, OP_MATCH],
+        )
+        self.assertEqual(traceback.query_seq, "ACGT")
+        self.assertEqual(traceback.subject_seq, "ATGT")
+        self.assertEqual(str(traceback), "AC-GT\nA-TGT")
+
+    def test_gapped(self):
+        """Gaps of one row can be applied to other sequences of the same length"""
+        traceback = NeedlemanWunsch().traceback("HOLYWATER", "WATER")
+        self.assertEqual(traceback.gapped("FIRE-", 1), "----FIRE-")
+
+    def test_merge_profiles_keeps_residues(self):
+        """Merging profiles never drops residues from gapped sequences"""
+        seqs = ["TAACA", "CGTAAT", "AGTTTTT", "CCTTTCC", "GAACT"]
+        rows = FengDoolittle().align(seqs).split("\n")
+        self.assertEqual(sorted(row.replace("-", "") for row in rows), sorted(seqs))
+        self.assertEqual(len({len(row) for row in rows}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
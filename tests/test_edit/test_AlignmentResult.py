@@ -0,0 +1,114 @@
+import unittest
+from unittest import mock
+from goombay import (
+    AlignmentResult,
+    NeedlemanWunsch,
+    SmithWaterman,
+    Gotoh,
+    GotohLocal,
+    Hirschberg,
+    WagnerFischer,
+)
+
+
+class TestAlignmentResult(unittest.TestCase):
+    """Test suite for single-pass alignment results"""
+
+    def setUp(self):
+        """Initialize algorithms for tests"""
+        self.algorithms = [
+            NeedlemanWunsch(),
+            SmithWaterman(),
+            Gotoh(),
+            GotohLocal(),
+            Hirschberg(),
+            WagnerFischer(),
+        ]
+        self.pairs = [("GATTACA", "GCATGCU"), ("ACTG", "ACTG"), ("ACTG", "ACTT")]
+
+    def test_matches_direct_calls(self):
+        """Derived values are identical to the aligner's own methods"""
+        for algorithm in self.algorithms:
+            for query, subject in self.pairs:
+                with self.subTest(algorithm=type(algorithm).__name__, query=query):
+                    result = algorithm.run(query, subject)
+                    self.assertIsInstance(result, AlignmentResult)
+                    self.assertEqual(
+                        result.similarity, algorithm.similarity(query, subject)
+                    )
+                    self.assertEqual(result.score, result.similarity)
+                    self.assertEqual(
+                        result.distance, algorithm.distance(query, subject)
+                    )
+                    self.assertEqual(
+                        result.normalized_similarity,
+                        algorithm.normalized_similarity(query, subject),
+                    )
+                    self.assertEqual(
+                        result.normalized_distance,
+                        algorithm.normalized_distance(query, subject),
+                    )
+                    self.assertEqual(result.alignment, algorithm.align(query, subject))
+
+    def test_single_dp_pass(self):
+        """The matrices are computed once no matter how many values are read"""
+
+        class CountingNeedlemanWunsch(NeedlemanWunsch):
+            calls = 0
+
+            def __call__(self, query_seq, subject_seq):
+                CountingNeedlemanWunsch.calls += 1
+                return super().__call__(query_seq, subject_seq)
+
+        result = CountingNeedlemanWunsch().run("GATTACA", "GCATGCU")
+        result.distance, result.normalized_similarity, result.alignment
+        result.identity, result.cigar, result.coordinates
+        self.assertEqual(CountingNeedlemanWunsch.calls, 1)
+
+    def test_hirschberg_single_pass(self):
+        """Hirschberg distance and similarity share one recursive alignment"""
+        hirschberg = Hirschberg()
+        with mock.patch.object(
+            Hirschberg, "_hirschberg", wraps=hirschberg._hirschberg
+        ) as recurse:
+            result = hirschberg.run("GATTACA", "GCATGCU")
+            result.distance, result.similarity, result.normalized_similarity
+        top_level = [
+            c for c in recurse.call_args_list if c.args == ("GATTACA", "GCATGCU")
+        ]
+        self.assertEqual(len(top_level), 1)
+
+    def test_global_coordinates(self):
+        """Global alignments span both sequences"""
+        result = NeedlemanWunsch().run("HOLYWATER", "WATER")
+        self.assertEqual(result.coordinates, (0, 9, 0, 5))
+        self.assertEqual(result.cigar, "4I5M")
+        self.assertEqual(result.identity, 5 / 9)
+
+    def test_local_coordinates(self):
+        """Local alignments report where the aligned region lies"""
+        result = SmithWaterman().run("GATTACA", "GCATGCU")
+        self.assertEqual(result.alignment, "CA\nCA")
+        self.assertEqual(result.coordinates, (5, 7, 1, 3))
+        self.assertEqual(result.query_seq[5:7], "CA")
+        self.assertEqual(result.subject_seq[1:3], "CA")
+        self.assertEqual(result.cigar, "2M")
+        self.assertEqual(result.identity, 1.0)
+
+    def test_no_local_alignment(self):
+        """Pairs without a local alignment have no coordinates"""
+        result = SmithWaterman().run("AAA", "CCC")
+        self.assertIsNone(result.coordinates)
+        self.assertEqual(result.cigar, "")
+        self.assertEqual(result.identity, 0.0)
+
+    def test_pin_released(self):
+        """Pinned matrices are only served while deriving a value"""
+        nw = NeedlemanWunsch()
+        result = nw.run("ACTG", "ACTT")
+        result.alignment
+        self.assertIsNot(nw("ACTG", "ACTT"), result.matrices)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from goombay import FengDoolittle, NeedlemanWunsch
+from goombay.phylo import NewickFormatter
 
 
 class TestFengDoolittle(unittest.TestCase):
@@ -206,6 +207,36 @@ class TestFengDoolittle(unittest.TestCase):
         aligned_no_gaps = sorted(seq.replace("-", "") for seq in aligned if seq)
         self.assertEqual(orig_no_gaps, aligned_no_gaps)
 
+    def test_parallel_distances(self):
+        """Test that worker processes compute the same distance matrix"""
+        seqs = ["ACTG", "AGT", "AAGTCCA", "TTGACA", "ACTGACTGA", "G", "CAGT"]
+        serial = self.feng.get_matrix(seqs)
+        parallel = FengDoolittle(workers=2).get_matrix(seqs)
+        self.assertEqual(parallel.tolist(), serial.tolist())
+        self.assertEqual(FengDoolittle(workers=2).align(seqs), self.feng.align(seqs))
+        with self.assertRaises(ValueError):
+            FengDoolittle(workers=0)
+
+    def test_parallel_merges(self):
+        """Test that subtrees merged by worker processes give the same alignment"""
+        seqs = ["TAACA", "CGTAAT", "AGTTTTT", "CCTTTCC", "GAACT", "TAAC"]
+        self.assertEqual(FengDoolittle(workers=3).align(seqs), self.feng.align(seqs))
+
+    def test_merged_profiles_are_freed(self):
+        """Test that only the root profile is left once the tree is merged"""
+        seqs = ["ACTG", "ACG", "TTCG", "ATCG"]
+        newick = "((0:1,1:1):1,(2:1,3:1):1);"
+        for feng in [self.feng, FengDoolittle(workers=2)]:
+            with self.subTest(workers=feng.workers):
+                profile_dict = feng.gen_profile_dict(seqs)
+                tree = NewickFormatter(None).parse_newick(newick)
+                feng._align(tree, profile_dict, verbose=False)
+                self.assertEqual(len(profile_dict), 1)
+                (profile,) = profile_dict.values()
+                self.assertEqual(
+                    sorted(row.replace("-", "") for row in profile), sorted(seqs)
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -200,6 +200,60 @@ class TestGotoh(unittest.TestCase):
                 for alignment in alignments:
                     self.assertIn(alignment, res)
 
+    def test_leading_gap_run(self):
+        """Tracebacks reaching the first row or column end in a gap run"""
+        test_cases = [
+            ("ACGT", "TTACGT", "--ACGT\nTTACGT"),
+            ("TTACGT", "ACGT", "TTACGT\n--ACGT"),
+            ("GGGACTG", "ACTG", "GGGACTG\n---ACTG"),
+        ]
+        for query, subject, alignment in test_cases:
+            with self.subTest(query=query, subject=subject):
+                self.assertEqual(Gotoh().align(query, subject), alignment)
+                self.assertEqual(
+                    Gotoh().align(query, subject, all_alignments=True), [alignment]
+                )
+
+    def test_end_gaps(self):
+        """Test semi-global alignment with free end gaps"""
+        test_cases = [
+            ("free", "ACGT", "TTACGTGG", "--ACGT--\nTTACGTGG", 4.0),
+            (
+                ["query_start", "query_end"],
+                "GGACGTCC",
+                "ACGT",
+                "GGACGTCC\n--ACGT--",
+                4.0,
+            ),
+            (
+                ["subject_start", "subject_end"],
+                "GGACGTCC",
+                "ACGT",
+                "GGACGTCC\n--ACGT--",
+                -6.0,
+            ),
+            ("subject_end", "ACGT", "TTACGTGG", "--ACGT--\nTTACGTGG", -1.0),
+            ("free", "ACGTTT", "TTTGCA", "ACGTTT---\n---TTTGCA", 3.0),
+        ]
+        for end_gaps, query, subject, alignment, expected in test_cases:
+            with self.subTest(end_gaps=end_gaps, query=query, subject=subject):
+                algorithm = Gotoh(end_gaps=end_gaps)
+                self.assertEqual(algorithm.align(query, subject), alignment)
+                self.assertEqual(algorithm.similarity(query, subject), expected)
+                self.assertEqual(str(algorithm.traceback(query, subject)), alignment)
+                self.assertIn(
+                    alignment, algorithm.align(query, subject, all_alignments=True)
+                )
+
+    def test_end_gaps_names(self):
+        """Test that end gaps are checked and kept in canonical order"""
+        algorithm = Gotoh(end_gaps=["subject_end", "query_start"])
+        self.assertEqual(algorithm.end_gaps, "query_start,subject_end")
+        self.assertEqual(Gotoh(end_gaps="free").end_gaps, "free")
+        self.assertEqual(Gotoh().end_gaps, "penalized")
+        with self.assertRaises(ValueError):
+            Gotoh(end_gaps="query_middle")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,6 @@
+import random
 import unittest
+import numpy
 from goombay import Hamming
 
 
@@ -158,6 +160,64 @@ class TestHamming(unittest.TestCase):
             with self.subTest(query=query, subject=subject):
                 self.assertEqual(self.algorithm.align(query, subject), alignment)
 
+    def test_batch_distance(self):
+        """Batch distances match pairwise distances for every input type"""
+        random.seed(7)
+        queries = ["".join(random.choices("ACGTN", k=12)) for _ in range(40)]
+        subjects = ["".join(random.choices("acgt", k=12)) for _ in range(15)]
+        expected = [[self.algorithm.distance(q, s) for s in subjects] for q in queries]
+        dist = self.algorithm.batch_distance(queries, subjects)
+        self.assertEqual(dist.shape, (40, 15))
+        self.assertEqual(dist.tolist(), expected)
+
+        encoded = [q.encode() for q in queries]
+        self.assertEqual(
+            self.algorithm.batch_distance(
+                encoded, [s.encode() for s in subjects]
+            ).tolist(),
+            expected,
+        )
+        codes = numpy.frombuffer("".join(queries).encode(), dtype=numpy.uint8)
+        codes = codes.reshape(40, 12)
+        self.assertEqual(
+            self.algorithm.batch_distance(codes, codes[:5]).tolist(),
+            [[self.algorithm.distance(q, s) for s in queries[:5]] for q in queries],
+        )
+        self.assertEqual(
+            self.algorithm.batch_similarity(queries, subjects).tolist(),
+            [[12 - d for d in row] for row in expected],
+        )
+
+    def test_batch_integers(self):
+        """Integer batches are compared bitwise"""
+        nums = [15, 5, 13, 1, 0, 2**63 + 1]
+        self.assertEqual(
+            self.algorithm.batch_distance(nums, nums).tolist(),
+            [[self.algorithm.distance(a, b) for b in nums] for a in nums],
+        )
+        self.assertEqual(
+            self.algorithm.batch_similarity(nums, nums).tolist(),
+            [[self.algorithm.similarity(a, b) for b in nums] for a in nums],
+        )
+
+    def test_batch_invalid(self):
+        """Batches must hold equal-length sequences of one type"""
+        with self.assertRaises(IndexError):
+            self.algorithm.batch_distance(["ACTG", "ACT"], ["ACTG"])
+        with self.assertRaises(IndexError):
+            self.algorithm.batch_distance(["ACTG"], ["ACT"])
+        with self.assertRaises(TypeError):
+            self.algorithm.batch_distance(["ACTG"], [5])
+        with self.assertRaises(TypeError):
+            self.algorithm.batch_distance(["ACTG", 5], ["ACTG"])
+        self.assertEqual(self.algorithm.batch_distance([], ["ACTG"]).shape, (0, 1))
+        # integers are batched as 64-bit words
+        for nums in ([2**64], [-1]):
+            with self.subTest(nums=nums), self.assertRaises(ValueError):
+                self.algorithm.batch_distance(nums, [1])
+        with self.assertRaises(ValueError):
+            self.algorithm.batch_similarity([1], [2**70 + 1])
+
 
 if __name__ == "__main__":
     unittest.main()
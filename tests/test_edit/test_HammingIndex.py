@@ -0,0 +1,80 @@
+import os
+import random
+import tempfile
+import unittest
+from goombay import Hamming, HammingIndex
+
+
+class TestHammingIndex(unittest.TestCase):
+    """Test suite for radius search over Hamming barcodes"""
+
+    def setUp(self):
+        """Initialize index for tests"""
+        random.seed(11)
+        self.barcodes = list(
+            dict.fromkeys("".join(random.choices("ACGT", k=10)) for _ in range(500))
+        )
+        self.index = HammingIndex(self.barcodes, max_radius=2)
+        self.hamming = Hamming()
+
+    def brute_force(self, read, radius):
+        hits = [(b, self.hamming.distance(read, b)) for b in self.barcodes]
+        return sorted([hit for hit in hits if hit[1] <= radius], key=lambda h: h[1])
+
+    def test_matches_linear_scan(self):
+        """Radius queries return exactly what scanning the whitelist returns"""
+        for _ in range(100):
+            read = list(random.choice(self.barcodes))
+            for _ in range(random.randint(0, 4)):
+                read[random.randrange(len(read))] = random.choice("ACGT")
+            read = "".join(read)
+            for radius in range(3):
+                with self.subTest(read=read, radius=radius):
+                    self.assertEqual(
+                        self.index.query(read, radius), self.brute_force(read, radius)
+                    )
+
+    def test_case_and_length(self):
+        """Reads are case-insensitive and only compared to equal-length barcodes"""
+        barcode = self.barcodes[0]
+        self.assertEqual(self.index.query(barcode.lower(), 0), [(barcode, 0)])
+        self.assertEqual(self.index.query(barcode[:-1]), [])
+        self.assertIn(barcode.lower(), self.index)
+
+    def test_nearest(self):
+        """Nearest returns the unique closest barcode"""
+        index = HammingIndex(["AAAA", "CCCC", "AATT"], max_radius=1)
+        self.assertEqual(index.nearest("AAAT"), None)
+        self.assertEqual(index.nearest("CCCA"), "CCCC")
+        self.assertEqual(index.nearest("GGGG"), None)
+
+    def test_similarity(self):
+        """Similarity queries use Hamming similarity"""
+        index = HammingIndex(["AAAA", "AAAT", "TTTT"], max_radius=1)
+        self.assertEqual(index.query_similar("AAAA", 3), [("AAAA", 4), ("AAAT", 3)])
+        self.assertEqual(index.query_similar("AAAA", 5), [])
+
+    def test_invalid_radius(self):
+        """Radii beyond the indexed maximum are rejected"""
+        with self.assertRaises(ValueError):
+            self.index.query("ACGTACGTAC", 3)
+        with self.assertRaises(ValueError):
+            HammingIndex(max_radius=-1)
+
+    def test_from_file(self):
+        """Whitelists can be read from a file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "whitelist.txt")
+            with open(path, "w") as handle:
+                handle.write("# barcodes\n")
+                handle.write(
+                    "\n".join(f"{b}\tsample{i}" for i, b in enumerate(self.barcodes))
+                )
+                handle.write("\n\n")
+            index = HammingIndex.from_file(path, max_radius=2)
+        self.assertEqual(index.barcodes, self.barcodes)
+        self.assertEqual(len(index), len(self.barcodes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -139,6 +139,42 @@ class TestHirschberg(unittest.TestCase):
                     self.algorithm.normalized_distance(query, subject), exp_dist
                 )
 
+    def test_end_gaps(self):
+        """Test semi-global alignment with free end gaps"""
+        test_cases = [
+            ("free", "ACGT", "TTACGTGG", "--ACGT--\nTTACGTGG", 0.0),
+            (
+                ["query_start", "query_end"],
+                "GGACGTCC",
+                "ACGT",
+                "GGACGTCC\n--ACGT--",
+                0.0,
+            ),
+            (
+                ["subject_start", "subject_end"],
+                "GGACGTCC",
+                "ACGT",
+                "GGACGTCC\n--ACGT--",
+                16.0,
+            ),
+            ("subject_end", "ACGT", "TTACGTGG", "--ACGT--\nTTACGTGG", 8.0),
+            ("free", "ACGTTT", "TTTGCA", "ACGTTT---\n---TTTGCA", 0.0),
+        ]
+        for end_gaps, query, subject, alignment, expected in test_cases:
+            with self.subTest(end_gaps=end_gaps, query=query, subject=subject):
+                algorithm = Hirschberg(end_gaps=end_gaps)
+                self.assertEqual(algorithm.align(query, subject), alignment)
+                self.assertEqual(algorithm.distance(query, subject), expected)
+
+    def test_end_gaps_names(self):
+        """Test that end gaps are checked and kept in canonical order"""
+        algorithm = Hirschberg(end_gaps=["subject_end", "query_start"])
+        self.assertEqual(algorithm.end_gaps, "query_start,subject_end")
+        self.assertEqual(Hirschberg(end_gaps="free").end_gaps, "free")
+        self.assertEqual(Hirschberg().end_gaps, "penalized")
+        with self.assertRaises(ValueError):
+            Hirschberg(end_gaps="query_middle")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from goombay import FengDoolittle, KmerDistance, NotredameHigginsHeringa, kmer_distance
+
+
+class TestKmerDistance(unittest.TestCase):
+    """Test suite for alignment-free k-mer distances"""
+
+    def setUp(self):
+        """Initialize algorithm for tests"""
+        self.algorithm = KmerDistance(k=3)
+
+    def test_identical_sequences(self):
+        """Test behavior with identical sequences"""
+        self.assertEqual(self.algorithm.distance("ACGTACGT", "acgtacgt"), 0.0)
+        self.assertEqual(self.algorithm.similarity("ACGTACGT", "ACGTACGT"), 1.0)
+
+    def test_fractional_common_kmer_count(self):
+        """Shared k-mers are counted with multiplicity over the smaller sequence"""
+        # ACG, CGT, GTA, TAC, ACG vs ACG, CGT, GTT: ACG and CGT are shared
+        self.assertAlmostEqual(self.algorithm.similarity("ACGTACG", "ACGTT"), 2 / 3)
+        self.assertAlmostEqual(self.algorithm.distance("ACGTACG", "ACGTT"), 1 / 3)
+        self.assertEqual(self.algorithm.distance("AAAA", "CCCC"), 1.0)
+
+    def test_compressed_alphabet(self):
+        """Residues of the same group share k-mers"""
+        dayhoff = KmerDistance(k=3, alphabet="dayhoff6")
+        self.assertEqual(dayhoff.distance("AIDEK", "SLNQR"), 0.0)
+        self.assertEqual(KmerDistance(k=3).distance("AIDEK", "SLNQR"), 0.0)
+        custom = KmerDistance(k=2, alphabet=["AG", "CT"])
+        self.assertEqual(custom.alphabet, "AG,CT")
+        self.assertEqual(custom.distance("ACGT", "GTAC"), 0.0)
+
+    def test_unknown_residues(self):
+        """K-mers holding residues outside the alphabet are skipped"""
+        offsets, kmers, counts = self.algorithm.profiles(["ACGNACG", "ACG", "AC"])
+        self.assertEqual(offsets.tolist(), [0, 1, 2, 2])
+        self.assertEqual(kmers[0], kmers[1])
+        self.assertEqual(counts.tolist(), [2, 1])
+
+    def test_short_sequences(self):
+        """Sequences without k-mers are only similar to identical sequences"""
+        self.assertEqual(self.algorithm.distance("AC", "AC"), 0.0)
+        self.assertEqual(self.algorithm.distance("AC", "AG"), 1.0)
+        self.assertEqual(self.algorithm.distance("", "ACGT"), 1.0)
+
+    def test_distance_matrix(self):
+        """The matrix is symmetric and matches pairwise distances"""
+        seqs = ["ACGTACGT", "ACGTTT", "TTTT", "GATTACA", "AC"]
+        matrix = self.algorithm.distance_matrix(seqs)
+        self.assertEqual(matrix.shape, (5, 5))
+        self.assertEqual(matrix.tolist(), matrix.T.tolist())
+        self.assertEqual(matrix.diagonal().tolist(), [0.0] * 5)
+        for i, query in enumerate(seqs):
+            for j, subject in enumerate(seqs):
+                with self.subTest(query=query, subject=subject):
+                    if i != j:
+                        self.assertAlmostEqual(
+                            matrix[i, j], self.algorithm.distance(query, subject)
+                        )
+
+    def test_invalid_options(self):
+        """Test that invalid options are rejected"""
+        with self.assertRaises(ValueError):
+            KmerDistance(k=0)
+        with self.assertRaises(ValueError):
+            KmerDistance(alphabet="binary")
+
+    def test_default_instance(self):
+        """The default instance uses 6-mers"""
+        self.assertEqual(kmer_distance.k, 6)
+        self.assertEqual(kmer_distance.distance("ACGTACGTAC", "ACGTACGTAC"), 0.0)
+
+    def test_feng_doolittle_guide_tree(self):
+        """FengDoolittle can build its guide tree from k-mer distances"""
+        seqs = ["HOUSEOFCARDSFALLDOWN", "HOUSECARDFALLDOWN", "FALLDOWN"]
+        feng = FengDoolittle(distance="kmer", kmer_size=2)
+        self.assertEqual(
+            feng.get_matrix(seqs).tolist(),
+            KmerDistance(k=2).distance_matrix(seqs).tolist(),
+        )
+        rows = feng.align(seqs).split("\n")
+        self.assertEqual(sorted(row.replace("-", "") for row in rows), sorted(seqs))
+        with self.assertRaises(ValueError):
+            FengDoolittle(distance="tree")
+
+    def test_batched_pairs(self):
+        """Pairs sharing k-mers are compared in batches with the same result"""
+        seqs = ["ACGTACGT", "ACGTTT", "TTTT", "GATTACA", "AC", "ACGA"]
+        expected = self.algorithm.distance_matrix(seqs)
+        self.algorithm.batch_pairs = 3
+        self.assertEqual(
+            self.algorithm.distance_matrix(seqs).tolist(), expected.tolist()
+        )
+
+    def test_nhh_guide_tree(self):
+        """NotredameHigginsHeringa can build its guide tree from k-mer distances"""
+        seqs = ["HOUSEOFCARDSFALLDOWN", "HOUSECARDFALLDOWN", "FALLDOWN"]
+        nhh = NotredameHigginsHeringa(distance="kmer", kmer_size=2)
+        self.assertEqual(
+            nhh.get_matrix(seqs).tolist(),
+            KmerDistance(k=2).distance_matrix(seqs).tolist(),
+        )
+        rows = nhh.align(seqs).split("\n")
+        self.assertEqual(sorted(row.replace("-", "") for row in rows), sorted(seqs))
+        with self.assertRaises(ValueError):
+            NotredameHigginsHeringa(distance="tree")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from biobase.matrix import Blosum
+from goombay import MSA, FengDoolittle, NeedlemanWunsch, ProfileAligner
+
+
+class TestMSA(unittest.TestCase):
+    """Test suite for alignment scoring and column statistics"""
+
+    def setUp(self):
+        """Initialize a small alignment for tests"""
+        self.msa = MSA(["AC-A", "A--C", "ACGA"])
+
+    def test_array(self):
+        """Rows are stored as an n x L uint8 array"""
+        self.assertEqual(self.msa.array.shape, (3, 4))
+        self.assertEqual(self.msa.array.dtype.name, "uint8")
+        self.assertEqual((len(self.msa), self.msa.width), (3, 4))
+        self.assertEqual(self.msa.rows, ["AC-A", "A--C", "ACGA"])
+        self.assertEqual(MSA("ac-a\na--c\nacga").rows, self.msa.rows)
+        self.assertEqual(self.msa.symbols, "ACG")
+        with self.assertRaises(ValueError):
+            MSA(["ACG", "AC"])
+
+    def test_counts(self):
+        """Columns count each symbol with gaps last"""
+        self.assertEqual(
+            self.msa.counts().tolist(),
+            [[3, 0, 0, 0], [0, 2, 0, 1], [0, 0, 1, 2], [2, 1, 0, 0]],
+        )
+
+    def test_sum_of_pairs(self):
+        """Every pair of rows is scored column by column"""
+        # columns: 3 A-A pairs; C-C and two C-gap; two G-gap; A-A and two A-C
+        self.assertEqual(self.msa.column_scores().tolist(), [6.0, -2.0, -4.0, 0.0])
+        self.assertEqual(self.msa.sum_of_pairs(), 0.0)
+        rows = ["HEAGAWGHEE", "-PAW-HEAE-", "HEA-AW-HEE"]
+        blosum = ProfileAligner(substitution_matrix=Blosum(62))
+        self.assertEqual(MSA(rows).sum_of_pairs(blosum), blosum.sum_of_pairs(rows))
+        nw = NeedlemanWunsch(match=1, mismatch=1, gap=1)
+        self.assertEqual(self.msa.sum_of_pairs(nw), -1.0)
+
+    def test_column_statistics(self):
+        """Gap fraction, conservation and entropy of each column"""
+        self.assertEqual(self.msa.gap_fraction().tolist(), [0.0, 1 / 3, 2 / 3, 0.0])
+        self.assertEqual(self.msa.conservation().tolist(), [1.0, 2 / 3, 1 / 3, 2 / 3])
+        entropy = self.msa.entropy()
+        self.assertEqual(entropy[:3].tolist(), [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(entropy[3], 0.9183, places=4)
+
+    def test_identity_matrix(self):
+        """Identity over the columns where both rows hold residues"""
+        identity = self.msa.identity_matrix()
+        self.assertEqual(identity[0].tolist(), [1.0, 0.5, 1.0])
+        self.assertEqual(identity[1, 2], 0.5)
+        self.assertEqual(identity.tolist(), identity.T.tolist())
+
+    def test_from_fasta(self):
+        """Aligned FASTA files are loaded with their headers as names"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "aln.fasta")
+            with open(path, "w") as handle:
+                handle.write(">one\nAC-\nA\n>two\nA--\nC\n>three\nACGA\n")
+            msa = MSA.from_fasta(path)
+        self.assertEqual(msa.names, ["one", "two", "three"])
+        self.assertEqual(msa.rows, self.msa.rows)
+
+    def test_feng_doolittle(self):
+        """Alignments returned by align load directly"""
+        seqs = ["TAACA", "CGTAAT", "AGTTTTT", "CCTTTCC", "GAACT"]
+        msa = MSA(FengDoolittle().align(seqs))
+        self.assertEqual(len(msa), len(seqs))
+        self.assertEqual(sorted(row.replace("-", "") for row in msa.rows), sorted(seqs))
+
+
+if __name__ == "__main__":
+    unittest.main()
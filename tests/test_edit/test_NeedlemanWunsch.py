@@ -181,6 +181,46 @@ class TestNeedlemanWunsch(unittest.TestCase):
                 for alignment in alignments:
                     self.assertIn(alignment, res)
 
+    def test_end_gaps(self):
+        """Test semi-global alignment with free end gaps"""
+        test_cases = [
+            ("free", "ACGT", "TTACGTGG", "--ACGT--\nTTACGTGG", 8.0),
+            (
+                ["query_start", "query_end"],
+                "GGACGTCC",
+                "ACGT",
+                "GGACGTCC\n--ACGT--",
+                8.0,
+            ),
+            (
+                ["subject_start", "subject_end"],
+                "GGACGTCC",
+                "ACGT",
+                "GGACGTCC\n--ACGT--",
+                0.0,
+            ),
+            ("subject_end", "ACGT", "TTACGTGG", "--ACGT--\nTTACGTGG", 4.0),
+            ("free", "ACGTTT", "TTTGCA", "ACGTTT---\n---TTTGCA", 6.0),
+        ]
+        for end_gaps, query, subject, alignment, expected in test_cases:
+            with self.subTest(end_gaps=end_gaps, query=query, subject=subject):
+                algorithm = NeedlemanWunsch(end_gaps=end_gaps)
+                self.assertEqual(algorithm.align(query, subject), alignment)
+                self.assertEqual(algorithm.similarity(query, subject), expected)
+                self.assertEqual(str(algorithm.traceback(query, subject)), alignment)
+                self.assertIn(
+                    alignment, algorithm.align(query, subject, all_alignments=True)
+                )
+
+    def test_end_gaps_names(self):
+        """Test that end gaps are checked and kept in canonical order"""
+        algorithm = NeedlemanWunsch(end_gaps=["subject_end", "query_start"])
+        self.assertEqual(algorithm.end_gaps, "query_start,subject_end")
+        self.assertEqual(NeedlemanWunsch(end_gaps="free").end_gaps, "free")
+        self.assertEqual(NeedlemanWunsch().end_gaps, "penalized")
+        with self.assertRaises(ValueError):
+            NeedlemanWunsch(end_gaps="query_middle")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -195,6 +195,105 @@ class TestFengDoolittle(unittest.TestCase):
         ]
         # self.assertEqual(aligned, expected)
 
+    def test_sparse_primary_library(self):
+        """The primary library only keeps matched residue pairs, keyed by index pairs"""
+        seqs = ["ACGT", "AGT", "ACT"]
+        alignments = self.nhh.compute_alignments(seqs)
+        library = self.nhh.compute_primary_library(alignments, len(seqs))
+
+        self.assertEqual(sorted(library), [(0, 1), (0, 2), (1, 2)])
+        i_idx, j_idx, weights = library[0, 1]
+        self.assertEqual(i_idx.tolist(), [0, 2, 3])  # ACGT vs A-GT
+        self.assertEqual(j_idx.tolist(), [0, 1, 2])
+        self.assertEqual(weights.tolist(), [100.0] * 3)
+
+        extended = self.nhh.form_extension_library(library, len(seqs))
+        i_idx, j_idx, weights = extended[1, 2]
+        self.assertEqual(i_idx.tolist(), [0, 2])
+        self.assertEqual(j_idx.tolist(), [0, 2])
+        # AGT[0] -> ACGT[0] -> ACT[0] adds the weaker weight of 100 and 100
+        self.assertAlmostEqual(weights[0], 166.7)
+
+        dist_matrix = self.nhh.create_distance_matrix_NNH(extended, len(seqs))
+        # the direct pair and one path through ACGT, scaled by 2 * 100
+        self.assertAlmostEqual(dist_matrix[1, 2], 1.0 - 166.7 / 200)
+        self.assertEqual(dist_matrix.tolist(), dist_matrix.T.tolist())
+
+    def test_distance_normalization(self):
+        """Mean extended weights are scaled by 100 per possible path"""
+        for seqs in [["ACGT", "AGT"], ["ACGT", "AGT", "ACT", "GGT", "ACGGT"]]:
+            with self.subTest(n=len(seqs)):
+                n = len(seqs)
+                alignments = self.nhh.compute_alignments(seqs)
+                library = self.nhh.compute_primary_library(alignments, n)
+                extended = self.nhh.form_extension_library(library, n)
+                dist_matrix = self.nhh.create_distance_matrix_NNH(extended, n)
+                for (i, j), (_, _, weights) in extended.items():
+                    # the former distance, 1 - mean / 100, rescaled to n - 1 paths
+                    former = 1.0 - weights[weights > 0].mean() / 100
+                    if n == 2:
+                        self.assertAlmostEqual(dist_matrix[i, j], former)
+                    self.assertAlmostEqual(
+                        dist_matrix[i, j], 1.0 - (1.0 - former) / (n - 1)
+                    )
+                self.assertGreaterEqual(dist_matrix.min(), 0.0)
+                self.assertLessEqual(dist_matrix.max(), 1.0)
+
+    def test_parallel_extension(self):
+        """Test that worker processes build the same extension library"""
+        seqs = ["ACTG", "AGT", "AAGTCCA", "TTGACA", "ACTGACTGA", "CAGT"]
+        alignments = self.nhh.compute_alignments(seqs)
+        library = self.nhh.compute_primary_library(alignments, len(seqs))
+        serial = self.nhh.form_extension_library(library, len(seqs))
+        parallel = NotredameHigginsHeringa(workers=2).form_extension_library(
+            library, len(seqs)
+        )
+        self.assertEqual(list(parallel), list(serial))
+        for pair in serial:
+            for expected, actual in zip(serial[pair], parallel[pair]):
+                self.assertEqual(actual.tolist(), expected.tolist())
+        self.assertEqual(
+            NotredameHigginsHeringa(workers=2).align(seqs), self.nhh.align(seqs)
+        )
+        with self.assertRaises(ValueError):
+            NotredameHigginsHeringa(workers=0)
+
+    def test_more_than_26_sequences(self):
+        """Test that libraries keyed by index pairs scale past the alphabet"""
+        seqs = [("ACGT" * 3)[i % 4 :][:8] + "AC"[i % 2] * (i % 3) for i in range(30)]
+        _, dist_matrix = self.nhh(seqs)
+        self.assertEqual(dist_matrix.shape, (30, 30))
+        self.assertGreaterEqual(dist_matrix.min(), 0.0)
+        self.assertLessEqual(dist_matrix.max(), 1.0)
+        self.assertEqual(dist_matrix.tolist(), dist_matrix.T.tolist())
+        self.assertEqual(self.nhh.align(seqs).count("\n"), 29)
+
+    def test_pairwise_engines(self):
+        """Test that the pairwise stage uses the configured engine"""
+        seqs = ["ACGTT", "AGTT"]
+        for engine in ("goombay", "biopython"):
+            nhh = NotredameHigginsHeringa(engine=engine)
+            i_idx, j_idx, identity = nhh.compute_alignments(seqs)[0, 1]
+            self.assertEqual(i_idx.tolist(), [0, 2, 3, 4])
+            self.assertEqual(j_idx.tolist(), [0, 1, 2, 3])
+            self.assertEqual(identity, 100.0)
+        gotoh = NotredameHigginsHeringa(global_pw="gg")
+        self.assertEqual(gotoh.engine, "goombay")
+        self.assertEqual(gotoh.align(seqs), "ACGTT\nA-GTT")
+        with self.assertRaises(ValueError):
+            NotredameHigginsHeringa(engine="emboss")
+
+    def test_parallel_alignments(self):
+        """Test that worker processes align the same pairs as the serial stage"""
+        seqs = ["ACTG", "AGT", "AAGTCCA", "TTGACA", "ACTGACTGA", "CAGT"]
+        serial = self.nhh.compute_alignments(seqs)
+        parallel = NotredameHigginsHeringa(workers=2).compute_alignments(seqs)
+        self.assertEqual(list(parallel), list(serial))
+        for pair, (i_idx, j_idx, identity) in serial.items():
+            self.assertEqual(parallel[pair][0].tolist(), i_idx.tolist())
+            self.assertEqual(parallel[pair][1].tolist(), j_idx.tolist())
+            self.assertEqual(parallel[pair][2], identity)
+
 
 if __name__ == "__main__":
     unittest.main()
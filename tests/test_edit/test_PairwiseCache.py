@@ -0,0 +1,168 @@
+import gc
+import unittest
+import weakref
+from biobase.matrix import Blosum
+from goombay import NeedlemanWunsch, SmithWaterman, LongestCommonSubsequence, Gotoh
+from goombay.align.cache import PairwiseCache, scorer_config
+
+
+class TestPairwiseCache(unittest.TestCase):
+    """Test suite for the opt-in LRU cache of pairwise results"""
+
+    def setUp(self):
+        """Initialize algorithms for tests"""
+        self.nw = NeedlemanWunsch()
+        self.nw.enable_cache(maxsize=4)
+
+    def test_disabled_by_default(self):
+        """Aligners do not cache unless asked to"""
+        nw = NeedlemanWunsch()
+        self.assertIsNone(nw.cache_info())
+        nw.distance("ACTG", "ACTT")
+        self.assertIsNone(nw.cache_info())
+
+    def test_cached_values_match(self):
+        """Cached results are identical to freshly computed ones"""
+        fresh = NeedlemanWunsch()
+        pairs = [("ACTG", "ACTT"), ("GATTACA", "GCATGCU"), ("BA", "ABA")]
+        for query, subject in pairs:
+            with self.subTest(query=query, subject=subject):
+                for _ in range(2):
+                    self.assertEqual(
+                        self.nw.distance(query, subject),
+                        fresh.distance(query, subject),
+                    )
+                    self.assertEqual(
+                        self.nw.normalized_similarity(query, subject),
+                        fresh.normalized_similarity(query, subject),
+                    )
+                    self.assertEqual(
+                        self.nw.align(query, subject), fresh.align(query, subject)
+                    )
+
+    def test_hit_and_miss_counters(self):
+        """Repeated pairs are served from the cache"""
+        self.nw.distance("ACTG", "ACTT")
+        info = self.nw.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 1, 1))
+
+        self.nw.similarity("ACTG", "ACTT")
+        self.nw.align("actg", "actt")  # keys ignore case like the aligners do
+        info = self.nw.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def test_lru_eviction(self):
+        """The least recently used pair is evicted first"""
+        seqs = ["AAAA", "CCCC", "GGGG", "TTTT", "ACGT"]
+        for seq in seqs:
+            self.nw.distance(seq, "ACTG")
+        info = self.nw.cache_info()
+        self.assertEqual(info.evictions, 1)
+        self.assertEqual(info.currsize, 4)
+
+        self.nw.distance("AAAA", "ACTG")  # evicted, so recomputed
+        self.assertEqual(self.nw.cache_info().misses, 6)
+
+    def test_memory_cap(self):
+        """Entries are evicted once the byte budget is exceeded"""
+        nw = NeedlemanWunsch()
+        nw.enable_cache()
+        nw.distance("ACGTACGTAC", "ACGTACGTAA")
+        entry_size = nw.cache_info().nbytes
+        self.assertGreater(entry_size, 2 * 11 * 11 * 8)  # score + pointer matrices
+
+        nw.enable_cache(maxsize=None, max_bytes=int(entry_size * 2.5))
+        for seq in ["ACGTACGTAC", "CCGTACGTAC", "GCGTACGTAC"]:
+            nw.distance(seq, "ACGTACGTAA")
+        info = nw.cache_info()
+        self.assertEqual(info.currsize, 2)
+        self.assertEqual(info.evictions, 1)
+        self.assertLessEqual(info.nbytes, info.max_bytes)
+
+    def test_parameters_in_key(self):
+        """Different parameters never share entries"""
+        cache = PairwiseCache()
+        default = NeedlemanWunsch()
+        harsh = NeedlemanWunsch(gap=5)
+        default.enable_cache(cache=cache)
+        harsh.enable_cache(cache=cache)
+
+        self.assertNotEqual(
+            default.similarity("ACTG", "AG"), harsh.similarity("ACTG", "AG")
+        )
+        self.assertEqual(cache.info().misses, 2)
+        self.assertNotEqual(scorer_config(default), scorer_config(harsh))
+
+    def test_substitution_matrix_in_key(self):
+        """Substitution matrices are identified by their contents"""
+        b62 = NeedlemanWunsch(substitution_matrix=Blosum(62))
+        other_b62 = NeedlemanWunsch(substitution_matrix=Blosum(62))
+        b45 = NeedlemanWunsch(substitution_matrix=Blosum(45))
+
+        self.assertEqual(scorer_config(b62), scorer_config(other_b62))
+        self.assertNotEqual(scorer_config(b62), scorer_config(b45))
+        self.assertNotEqual(scorer_config(b62), scorer_config(self.nw))
+
+    def test_substitution_matrix_not_retained(self):
+        """Matrix digests do not keep matrices alive past their aligner"""
+        matrix = Blosum(62)
+        matrix_ref = weakref.ref(matrix)
+        aligner = NeedlemanWunsch(substitution_matrix=matrix)
+        config = scorer_config(aligner)
+        self.assertEqual(scorer_config(aligner), config)
+        del matrix, aligner
+        gc.collect()
+        self.assertIsNone(matrix_ref())
+
+    def test_substitution_matrix_modified_in_place(self):
+        """Editing a matrix in place changes the key of the aligner using it"""
+        aligner = NeedlemanWunsch(substitution_matrix=Blosum(62))
+        before = scorer_config(aligner)
+        aligner.sub_mat.matrix_data["A"]["A"] += 1
+        self.assertNotEqual(scorer_config(aligner), before)
+        aligner.sub_mat.matrix_data["A"]["A"] -= 1
+        self.assertEqual(scorer_config(aligner), before)
+
+    def test_local_and_overlap(self):
+        """Local and overlap aligners share the same caching behaviour"""
+        for algorithm in [SmithWaterman(), LongestCommonSubsequence(), Gotoh()]:
+            with self.subTest(algorithm=type(algorithm).__name__):
+                expected = algorithm.similarity("GATTACA", "GCATGCU")
+                algorithm.enable_cache()
+                self.assertEqual(algorithm.similarity("GATTACA", "GCATGCU"), expected)
+                self.assertEqual(algorithm.similarity("GATTACA", "GCATGCU"), expected)
+                self.assertEqual(algorithm.cache_info().hits, 1)
+
+    def test_cached_matrices_read_only(self):
+        """Shared matrices cannot be modified by callers"""
+        matrix, _ = self.nw.matrix("ACTG", "ACTT")
+        with self.assertRaises(ValueError):
+            matrix[0, 0] = 100
+
+    def test_cached_matrices_copied(self):
+        """The cache holds copies, not the working arrays of the aligner"""
+        matrix, pointer = self.nw.matrix("ACTG", "ACTT")
+        self.assertIsNot(matrix, self.nw.score)
+        self.assertIsNot(pointer, self.nw.pointer)
+        self.nw.matrix("GATTACA", "GCATGCU")
+        self.assertEqual(self.nw.matrix("ACTG", "ACTT")[0].tolist(), matrix.tolist())
+        self.assertTrue(self.nw.score.flags.writeable)
+
+    def test_clear_and_disable(self):
+        """Clearing resets entries and counters, disabling stops caching"""
+        self.nw.distance("ACTG", "ACTT")
+        self.nw._cache.clear()
+        self.assertEqual(self.nw.cache_info(), (0, 0, 0, 0, 4, 0, 256 * 1024**2))
+        self.nw.disable_cache()
+        self.assertIsNone(self.nw.cache_info())
+
+    def test_invalid_bounds(self):
+        """Cache bounds must be positive"""
+        with self.assertRaises(ValueError):
+            PairwiseCache(maxsize=0)
+        with self.assertRaises(ValueError):
+            PairwiseCache(max_bytes=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from goombay import (
+    FengDoolittle,
+    NeedlemanWunsch,
+    NotredameHigginsHeringa,
+    PairwiseStore,
+)
+
+
+class TestPairwiseStore(unittest.TestCase):
+    """Test suite for the on-disk store of pairwise results"""
+
+    def setUp(self):
+        """Initialize a store in a temporary directory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "scores.sqlite")
+        self.store = PairwiseStore(self.path)
+        self.nw = NeedlemanWunsch()
+        self.seqs = ["HOUSEOFCARDSFALLDOWN", "HOUSECARDFALLDOWN", "FALLDOWN", "ACTG"]
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_distance(self):
+        """Single distances are computed once and then read back"""
+        expected = self.nw.distance("ACTG", "ACTT")
+        self.assertEqual(self.store.distance(self.nw, "ACTG", "ACTT"), expected)
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.distance(self.nw, "actg", "actt"), expected)
+        self.assertEqual(len(self.store), 1)
+
+    def test_distance_matrix(self):
+        """Distance matrices match serial computation"""
+        _, expected = FengDoolittle()(self.seqs)
+        result = self.store.distance_matrix(self.nw, self.seqs)
+        self.assertEqual(result.tolist(), expected.tolist())
+        self.assertEqual(len(self.store), 6)
+
+    def test_only_new_pairs_computed(self):
+        """Adding sequences only computes pairs involving the new ones"""
+        self.store.distance_matrix(self.nw, self.seqs[:3])
+
+        computed = []
+
+        def compute(pairs):
+            computed.extend(pairs)
+            return [self.nw.distance(self.seqs[i], self.seqs[j]) for i, j in pairs]
+
+        self.store.distance_matrix(self.nw, self.seqs, compute)
+        self.assertEqual(computed, [(0, 3), (1, 3), (2, 3)])
+
+    def test_persists_between_stores(self):
+        """Results survive closing and reopening the database"""
+        expected = self.store.distance_matrix(self.nw, self.seqs)
+        self.store.close()
+
+        def fail(pairs):
+            raise AssertionError(f"recomputed {pairs}")
+
+        with PairwiseStore(self.path) as reopened:
+            result = reopened.distance_matrix(self.nw, self.seqs, fail)
+        self.assertEqual(result.tolist(), expected.tolist())
+        self.store = PairwiseStore(self.path)
+
+    def test_configuration_in_key(self):
+        """Aligners with different parameters do not share results"""
+        self.store.distance(self.nw, "ACTG", "AG")
+        harsh = NeedlemanWunsch(gap=5)
+        self.assertEqual(
+            self.store.distance(harsh, "ACTG", "AG"), harsh.distance("ACTG", "AG")
+        )
+        self.assertEqual(len(self.store), 2)
+
+    def test_feng_doolittle(self):
+        """FengDoolittle alignments are unchanged when using a store"""
+        expected = FengDoolittle().align(self.seqs)
+        stored = FengDoolittle(store=self.store)
+        self.assertEqual(stored.align(self.seqs), expected)
+        self.assertEqual(stored.align(self.seqs), expected)
+        self.assertEqual(len(self.store), 6)
+
+    def test_notredame_higgins_heringa(self):
+        """The NHH pairwise alignment stage is read from the store"""
+        expected = NotredameHigginsHeringa().align(self.seqs)
+        stored = NotredameHigginsHeringa(store=self.store)
+        self.assertEqual(stored.align(self.seqs), expected)
+        self.assertEqual(len(self.store), 6)
+        self.assertEqual(stored.align(self.seqs), expected)
+
+    def test_reversed_pairs(self):
+        """Symmetric distances stored the other way round are not recomputed"""
+        expected = self.store.distance_matrix(self.nw, self.seqs)
+
+        def fail(pairs):
+            raise AssertionError(f"recomputed {pairs}")
+
+        reversed_seqs = self.seqs[::-1]
+        result = self.store.distance_matrix(self.nw, reversed_seqs, fail)
+        self.assertEqual(result.tolist(), expected[::-1, ::-1].tolist())
+        self.assertEqual(
+            self.store.distance(self.nw, "FALLDOWN", "ACTG"),
+            self.nw.distance("FALLDOWN", "ACTG"),
+        )
+        self.assertEqual(len(self.store), 6)
+
+        # values only reads reversed pairs of symmetric metrics
+        self.store.put("config", "metric", "AC", "GT", 1.0)
+        self.assertEqual(
+            self.store.values("config", "metric", ["GT", "AC"], [(0, 1)], fail, True),
+            {(0, 1): 1.0},
+        )
+        computed = self.store.values(
+            "config", "metric", ["GT", "AC"], [(0, 1)], lambda pairs: [2.0]
+        )
+        self.assertEqual(computed, {(0, 1): 2.0})
+
+    def test_case_sensitive_values(self):
+        """Case-sensitive scorers keep sequences differing in case apart"""
+        seqs = ["acgt", "ACGT", "AGT"]
+        self.store.values("config", "metric", seqs, [(0, 2)], lambda pairs: [1.0])
+        result = self.store.values(
+            "config",
+            "metric",
+            seqs,
+            [(0, 2), (1, 2)],
+            lambda pairs: [2.0] * len(pairs),
+            case_sensitive=True,
+        )
+        self.assertEqual(result, {(0, 2): 2.0, (1, 2): 2.0})
+
+        nhh = NotredameHigginsHeringa(engine="biopython", store=self.store)
+        for seqs in (["acgt", "AGT"], ["ACGT", "AGT"]):
+            expected = NotredameHigginsHeringa(engine="biopython").compute_alignments(
+                seqs
+            )
+            stored = nhh.compute_alignments(seqs)
+            self.assertEqual(stored[0, 1][0].tolist(), expected[0, 1][0].tolist())
+            self.assertEqual(stored[0, 1][2], expected[0, 1][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from biobase.matrix import Blosum
+from goombay import FengDoolittle, Gotoh, NeedlemanWunsch, ProfileAligner, Jaro
+
+
+class TestProfileAligner(unittest.TestCase):
+    """Test suite for profile-profile alignment"""
+
+    def setUp(self):
+        """Initialize algorithm for tests"""
+        self.algorithm = ProfileAligner()
+
+    def test_single_sequences(self):
+        """Profiles of one sequence align like Needleman-Wunsch"""
+        nw = NeedlemanWunsch()
+        for query, subject in [
+            ("GATTACA", "GCATGCU"),
+            ("HOLYWATER", "WATER"),
+            ("ACTG", "ACTG"),
+            ("A", "CCC"),
+        ]:
+            with self.subTest(query=query, subject=subject):
+                self.assertEqual(
+                    str(self.algorithm.traceback([query], [subject])),
+                    nw.align(query, subject),
+                )
+
+    def test_frequencies(self):
+        """Columns hold symbol frequencies with the gap fraction last"""
+        freq = self.algorithm.frequencies(["AC-", "AG-", "CC-", "AC-"], "ACG")
+        self.assertEqual(
+            freq.tolist(),
+            [[0.75, 0.25, 0.0, 0.0], [0.0, 0.75, 0.25, 0.0], [0.0, 0.0, 0.0, 1.0]],
+        )
+
+    def test_compile(self):
+        """The score matrix gets a gap symbol"""
+        scores = self.algorithm.compile("AC")
+        self.assertEqual(
+            scores.tolist(), [[2.0, -1.0, -2.0], [-1.0, 2.0, -2.0], [-2.0, -2.0, 0.0]]
+        )
+
+    def test_merge(self):
+        """Gaps of the profile alignment are applied to every member"""
+        merged = self.algorithm.merge(["ACGT", "AC-T"], ["AGT"])
+        self.assertEqual(merged, ["ACGT", "AC-T", "A-GT"])
+        merged = self.algorithm.merge(["HOUSEOFCARDSFALLDOWN"], ["FALLDOWN"])
+        self.assertEqual(merged, ["HOUSEOFCARDSFALLDOWN", "------------FALLDOWN"])
+
+    def test_gapped_columns_are_matched(self):
+        """A column of gaps in one member still aligns with the residues of the rest"""
+        merged = self.algorithm.merge(["AC-GT", "ACTGT", "ACTGT"], ["ACTGT"])
+        self.assertEqual(merged, ["AC-GT", "ACTGT", "ACTGT", "ACTGT"])
+
+    def test_unequal_members(self):
+        """Profile members must share one length"""
+        with self.assertRaises(ValueError):
+            self.algorithm.merge(["ACGT", "ACG"], ["ACGT"])
+
+    def test_from_aligner(self):
+        """Scores are taken from the pairwise aligner when it has them"""
+        gotoh = ProfileAligner.from_aligner(Gotoh(match=3, mismatch=2, new_gap=4))
+        self.assertEqual((gotoh.match, gotoh.mismatch, gotoh.gap), (3, 2, 4))
+        blosum = ProfileAligner.from_aligner(
+            NeedlemanWunsch(substitution_matrix=Blosum(62))
+        )
+        self.assertEqual(blosum.compile("W")[0, 0], Blosum(62)["W"]["W"])
+        jaro = ProfileAligner.from_aligner(Jaro())
+        self.assertEqual((jaro.match, jaro.mismatch, jaro.gap), (2, 1, 2))
+
+    def test_feng_doolittle(self):
+        """Progressive alignment merges whole profiles"""
+        seqs = ["TAACA", "CGTAAT", "AGTTTTT", "CCTTTCC", "GAACT"]
+        rows = FengDoolittle().align(seqs).split("\n")
+        self.assertEqual(sorted(row.replace("-", "") for row in rows), sorted(seqs))
+        self.assertEqual(len({len(row) for row in rows}), 1)
+
+    def test_sum_of_pairs(self):
+        """Every pair of members is scored column by column, gap pairs for free"""
+        # A-A 2, C-- -2, --G -2; A-A 2, C-C 2, --G -2; A-A 2, --C -2, G-G 2
+        self.assertEqual(self.algorithm.sum_of_pairs(["AC-", "A-G", "ACG"]), 2.0)
+
+    def test_refine(self):
+        """Refinement keeps the members and never lowers the score"""
+        rows = ["ACGT--", "A--CGT", "ACG-T-", "-ACGTT"]
+        refined = self.algorithm.refine(rows, [[0], [1], [2], [3]], iterations=3)
+        self.assertEqual(
+            [row.replace("-", "") for row in refined],
+            [row.replace("-", "") for row in rows],
+        )
+        self.assertEqual(len({len(row) for row in refined}), 1)
+        self.assertGreater(
+            self.algorithm.sum_of_pairs(refined), self.algorithm.sum_of_pairs(rows)
+        )
+        # no time left: the alignment is returned unchanged
+        self.assertEqual(self.algorithm.refine(rows, [[0]], 3, time_limit=0), rows)
+
+    def test_refined_msa(self):
+        """Progressive alignments are refined along their guide tree"""
+        seqs = ["TAACA", "CGTAAT", "AGTTTTT", "CCTTTCC", "GAACT", "TAAC"]
+        rows = FengDoolittle().align(seqs).split("\n")
+        refined = FengDoolittle(refine_iterations=2).align(seqs).split("\n")
+        self.assertEqual(
+            [row.replace("-", "") for row in refined],
+            [row.replace("-", "") for row in rows],
+        )
+        self.assertGreaterEqual(
+            self.algorithm.sum_of_pairs(refined), self.algorithm.sum_of_pairs(rows)
+        )
+        with self.assertRaises(ValueError):
+            FengDoolittle(refine_iterations=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
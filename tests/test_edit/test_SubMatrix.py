@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from biobase.matrix import Blosum, Pam
 from goombay import NeedlemanWunsch, Gotoh, Hirschberg, WatermanSmithBeyer
@@ -112,6 +113,19 @@ class TestSubstitutionMatrices(unittest.TestCase):
         self.assertEqual(self.g.normalized_distance("", ""), 0.0)
         self.assertEqual(self.h.normalized_distance("", ""), 0.0)
 
+    def test_pickle(self):
+        """Aligners with substitution matrices score the same after pickling"""
+        for algorithm in [self.nwb62, self.hb62, self.wsbp250, self.gp250, self.nw]:
+            with self.subTest(algorithm=type(algorithm).__name__):
+                copy = pickle.loads(pickle.dumps(algorithm))
+                self.assertEqual(
+                    copy.similarity("ARLPW", "ARPW"),
+                    algorithm.similarity("ARLPW", "ARPW"),
+                )
+                self.assertEqual(
+                    copy.align("ARLPW", "ARPW"), algorithm.align("ARLPW", "ARPW")
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,74 @@
+import io
+import random
+import unittest
+from goombay import WagnerFischer, find_approx
+
+
+class TestFindApprox(unittest.TestCase):
+    """Test suite for bit-parallel approximate pattern search"""
+
+    def setUp(self):
+        """Initialize reference algorithm for tests"""
+        self.wf = WagnerFischer()
+
+    def brute_force(self, pattern, text, max_edits):
+        hits = []
+        for end in range(1, len(text) + 1):
+            dist = min(
+                self.wf.distance(pattern, text[start:end]) for start in range(end + 1)
+            )
+            if dist <= max_edits:
+                hits.append((end, int(dist)))
+        return hits
+
+    def test_matches_wagner_fischer(self):
+        """End positions and distances match the best substring of the text"""
+        random.seed(29)
+        for _ in range(60):
+            pattern = "".join(random.choices("ACGT", k=random.randint(1, 7)))
+            text = "".join(random.choices("ACGT", k=random.randint(0, 30)))
+            max_edits = random.randint(0, 2)
+            with self.subTest(pattern=pattern, text=text, max_edits=max_edits):
+                hits = [tuple(hit) for hit in find_approx(pattern, text, max_edits)]
+                self.assertEqual(hits, self.brute_force(pattern, text, max_edits))
+
+    def test_alignment(self):
+        """Tracebacks span an occurrence with the reported distance"""
+        text = "TTTTGATTACATTTT"
+        hits = list(find_approx("gatcaca", text, 1))
+        self.assertEqual([(hit.end, hit.distance) for hit in hits], [(11, 1)])
+        hit = hits[0]
+        self.assertEqual(hit.start, 4)
+        self.assertEqual(str(hit.alignment), "gatcaca\nGATTACA")
+        self.assertEqual(self.wf.distance("gatcaca", text[hit.start : hit.end]), 1)
+
+    def test_chunked_text(self):
+        """Chunked input gives the same hits as the whole text"""
+        random.seed(31)
+        text = "".join(random.choices("ACGT", k=2000))
+        pattern = text[700:720]
+        expected = [(h.end, h.distance, h.start) for h in find_approx(pattern, text, 3)]
+        lines = io.StringIO("\n".join(text[i : i + 7] for i in range(0, 2000, 7)))
+        chunks = (line.rstrip("\n") for line in lines)
+        result = [(h.end, h.distance, h.start) for h in find_approx(pattern, chunks, 3)]
+        self.assertEqual(result, expected)
+        self.assertIn((720, 0, 700), result)
+
+    def test_long_pattern(self):
+        """Patterns longer than a machine word are supported"""
+        random.seed(37)
+        pattern = "".join(random.choices("ACGT", k=150))
+        text = "GG" + pattern[:40] + pattern[41:] + "CC"
+        hits = list(find_approx(pattern, text, 1))
+        self.assertEqual([(h.end, h.distance) for h in hits], [(len(text) - 2, 1)])
+
+    def test_invalid(self):
+        """Patterns must be non-empty and edits non-negative"""
+        with self.assertRaises(ValueError):
+            list(find_approx("", "ACGT", 1))
+        with self.assertRaises(ValueError):
+            list(find_approx("ACGT", "ACGT", -1))
+
+
+if __name__ == "__main__":
+    unittest.main()
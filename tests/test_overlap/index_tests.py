@@ -0,0 +1,59 @@
+import random
+
+
+class AffixIndexTests:
+    """Tests shared by PrefixIndex and PostfixIndex, mixed into their suites"""
+
+    index_class = None
+    algorithm_class = None
+
+    def setUp(self):
+        """Initialize index for tests"""
+        random.seed(19)
+        self.corpus = [
+            "".join(random.choices("acgtAC", k=random.randint(1, 8)))
+            for _ in range(300)
+        ]
+        self.corpus += ["ACTG", "actg", "AC"]
+        self.index = self.index_class(self.corpus)
+        self.algorithm = self.algorithm_class()
+        self.queries = ["ACTG", "A", "gtca", "TTTTTTTTT", "CAGTACGAT"]
+
+    def test_matches_pairwise(self):
+        """Similarity and distance match the pairwise algorithm for every item"""
+        for query in self.queries:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.index.similarity(query).tolist(),
+                    [self.algorithm.similarity(query, item) for item in self.corpus],
+                )
+                self.assertEqual(
+                    self.index.distance(query).tolist(),
+                    [self.algorithm.distance(query, item) for item in self.corpus],
+                )
+                for value, item in zip(
+                    self.index.normalized_similarity(query).tolist(), self.corpus
+                ):
+                    self.assertAlmostEqual(
+                        value, self.algorithm.normalized_similarity(query, item)
+                    )
+
+    def test_top(self):
+        """Top matches are the most similar items of the corpus"""
+        for query in self.queries:
+            with self.subTest(query=query):
+                top = self.index.top(query, 5)
+                self.assertEqual(
+                    [sim for _, sim in top],
+                    sorted(self.index.similarity(query).tolist(), reverse=True)[:5],
+                )
+                for item, sim in top:
+                    self.assertEqual(self.algorithm.similarity(query, item), sim)
+
+    def test_empty(self):
+        """Empty corpora and queries are handled"""
+        self.assertEqual(self.index_class([]).similarity("ACTG").tolist(), [])
+        self.assertEqual(self.index_class([]).top("ACTG"), [])
+        self.assertEqual(set(self.index.similarity("").tolist()), {0})
+        with self.assertRaises(ValueError):
+            self.index.normalized_similarity("")
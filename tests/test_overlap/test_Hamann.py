@@ -1,3 +1,4 @@
+import random
 import unittest
 import numpy
 from goombay import Hamann
@@ -95,6 +96,24 @@ class TestHamann(unittest.TestCase):
         sim2 = self.algorithm.similarity(b, a)
         self.assertAlmostEqual(sim1, sim2)
 
+    def test_batch(self):
+        """One-vs-many and many-vs-many batches match pairwise similarity"""
+        random.seed(17)
+        queries = ["".join(random.choices("01", k=100)) for _ in range(5)]
+        subjects = ["".join(random.choices("01", k=100)) for _ in range(8)]
+        expected = [
+            [self.algorithm.similarity(q, s) for s in subjects] for q in queries
+        ]
+        result = self.algorithm.batch_similarity(queries, subjects)
+        self.assertEqual(result.shape, (5, 8))
+        for row, expected_row in zip(result.tolist(), expected):
+            for value, expected_value in zip(row, expected_row):
+                self.assertAlmostEqual(value, expected_value)
+        one = self.algorithm.batch_distance(queries[0], subjects)
+        self.assertEqual(one.shape, (8,))
+        for value, subject in zip(one.tolist(), subjects):
+            self.assertAlmostEqual(value, self.algorithm.distance(queries[0], subject))
+
 
 if __name__ == "__main__":
     unittest.main()
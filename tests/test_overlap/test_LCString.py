@@ -1,3 +1,4 @@
+import random
 import unittest
 from goombay import LongestCommonSubstring
 from goombay import LongestCommonSubstringMSA
@@ -189,6 +190,47 @@ class TestLCSub(unittest.TestCase):
             self.msa_algorithm.distance(sequences), len(max(sequences, key=len)) - 5
         )
 
+    def test_substring_positions(self):
+        """Positions of every longest common substring are reported"""
+        self.assertEqual(
+            self.algorithm.substrings("ggAtCACAg", "CTACACT"), (3, [(4, 3), (5, 2)])
+        )
+        self.assertEqual(
+            self.algorithm.substrings("ACTG", "TTTT"),
+            (1, [(2, 0), (2, 1), (2, 2), (2, 3)]),
+        )
+        self.assertEqual(self.algorithm.substrings("AAAA", ""), (0, []))
+        self.assertEqual(self.algorithm.align("ggAtCACAg", "CTACACT"), ["CAC", "ACA"])
+
+    def test_long_sequences(self):
+        """Long sequences are handled without building the full matrix"""
+        query = "ACGT" * 5000
+        subject = "TTTT" + "ACGTTGCA" * 1000 + query[:100] + "TTTT"
+        longest, positions = self.algorithm.substrings(query, subject)
+        self.assertEqual(longest, 100)
+        self.assertEqual(self.algorithm.similarity(query, subject), 100)
+        self.assertTrue(
+            all(query[i : i + 100] == subject[j : j + 100] for i, j in positions)
+        )
+
+    def test_many_long_sequences(self):
+        """The MSA engine scales with the total length of the inputs"""
+        random.seed(42)
+        core = "GATTACAGATTACACCGGTT"
+        sequences = [
+            "".join(random.choices("ACGT", k=2000))
+            + core
+            + "".join(random.choices("ACGT", k=2000))
+            for _ in range(10)
+        ]
+        self.assertEqual(self.msa_algorithm.align(sequences), [core])
+        self.assertEqual(self.msa_algorithm.similarity(sequences), len(core))
+
+    def test_no_motif_shared_by_all(self):
+        """Motifs shared by the first and last sequences only are not reported"""
+        self.assertEqual(self.msa_algorithm.align(["ACGT", "TTTT", "ACGT"]), [])
+        self.assertEqual(self.msa_algorithm.similarity(["ACGT", "TTTT", "ACGT"]), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,6 @@
+import random
 import unittest
+import numpy
 from goombay import LIPNS
 
 
@@ -92,6 +94,24 @@ class TestLIPNS(unittest.TestCase):
         low_threshold = LIPNS(threshold=actual_similarity - 0.01)
         self.assertEqual(low_threshold.is_similar(query, subject), False)
 
+    def test_batch_is_similar(self):
+        """Batch screening agrees with is_similar for every candidate"""
+        random.seed(23)
+        candidates = ["".join(random.choices("ACgt", k=6)) for _ in range(200)]
+        for query in ["ACGTAC", "acgt", "ACGTACGT", "", candidates[0]]:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.algorithm.batch_is_similar(query, candidates).tolist(),
+                    [bool(self.algorithm.is_similar(query, c)) for c in candidates],
+                )
+        codes = numpy.frombuffer("".join(candidates).upper().encode(), numpy.uint8)
+        codes = codes.reshape(len(candidates), 6)
+        self.assertEqual(
+            self.algorithm.batch_is_similar("ACGTAC", codes).tolist(),
+            self.algorithm.batch_is_similar("ACGTAC", candidates).tolist(),
+        )
+        self.assertEqual(self.algorithm.batch_is_similar("ACGT", []).tolist(), [])
+
 
 if __name__ == "__main__":
     unittest.main()
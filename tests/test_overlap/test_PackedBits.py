@@ -0,0 +1,72 @@
+import random
+import unittest
+import numpy
+from goombay import PackedBits
+
+
+class TestPackedBits(unittest.TestCase):
+    """Test suite for fingerprints packed into uint64 words"""
+
+    def setUp(self):
+        """Initialize fingerprints for tests"""
+        random.seed(13)
+        self.queries = ["".join(random.choices("01", k=150)) for _ in range(20)]
+        self.subjects = ["".join(random.choices("01", k=150)) for _ in range(30)]
+        self.packed_queries = PackedBits.from_strings(self.queries)
+        self.packed_subjects = PackedBits.from_strings(self.subjects)
+
+    def test_round_trip(self):
+        """Unpacking gives back the original bits"""
+        self.assertEqual(self.packed_queries.words.shape, (20, 3))
+        bits = self.packed_queries.to_array()
+        self.assertEqual(
+            ["".join("1" if bit else "0" for bit in row) for row in bits],
+            self.queries,
+        )
+        self.assertEqual(
+            self.packed_queries.ones().tolist(), [q.count("1") for q in self.queries]
+        )
+
+    def test_agreements(self):
+        """Agreement counts match a character-by-character comparison"""
+        expected = [
+            [sum(a == b for a, b in zip(q, s)) for s in self.subjects]
+            for q in self.queries
+        ]
+        agreements = self.packed_queries.agreements(self.packed_subjects)
+        self.assertEqual(agreements.tolist(), expected)
+
+    def test_contingency(self):
+        """Contingency counts of every pair add up to the number of bits"""
+        both, only_query, only_subject, neither = self.packed_queries.contingency(
+            self.packed_subjects
+        )
+        q, s = self.queries[3], self.subjects[7]
+        pairs = list(zip(q, s))
+        self.assertEqual(both[3, 7], pairs.count(("1", "1")))
+        self.assertEqual(only_query[3, 7], pairs.count(("1", "0")))
+        self.assertEqual(only_subject[3, 7], pairs.count(("0", "1")))
+        self.assertEqual(neither[3, 7], pairs.count(("0", "0")))
+        numpy.testing.assert_array_equal(
+            both + only_query + only_subject + neither, 150
+        )
+
+    def test_from_array(self):
+        """Boolean arrays pack like strings"""
+        bits = numpy.array([[c == "1" for c in q] for q in self.queries])
+        packed = PackedBits.from_array(bits)
+        numpy.testing.assert_array_equal(packed.words, self.packed_queries.words)
+        self.assertEqual(len(packed[2:5]), 3)
+
+    def test_invalid(self):
+        """Fingerprints must be equal-length strings of 0 and 1"""
+        with self.assertRaises(ValueError):
+            PackedBits.from_strings(["0101", "010"])
+        with self.assertRaises(ValueError):
+            PackedBits.from_strings(["01A1"])
+        with self.assertRaises(ValueError):
+            self.packed_queries.agreements(PackedBits.from_strings(["0101"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+import unittest
+from goombay import Postfix, PostfixIndex
+from tests.test_overlap.index_tests import AffixIndexTests
+
+
+class TestPostfixIndex(AffixIndexTests, unittest.TestCase):
+    """Test suite for postfix similarity over an indexed corpus"""
+
+    index_class = PostfixIndex
+    algorithm_class = Postfix
+
+    def test_ranks_by_postfix(self):
+        """Items sharing a longer postfix with the query rank first"""
+        index = PostfixIndex(["GATTAGG", "CCTTACA", "TTTTTTT"])
+        self.assertEqual(index.similarity("GATTACA").tolist(), [0, 5, 0])
+        self.assertEqual(index.top("GATTACA", 1), [("CCTTACA", 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
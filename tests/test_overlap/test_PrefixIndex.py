@@ -0,0 +1,20 @@
+import unittest
+from goombay import Prefix, PrefixIndex
+from tests.test_overlap.index_tests import AffixIndexTests
+
+
+class TestPrefixIndex(AffixIndexTests, unittest.TestCase):
+    """Test suite for prefix similarity over an indexed corpus"""
+
+    index_class = PrefixIndex
+    algorithm_class = Prefix
+
+    def test_ranks_by_prefix(self):
+        """Items sharing a longer prefix with the query rank first"""
+        index = PrefixIndex(["CCTTACA", "GATTAGG", "TTTTTTT"])
+        self.assertEqual(index.similarity("GATTACA").tolist(), [0, 5, 0])
+        self.assertEqual(index.top("GATTACA", 1), [("GATTAGG", 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
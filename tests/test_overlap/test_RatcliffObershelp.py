@@ -1,5 +1,9 @@
+import random
 import unittest
+from difflib import SequenceMatcher
+from unittest import mock
 from goombay import RatcliffObershelp
+from goombay.align import overlap
 
 
 class TestRatcliffObershelp(unittest.TestCase):
@@ -110,6 +114,32 @@ class TestRatcliffObershelp(unittest.TestCase):
             with self.subTest(query=q, subject=s):
                 self.assertEqual(self.algorithm.similarity(q, s), sim)
 
+    def test_long_sequences(self):
+        """Document-sized inputs give the same matching blocks as difflib"""
+        random.seed(42)
+        query = "".join(random.choices("ACGT", k=2000))
+        subject = list(query)
+        for _ in range(80):
+            subject[random.randrange(len(subject))] = random.choice("ACGT")
+        subject = "".join(subject)
+        matcher = SequenceMatcher(None, query, subject, autojunk=False)
+        expected = [
+            query[block.a : block.a + block.size]
+            for block in matcher.get_matching_blocks()
+            if block.size
+        ]
+        self.assertEqual(sorted(self.algorithm(query, subject)), sorted(expected))
+
+    def test_repetitive_sequences(self):
+        """One index over the subject serves every block of the recursion"""
+        query = "XA" * 500
+        subject = "A" * 20000
+        with mock.patch.object(
+            overlap, "SuffixAutomaton", wraps=overlap.SuffixAutomaton
+        ) as automaton:
+            self.assertEqual(self.algorithm(query, subject), ["A"] * 500)
+        automaton.assert_called_once_with(subject)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from goombay.align.suffix import SuffixAutomaton
+
+
+class TestSuffixAutomaton(unittest.TestCase):
+    """Test suite for the suffix automaton behind LongestCommonSubstring"""
+
+    def setUp(self):
+        """Initialize automaton for tests"""
+        self.automaton = SuffixAutomaton("GATTACA")
+
+    def test_every_substring_accepted(self):
+        """Every substring of the sequence is a path from the root"""
+        seq = self.automaton.seq
+        for start in range(len(seq)):
+            for end in range(start + 1, len(seq) + 1):
+                with self.subTest(substring=seq[start:end]):
+                    self.assertEqual(
+                        self.automaton.match_lengths(seq[start:end])[-1], end - start
+                    )
+
+    def test_linear_size(self):
+        """The automaton has at most 2n - 1 states"""
+        automaton = SuffixAutomaton("ACGT" * 250 + "AAAA" * 250)
+        self.assertLessEqual(len(automaton), 2 * 2000 - 1)
+
+    def test_match_lengths(self):
+        """Longest match ending at each position of another text"""
+        self.assertEqual(self.automaton.match_lengths("TTACG"), [1, 2, 3, 4, 1])
+        self.assertEqual(self.automaton.match_lengths(""), [])
+
+    def test_occurrences(self):
+        """Overlapping occurrences are all reported"""
+        automaton = SuffixAutomaton("AAAA")
+        self.assertEqual(automaton.occurrences("AA"), [0, 1, 2])
+        self.assertEqual(self.automaton.occurrences("A"), [1, 4, 6])
+        self.assertEqual(self.automaton.occurrences("TAG"), [])
+        self.assertEqual(self.automaton.occurrences(""), list(range(8)))
+
+    def test_occurrences_from_link_tree(self):
+        """Occurrences reached through cloned states match a plain scan"""
+        seq = "ABAABABAABAAB" * 3
+        automaton = SuffixAutomaton(seq)
+        for substring in ["A", "AB", "ABA", "BAAB", "ABAABABAABAAB", "ABAABA" * 2]:
+            with self.subTest(substring=substring):
+                expected = [
+                    start
+                    for start in range(len(seq))
+                    if seq.startswith(substring, start)
+                ]
+                self.assertEqual(automaton.occurrences(substring), expected)
+
+    def test_longest_match(self):
+        """Longest match earliest in the text, then earliest in the sequence"""
+        self.assertEqual(self.automaton.longest_match("CTTACAT"), (1, 2, 5))
+        self.assertEqual(self.automaton.longest_match("CAGA"), (0, 5, 2))
+        self.assertEqual(self.automaton.longest_match("XYZ"), (0, 0, 0))
+
+    def test_longest_match_in_range(self):
+        """Matches can be restricted to a range of the sequence"""
+        automaton = SuffixAutomaton("ABCXABCDYABCD")
+        self.assertEqual(automaton.longest_match("ABCD"), (0, 4, 4))
+        self.assertEqual(automaton.longest_match("ABCD", 0, 7), (0, 0, 3))
+        self.assertEqual(automaton.longest_match("ABCD", 5, 13), (0, 9, 4))
+        self.assertEqual(automaton.longest_match("ABCD", 5, 8), (1, 5, 3))
+        self.assertEqual(automaton.longest_match("ABCD", 3, 4), (0, 0, 0))
+
+    def test_longest_match_in_range_repetitive(self):
+        """Range restricted matches agree with matching the slice directly"""
+        seq = "AAB" * 40 + "A" * 30
+        automaton = SuffixAutomaton(seq)
+        for text in ["AABAA", "AAAAAA", "BAAB", "BB"]:
+            for start, end in [(0, 5), (3, 20), (100, 150), (119, 121), (50, 50)]:
+                with self.subTest(text=text, start=start, end=end):
+                    text_start, seq_start, size = SuffixAutomaton(
+                        seq[start:end]
+                    ).longest_match(text)
+                    if size:
+                        seq_start += start
+                    self.assertEqual(
+                        automaton.longest_match(text, start, end),
+                        (text_start, seq_start, size),
+                    )
+
+    def test_longest_common_substrings(self):
+        """Longest shared substrings and where they start in both sequences"""
+        self.assertEqual(
+            self.automaton.longest_common_substrings("CTTACAT"), (5, [(1, 2)])
+        )
+        self.assertEqual(self.automaton.longest_common_substrings("XYZ"), (0, []))
+
+        automaton = SuffixAutomaton("ABABAB")
+        self.assertEqual(
+            automaton.longest_common_substrings("BABXABA"),
+            (3, [(0, 1), (0, 3), (4, 0), (4, 2)]),
+        )
+
+    def test_common_substrings(self):
+        """Longest substrings shared with every text, in order of first end"""
+        automaton = SuffixAutomaton("CCTAGGAC")
+        self.assertEqual(
+            automaton.common_substrings(["GGACCTAG", "TAGGAC"]), (4, ["GGAC"])
+        )
+        self.assertEqual(
+            automaton.common_substrings(["AGCCAC", "CCAGAC"]), (2, ["CC", "AG", "AC"])
+        )
+        self.assertEqual(automaton.common_substrings(["XYZ"]), (0, []))
+        self.assertEqual(automaton.common_substrings([]), (8, ["CCTAGGAC"]))
+
+
+if __name__ == "__main__":
+    unittest.main()